@@ -0,0 +1,124 @@
+"""
+마스터 카탈로그 규모별 OrderProcessor 벤치마크 (로드 / 메모리 / 조회 지연시간)
+
+    python benchmarks/bench_catalog.py --sizes 1000 100000 1000000 --save benchmarks/catalog_baseline.json
+    python benchmarks/bench_catalog.py --sizes 1000 100000 1000000 --compare benchmarks/catalog_baseline.json
+
+실제 .xlsb 없이 가상 '코드' 시트(synth_catalog)를 OrderProcessor에 바로 주입합니다.
+- load: 카탈로그 생성 시간과 tracemalloc 기준 최대/잔여 메모리
+- name_hit / name_miss: find_barcode_by_product_name 지연시간
+- barcode_hit / barcode_miss / gift_expand: lookup_product_by_barcode 지연시간
+- fuzzy: search_products (오타/순서 바뀜 유사도 검색) 지연시간
+- prefix: suggest_products (입력 중 자동완성, 초성 포함) 지연시간
+조회 로그(debug.log)는 임시 폴더에 기록되어 저장소의 로그를 건드리지 않습니다.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from safian.core import OrderProcessor
+from benchutil import compare_reports, format_latency, make_report, save_report, summarize
+from synth_catalog import generate_catalog, sample_queries
+
+# (조회 이름, OrderProcessor 메서드 이름)
+LOOKUPS = [
+    ("name_hit", "find_barcode_by_product_name"),
+    ("name_miss", "find_barcode_by_product_name"),
+    ("barcode_hit", "lookup_product_by_barcode"),
+    ("barcode_miss", "lookup_product_by_barcode"),
+    ("gift_expand", "lookup_product_by_barcode"),
+    ("fuzzy", "search_products"),
+    ("prefix", "suggest_products"),
+]
+
+
+def bench_load(df):
+    """카탈로그 생성 시간(초)과 메모리(MB) 측정"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    processor = OrderProcessor.from_dataframe(df)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return processor, {
+        "seconds": round(seconds, 4),
+        "rows": len(processor.catalog) if processor.catalog is not None else 0,
+        "retained_mb": round(current / 2 ** 20, 2),
+        "peak_mb": round(peak / 2 ** 20, 2),
+    }
+
+
+def bench_lookup(fn, queries):
+    latencies = array('d')
+    clock = time.perf_counter_ns
+    total_start = clock()
+    for q in queries:
+        start = clock()
+        fn(q)
+        latencies.append((clock() - start) / 1000.0)
+    return summarize(latencies, (clock() - total_start) / 1e9)
+
+
+def run(sizes, seed, queries_per_kind, lookups):
+    results = {"load": {}}
+    for size in sizes:
+        df = generate_catalog(size, seed=seed)
+        queries = sample_queries(df, queries_per_kind, seed=seed)
+
+        processor, load = bench_load(df)
+        del df
+        results["load"][str(size)] = load
+        print(f"{'load':<27} {size:>9,} | {load['seconds']:>8.3f}초 | "
+              f"잔여 {load['retained_mb']:>8.1f}MB  최대 {load['peak_mb']:>8.1f}MB")
+
+        for name, method in LOOKUPS:
+            if lookups and name not in lookups:
+                continue
+            r = bench_lookup(getattr(processor, method), queries[name])
+            results.setdefault(name, {})[str(size)] = r
+            print(format_latency(name, size, r))
+        del processor
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="SKU 수 (예: 1000 100000 1000000)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--queries", type=int, default=2000, help="조회 종류별 질의 수")
+    ap.add_argument("--lookup", action="append", help="특정 조회만 실행 (여러 번 지정 가능)")
+    ap.add_argument("--save", help="결과를 JSON 기준선으로 저장할 경로")
+    ap.add_argument("--compare", help="비교할 JSON 기준선 경로")
+    ap.add_argument("--threshold", type=float, default=10.0, help="성능 저하로 볼 처리량 감소율(%%)")
+    args = ap.parse_args()
+
+    save = os.path.abspath(args.save) if args.save else None
+    compare = os.path.abspath(args.compare) if args.compare else None
+
+    # OrderProcessor는 현재 폴더의 debug.log에 기록하므로 임시 폴더에서 실행
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            results = run(args.sizes, args.seed, args.queries, args.lookup)
+        finally:
+            os.chdir(cwd)
+
+    if save:
+        save_report(save, make_report(results, seed=args.seed, queries=args.queries))
+
+    if compare and compare_reports(results, compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
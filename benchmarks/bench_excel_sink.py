@@ -0,0 +1,67 @@
+"""
+발주내역 저장 왕복(round-trip) 횟수 / 소요시간 벤치마크 (엑셀 없이 가짜 COM 사용)
+
+    python benchmarks/bench_excel_sink.py --rows 100 500 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from safian.excel_sink import ComSheetSink, ORDER_COLUMNS, XL_UP, order_rows
+from safian.fakecom import FakeWorkbook
+
+
+def make_orders(n):
+    return [{key: f"{key}{i}" for key in ORDER_COLUMNS} for i in range(n)]
+
+
+def write_cell_by_cell(workbook, order_list):
+    """기존(셀 단위) 저장 방식 - 비교용"""
+    try:
+        sheet = workbook.Sheets('발주내역')
+    except Exception:
+        sheet = workbook.Sheets.Add(After=workbook.Sheets(workbook.Sheets.Count))
+        sheet.Name = '발주내역'
+        for c, h in enumerate(ORDER_COLUMNS):
+            sheet.Cells(1, c + 1).Value = h
+    last_row = sheet.Cells(sheet.Rows.Count, 1).End(XL_UP).Row
+    if last_row == 1 and sheet.Cells(1, 1).Value is None:
+        last_row = 0
+    for i, order in enumerate(order_list):
+        for c, key in enumerate(ORDER_COLUMNS):
+            val = order.get(key, "")
+            sheet.Cells(last_row + 1 + i, c + 1).Value = "" if val is None else str(val)
+
+
+def write_batched(workbook, order_list):
+    ComSheetSink(workbook).append(order_rows(order_list))
+
+
+def run(name, writer, orders):
+    workbook = FakeWorkbook()
+    start = time.perf_counter()
+    writer(workbook, orders)
+    elapsed = time.perf_counter() - start
+    rows = workbook.sheet('발주내역').rows()
+    assert len(rows) == len(orders) + 1, "기록된 행 수가 다릅니다."
+    print(f"{name:>8} | {len(orders):>7}행 | COM 호출 {workbook.com_calls:>8}회 | {elapsed * 1000:8.1f} ms")
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[15, 300, 3000])
+    args = ap.parse_args()
+
+    for n in args.rows:
+        orders = make_orders(n)
+        legacy = run("셀단위", write_cell_by_cell, orders)
+        batched = run("블록", write_batched, orders)
+        assert legacy == batched, "두 방식의 결과가 다릅니다."
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+주문 파서 벤치마크 (parse_order_text / parse_tab_separated_order / extract_*)
+
+    python benchmarks/bench_parser.py --sizes 1000 100000 --save benchmarks/parser_baseline.json
+    python benchmarks/bench_parser.py --sizes 1000 100000 --compare benchmarks/parser_baseline.json
+
+단계별 처리량(건/초)과 1건당 지연시간 백분위(p50/p90/p99/max, 마이크로초)를 출력합니다.
+--save로 결과를 JSON 기준선으로 저장하고, --compare로 기준선 대비 변화율을 확인합니다.
+"""
+import argparse
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from safian import parser as order_parser
+from benchutil import compare_reports, format_latency, make_report, save_report, summarize
+from synth_orders import iter_orders
+
+# (단계 이름, 함수, 입력 주문 종류)
+STAGES = [
+    ("extract_phone", order_parser.extract_phone, "kakao"),
+    ("extract_address", order_parser.extract_address, "kakao"),
+    ("extract_qty", order_parser.extract_qty, "kakao"),
+    ("extract_memo", order_parser.extract_memo, "kakao"),
+    ("extract_orderer", order_parser.extract_orderer, "kakao"),
+    ("parse_tab_separated_order", order_parser.parse_tab_separated_order, "tab"),
+    ("parse_order_text", order_parser.parse_order_text, "mixed"),
+]
+
+
+def bench_stage(fn, kind, n, seed):
+    # 생성 시간은 측정에서 제외하도록 먼저 만들어 둠
+    inputs = list(iter_orders(n, seed=seed, kind=kind))
+    latencies = array('d')
+    clock = time.perf_counter_ns
+    total_start = clock()
+    for text in inputs:
+        start = clock()
+        fn(text)
+        latencies.append((clock() - start) / 1000.0)
+    return summarize(latencies, (clock() - total_start) / 1e9)
+
+
+def run(sizes, seed, stages):
+    results = {}
+    for name, fn, kind in STAGES:
+        if stages and name not in stages:
+            continue
+        results[name] = {}
+        for n in sizes:
+            r = bench_stage(fn, kind, n, seed)
+            results[name][str(n)] = r
+            print(format_latency(name, n, r))
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="주문 수 (예: 1000 100000 1000000)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--stage", action="append", help="특정 단계만 실행 (여러 번 지정 가능)")
+    ap.add_argument("--save", help="결과를 JSON 기준선으로 저장할 경로")
+    ap.add_argument("--compare", help="비교할 JSON 기준선 경로")
+    ap.add_argument("--threshold", type=float, default=10.0, help="성능 저하로 볼 처리량 감소율(%%)")
+    args = ap.parse_args()
+
+    results = run(args.sizes, args.seed, args.stage)
+
+    if args.save:
+        save_report(args.save, make_report(results, seed=args.seed))
+
+    if args.compare and compare_reports(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""벤치마크 공통 도구: 지연시간 요약, JSON 기준선 저장/비교"""
+import json
+import platform
+from datetime import datetime
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(latencies_us, total_seconds):
+    """1건당 지연시간(마이크로초) 목록과 총 소요시간으로 처리량/백분위 요약"""
+    values = sorted(latencies_us)
+    n = len(values)
+    return {
+        "n": n,
+        "seconds": round(total_seconds, 4),
+        "throughput_per_s": round(n / total_seconds, 1) if total_seconds else 0.0,
+        "p50_us": round(percentile(values, 50), 2),
+        "p90_us": round(percentile(values, 90), 2),
+        "p99_us": round(percentile(values, 99), 2),
+        "max_us": round(values[-1], 2) if values else 0.0,
+    }
+
+
+def format_latency(name, size, r):
+    return (f"{name:<27} {size:>9,} | {r['throughput_per_s']:>12,.0f}건/초 | "
+            f"p50 {r['p50_us']:>8.1f}us  p90 {r['p90_us']:>8.1f}us  p99 {r['p99_us']:>8.1f}us  max {r['max_us']:>9.1f}us")
+
+
+def make_report(results, **extra):
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    report.update(extra)
+    report["results"] = results
+    return report
+
+
+def save_report(path, report):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n기준선 저장: {path}")
+
+
+def compare_reports(results, baseline_path, threshold):
+    """
+    기준선 대비 처리량/p99 변화율 출력.
+    results 구조: {항목: {크기: 요약}}. 처리량이 threshold% 이상 떨어진 항목 수를 반환합니다.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = 0
+    print("\n--- 기준선 대비 ---")
+    for name, by_size in results.items():
+        for size, r in by_size.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if not base or "throughput_per_s" not in r:
+                continue
+            tput = (r["throughput_per_s"] / base["throughput_per_s"] - 1) * 100 if base["throughput_per_s"] else 0.0
+            p99 = (r["p99_us"] / base["p99_us"] - 1) * 100 if base["p99_us"] else 0.0
+            flag = ""
+            if tput <= -threshold:
+                flag = "  <-- 성능 저하"
+                regressions += 1
+            print(f"{name:<27} {int(size):>9,} | 처리량 {tput:+6.1f}% | p99 {p99:+6.1f}%{flag}")
+    return regressions
@@ -0,0 +1,90 @@
+"""
+벤치마크용 가상 마스터 카탈로그('코드' 시트) 생성기.
+
+실제 코드 시트와 같은 컬럼(품번, 제품명, 사은품 1~5)을 가진 DataFrame을 만듭니다.
+- 제품명: 브랜드 + 모델 + 색상 + 일련번호 (예: "세피앙 DUALFIXPRO-티크 0123")
+- 일부 제품에 사은품 바코드 1~5개 연결, 그중 일부는 시트에 없는 바코드(끊어진 연결)
+같은 seed면 항상 같은 카탈로그를 만들어 실행 간 결과를 비교할 수 있습니다.
+"""
+import random
+
+import pandas as pd
+
+from safian.catalog import GIFT_COLUMNS
+from safian.hangul import chosung
+
+BRANDS = ["세피앙", "베이비코", "클래식", "아토", "모던", "네이처", "프리미엄", "나주"]
+MODELS = ["DUALFIXPRO", "SWANDOO", "카시트", "유모차", "바운서", "하이체어", "배즙", "사과세트", "배 5kg", "수면조끼"]
+COLORS = ["티크", "웜카라멜", "그레이", "라이트 베이지", "블랙", "네이비", "민트", "핑크"]
+
+
+def barcode(i):
+    return f"B{i:010d}"
+
+
+def product_name(r, i):
+    return f"{r.choice(BRANDS)} {r.choice(MODELS)}-{r.choice(COLORS)} {i:04d}"
+
+
+def generate_catalog(n, seed=0, gift_ratio=0.3, dangling_ratio=0.02):
+    """
+    SKU n개짜리 '코드' 시트 DataFrame을 만듭니다.
+    gift_ratio: 사은품이 연결된 제품 비율, dangling_ratio: 사은품 중 시트에 없는 바코드 비율
+    """
+    r = random.Random(seed)
+    codes, names = [], []
+    gifts = {col: [None] * n for col in GIFT_COLUMNS}
+    for i in range(n):
+        codes.append(barcode(i))
+        names.append(product_name(r, i))
+        if r.random() < gift_ratio:
+            for col in GIFT_COLUMNS[:r.randint(1, len(GIFT_COLUMNS))]:
+                if r.random() < dangling_ratio:
+                    gifts[col][i] = barcode(n + r.randrange(n))
+                else:
+                    gifts[col][i] = barcode(r.randrange(n))
+    data = {"품번": codes, "제품명": names}
+    data.update(gifts)
+    return pd.DataFrame(data)
+
+
+def sample_queries(df, k, seed=0):
+    """
+    조회용 질의 묶음을 만듭니다.
+    -> {'prefix': 입력 중인 단어 앞부분(일부 초성), 'fuzzy': 순서가 바뀌고 오타가 있는 제품명, 'name_hit': 제품명 일부, 'name_miss': 없는 이름, 'barcode_hit': 있는 바코드,
+        'barcode_miss': 없는 바코드, 'gift_expand': 사은품이 달린 바코드}
+    """
+    r = random.Random(seed + 1)
+    names = df["제품명"].tolist()
+    codes = df["품번"].tolist()
+    with_gift = df.loc[df[GIFT_COLUMNS[0]].notna(), "품번"].tolist() or codes
+    n = len(codes)
+
+    def hint(name):
+        # 고객은 보통 제품명 일부만 씀 (브랜드 생략, 공백 차이)
+        words = name.split(" ")
+        return " ".join(words[1:]) if r.random() < 0.5 else name.replace(" ", "")
+
+    def typo(name):
+        # 단어 순서 바꾸기 + 한 글자 빼기 (유사도 검색용)
+        words = name.split(" ")
+        r.shuffle(words)
+        text = " ".join(words)
+        i = r.randrange(len(text))
+        return text[:i] + text[i + 1:]
+
+    def typing(name):
+        # 입력 도중의 앞부분 (단어 시작부터 1~4글자, 일부는 초성만)
+        word = r.choice(name.split(" "))
+        text = word[:r.randint(1, 4)]
+        return chosung(text) if r.random() < 0.3 else text
+
+    return {
+        "prefix": [typing(names[r.randrange(n)]) for _ in range(k)],
+        "fuzzy": [typo(names[r.randrange(n)]) for _ in range(k)],
+        "name_hit": [hint(names[r.randrange(n)]) for _ in range(k)],
+        "name_miss": [f"없는상품{r.randrange(10 ** 6):06d}" for _ in range(k)],
+        "barcode_hit": [codes[r.randrange(n)] for _ in range(k)],
+        "barcode_miss": [f"X{r.randrange(10 ** 9):010d}" for _ in range(k)],
+        "gift_expand": [with_gift[r.randrange(len(with_gift))] for _ in range(k)],
+    }
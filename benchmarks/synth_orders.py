@@ -0,0 +1,117 @@
+"""
+벤치마크용 가상 주문 생성기.
+
+실제 주문과 비슷한 카카오톡 자유 텍스트 / 탭 구분(엑셀 복사) 주문을 만듭니다.
+- 전화번호 형식: 010-1234-5678, 010.1234.5678, 010 1234 5678, 01012345678, 가운데 3자리
+- 지역 주소: 시/도 + 시/군/구 + 도로명/동/읍/면/리 + 번지, 아파트/빌라/오피스텔 동·호수
+- 수량 단위(개/박스/세트/포/병...), 배송 메모 문구, 라벨(이름:, 받는분 ...) 유무
+같은 seed면 항상 같은 주문을 만들어 실행 간 결과를 비교할 수 있습니다.
+"""
+import random
+
+NAMES = ["홍길동", "김철수", "이영희", "박민수", "최지우", "정다은", "강호동", "윤서연", "임꺽정", "한가인"]
+SURNAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+GIVEN_NAMES = ["민준", "서연", "도윤", "하은", "지호", "수아", "예준", "지우", "현우", "다은", "영", "철수"]
+NAME_LABELS = ["이름", "주문자", "수취인", "받는분", "성명", "주문인"]
+
+REGIONS = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기", "강원", "충북", "충남",
+           "전북", "전남", "경북", "경남", "제주", "수원시", "창원시"]
+DISTRICTS = ["강남구", "해운대구", "수성구", "남동구", "서구", "유성구", "중구", "성남시 분당구", "춘천시", "청주시",
+             "천안시", "전주시", "여수시", "포항시", "김해시", "제주시", "고양시"]
+STREETS = ["역삼로", "테헤란로", "중앙로", "정자동", "우동", "범어동", "구월동", "둔산동", "봉명동", "삼산동",
+           "한빛로", "새말길", "소양로", "신평면", "오창읍", "화전리"]
+BUILDINGS = ["래미안", "푸르지오", "자이", "더샵", "힐스테이트", "아이파크", "e편한세상", "롯데캐슬", "센트럴파크",
+             "한신", "우성아파트", "그린빌라", "스카이오피스텔"]
+
+QTY_UNITS = ["개", "박스", "송이", "세트", "건", "봉지", "포", "병", "단", "상자"]
+MEMOS = ["문앞에 놔주세요", "경비실에 맡겨주세요", "부재시 연락주세요", "배송전 연락 부탁드려요", "파손주의 조심히",
+         "택배함에 넣어주세요", "소화전에 놓고 가주세요", "기사님 연락요망"]
+PRODUCTS = ["DUALFIXPRO-티크", "DUALFIXPRO-웜카라멜", "나주배 5kg", "명품 사과 선물세트", "배즙 30포",
+            "티크 DUALFIXPRO", "클래식 카시트 그레이", "유모차 라이트 베이지"]
+FILLERS = ["주문합니다", "부탁드립니다", "감사합니다", "안녕하세요", "상품명:", "주문상품", "!!", "~", "^^"]
+PARTNERS = ["베이비코", "세피앙몰", "쿠팡", "11번가"]
+
+
+def phone(r):
+    if r.random() < 0.9:
+        mid = f"{r.randint(0, 9999):04d}"
+    else:
+        mid = f"{r.randint(0, 999):03d}"
+    sep = r.choice(["-", "-", ".", " ", ""])
+    return f"01{r.choice('016789')}{sep}{mid}{sep}{r.randint(0, 9999):04d}"
+
+
+def address(r):
+    street = f"{r.choice(STREETS)} {r.randint(1, 300)}"
+    if r.random() < 0.3:
+        street += f"-{r.randint(1, 30)}"
+    parts = [r.choice(REGIONS), r.choice(DISTRICTS), street]
+    if r.random() < 0.7:
+        parts.append(f"{r.choice(BUILDINGS)} {r.randint(101, 120)}동 {r.randint(101, 2505)}호")
+    elif r.random() < 0.5:
+        parts.append(f"{r.randint(2, 5)}층")
+    if r.random() < 0.15:
+        # 시/도 없이 시/군/구부터 쓰는 주소
+        parts = parts[1:]
+    return " ".join(parts)
+
+
+def person(r):
+    return r.choice(NAMES) if r.random() < 0.5 else r.choice(SURNAMES) + r.choice(GIVEN_NAMES)
+
+
+def kakao_order(r):
+    """카카오톡으로 받은 자유 형식 주문 1건"""
+    fields = []
+    if r.random() < 0.5:
+        fields.append(r.choice(NAME_LABELS) + r.choice([":", " ", ": "]) + person(r))
+    else:
+        fields.append(person(r))
+    if r.random() < 0.95:
+        fields.append(phone(r))
+    if r.random() < 0.9:
+        fields.append(address(r))
+    fields.append(r.choice(PRODUCTS))
+    if r.random() < 0.8:
+        fields.append(f"{r.randint(1, 20)}{r.choice(['', ' '])}{r.choice(QTY_UNITS)}")
+    if r.random() < 0.6:
+        fields.append(r.choice(MEMOS))
+    if r.random() < 0.4:
+        fields.append(r.choice(FILLERS))
+    if r.random() < 0.3:
+        r.shuffle(fields)
+    return r.choice([" ", "\n", ". ", "  "]).join(fields)
+
+
+def tab_order(r):
+    """엑셀 표에서 복사한 탭 구분 주문 1건"""
+    cols = []
+    if r.random() < 0.6:
+        cols.append(r.choice(PARTNERS))
+    cols += [person(r), person(r) if r.random() < 0.6 else "", phone(r), address(r), r.choice(PRODUCTS)]
+    if r.random() < 0.7:
+        cols.append(str(r.randint(1, 5)))
+    else:
+        cols.append(f"{r.randint(1, 5)}{r.choice(QTY_UNITS)}")
+    if r.random() < 0.5:
+        cols.append(r.choice(MEMOS))
+    if r.random() < 0.2:
+        r.shuffle(cols)
+    return "\t".join(cols)
+
+
+def iter_orders(n, seed=0, kind="mixed", tab_ratio=0.3):
+    """
+    가상 주문 n건을 하나씩 생성합니다.
+    kind: 'kakao' (자유 텍스트), 'tab' (탭 구분), 'mixed' (tab_ratio 비율로 섞음)
+    """
+    r = random.Random(seed)
+    for _ in range(n):
+        if kind == "tab" or (kind == "mixed" and r.random() < tab_ratio):
+            yield tab_order(r)
+        else:
+            yield kakao_order(r)
+
+
+def generate_orders(n, seed=0, kind="mixed", tab_ratio=0.3):
+    return list(iter_orders(n, seed, kind, tab_ratio))
@@ -2,6 +2,12 @@ import tkinter as tk
 import os
 import sys
 from safian.gui import OrderApp
+from safian.sources import load_sources_config
+
+# 브랜드/시즌별 마스터를 함께 쓸 때의 설정 파일 (없으면 발주서의 '코드' 시트만 사용)
+SOURCES_CONFIG = "catalog_sources.json"
+# 주문 분석 서버를 함께 쓸 때 서버 주소 (예: http://192.168.0.10:8765). 없으면 이 PC에서 마스터를 읽음
+SERVER_ENV = "SAFIAN_SERVER"
 
 def main():
     root = tk.Tk()
@@ -23,7 +29,11 @@ def main():
          # 파일이 없더라도 일단 빈 문자열로 실행, 에러 메시지 출력됨
          excel_file = "2026통합발주서_영업_연습.xlsb"
 
-    app = OrderApp(root, excel_file)
+    sources = None
+    if os.path.exists(SOURCES_CONFIG):
+        sources = load_sources_config(SOURCES_CONFIG)
+
+    app = OrderApp(root, excel_file, sources=sources, server_url=os.environ.get(SERVER_ENV))
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import argparse
+import sys
+
+DEFAULT_MASTER = "2026통합발주서_영업_연습.xlsb"
+DEFAULT_POSTAL_DB = "postal_codes.db"
+
+
+def _batch(args):
+    from safian.batch import run_batch
+    sources = None
+    if args.sources:
+        from safian.sources import load_sources_config
+        sources = load_sources_config(args.sources)
+    done, errors = run_batch(args.source, args.master, args.output, workers=args.workers, chunksize=args.chunksize,
+                             sources=sources)
+    print(f"완료: {done}건 처리, 오류 {errors}건 -> {args.output}")
+    if args.metrics:
+        from safian.metrics import dump_metrics
+        dump_metrics(args.metrics)
+        print(f"처리시간 집계: {args.metrics}")
+    return 1 if errors and args.strict else 0
+
+
+def _postal(args):
+    from safian.postal import PostalIndex, build_postal_db
+    if args.sources:
+        count = build_postal_db(args.sources, args.output,
+                                progress=lambda path, total: print(f"{path}: 누적 {total:,}행"))
+        print(f"완료: 주소 {count:,}건 -> {args.output}")
+    if args.lookup:
+        index = PostalIndex(args.output)
+        for address in args.lookup:
+            print(f"{index.postal_code(address) or '(없음)'}\t{address}")
+        index.close()
+    return 0
+
+
+def _serve(args):
+    from safian.core import OrderProcessor
+    from safian.server import run_server
+    sources = None
+    if args.sources:
+        from safian.sources import load_sources_config
+        sources = load_sources_config(args.sources)
+    processor = OrderProcessor(args.master, background=True, sources=sources, postal_db=args.postal_db,
+                               metrics_path=args.metrics)
+    print(f"주문 분석 서버: http://{args.host}:{args.port} (Ctrl+C로 종료)")
+    run_server(processor, args.host, args.port, max_concurrency=args.concurrency)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m safian", description="Safian 발주서 자동화 도구")
+    sub = parser.add_subparsers(dest="command")
+
+    p_batch = sub.add_parser("batch", help="주문 텍스트 파일/폴더 일괄 분석")
+    p_batch.add_argument("source", help="주문 텍스트 파일 또는 폴더 (.txt 카톡 덤프, .tsv 표 내보내기)")
+    p_batch.add_argument("-m", "--master", default=DEFAULT_MASTER, help="마스터 엑셀(.xlsb) 경로")
+    p_batch.add_argument("--sources", help="여러 마스터를 합칠 때의 카탈로그 소스 설정 (JSON)")
+    p_batch.add_argument("-o", "--output", default="batch_result.jsonl", help="결과 파일 (JSON Lines)")
+    p_batch.add_argument("-w", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    p_batch.add_argument("--chunksize", type=int, default=64, help="워커에 한 번에 넘길 주문 수")
+    p_batch.add_argument("--metrics", help="단계별 처리시간 집계를 기록할 파일 (.json 또는 .prom)")
+    p_batch.add_argument("--strict", action="store_true", help="오류가 한 건이라도 있으면 종료코드 1")
+    p_batch.set_defaults(func=_batch)
+
+    p_postal = sub.add_parser("postal", help="도로명주소 원본을 우편번호 조회용 DB로 변환")
+    p_postal.add_argument("sources", nargs="*", help="도로명주소 원본 파일 또는 폴더 (.txt '|' 구분 / 헤더 있는 .csv)")
+    p_postal.add_argument("-o", "--output", default=DEFAULT_POSTAL_DB, help="만들(또는 조회할) DB 파일")
+    p_postal.add_argument("--lookup", action="append", help="변환 후 이 주소의 우편번호를 조회해 출력 (여러 번 지정 가능)")
+    p_postal.set_defaults(func=_postal)
+
+    p_serve = sub.add_parser("serve", help="여러 PC가 함께 쓰는 주문 분석 서버 실행 (HTTP/JSON)")
+    p_serve.add_argument("-m", "--master", default=DEFAULT_MASTER, help="마스터 엑셀(.xlsb) 경로")
+    p_serve.add_argument("--sources", help="여러 마스터를 합칠 때의 카탈로그 소스 설정 (JSON)")
+    p_serve.add_argument("--postal-db", default=DEFAULT_POSTAL_DB, help="우편번호 조회용 주소 DB")
+    p_serve.add_argument("--host", default="127.0.0.1", help="바인드 주소 (다른 PC에서 접속하려면 0.0.0.0)")
+    p_serve.add_argument("--port", type=int, default=8765, help="포트")
+    p_serve.add_argument("--concurrency", type=int, default=8, help="동시에 처리할 요청 수")
+    p_serve.add_argument("--metrics", help="종료 시 단계별 처리시간 집계를 기록할 파일 (.json 또는 .prom)")
+    p_serve.set_defaults(func=_serve)
+
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
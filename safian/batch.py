@@ -0,0 +1,167 @@
+"""
+주문 텍스트 파일(카카오톡 대화 덤프, 탭 구분 내보내기)을 한꺼번에 분석하는 일괄 처리기.
+
+    python -m safian batch 주문폴더/ --master 2026통합발주서_영업_연습.xlsb -o 결과.jsonl --workers 4
+
+- 폴더를 주면 안의 .txt/.tsv 파일을 모두 읽습니다.
+- 탭 구분 파일은 한 줄이 주문 1건, 카카오톡 덤프는 빈 줄로 구분된 덩어리가 주문 1건입니다.
+- 결과는 주문 1건당 JSON 한 줄로 순서대로 바로바로 기록됩니다.
+- 한 건에서 오류가 나도 error 필드에 기록하고 나머지는 계속 처리합니다.
+"""
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from safian.core import OrderProcessor
+from safian.logs import setup_worker_logging, worker_log_queue
+from safian.metrics import inc, observe
+from safian.parser import parse_order_text
+
+INPUT_SUFFIXES = (".txt", ".tsv")
+
+_BLOCK_SPLIT = re.compile(r'\n\s*\n')
+
+# 결과에 잠시 담아 부모 프로세스로 넘기는 단계별 처리시간 (기록 전에 제거)
+TIMINGS_KEY = "_timings"
+
+# 워커 프로세스마다 하나씩 유지하는 OrderProcessor (카탈로그는 부모 프로세스가 만든 것을 그대로 사용)
+_processor = None
+
+
+def _is_tab_separated(path, lines):
+    if path.lower().endswith(".tsv"):
+        return True
+    filled = [line for line in lines if line.strip()]
+    return bool(filled) and sum(line.count('\t') >= 2 for line in filled) * 2 >= len(filled)
+
+
+def read_records(path):
+    """파일 하나를 (레코드ID, 주문텍스트) 목록으로 나눕니다."""
+    with open(path, encoding="utf-8-sig") as f:
+        content = f.read().replace('\r\n', '\n')
+    name = os.path.basename(path)
+    lines = content.split('\n')
+
+    if _is_tab_separated(path, lines):
+        return [(f"{name}:{no}", line) for no, line in enumerate(lines, start=1) if line.strip()]
+
+    records = []
+    for no, block in enumerate(_BLOCK_SPLIT.split(content), start=1):
+        if block.strip():
+            records.append((f"{name}#{no}", block.strip()))
+    return records
+
+
+def collect_records(source):
+    """파일 또는 폴더(하위 폴더 포함)에서 주문 레코드를 모읍니다."""
+    if os.path.isfile(source):
+        return read_records(source)
+
+    records = []
+    for root, _, files in os.walk(source):
+        for filename in sorted(files):
+            if filename.lower().endswith(INPUT_SUFFIXES):
+                records.extend(read_records(os.path.join(root, filename)))
+    return records
+
+
+def _init_worker(master_file_path, sources=None, log_queue=None, catalog=None):
+    global _processor
+    if log_queue is not None:
+        # debug.log는 부모 프로세스만 기록 (워커마다 같은 파일을 돌려쓰지 않도록)
+        setup_worker_logging(log_queue)
+    if _processor is None:
+        # spawn 방식(윈도우): 부모가 넘겨준 카탈로그를 쓰므로 마스터(.xlsb)를 워커마다 다시 파싱하지 않음
+        _processor = OrderProcessor(master_file_path, sources=sources, source_catalog=catalog)
+
+
+def process_record(record):
+    """주문 1건 분석 + 바코드 매칭. 오류는 예외 대신 결과의 error 필드에 담습니다."""
+    record_id, text = record
+    result = {"id": record_id, "parsed": None, "barcode": "", "product_name": "", "items": [], "error": ""}
+    timings = result[TIMINGS_KEY] = {}
+    clock = time.perf_counter
+    try:
+        start = clock()
+        parsed = parse_order_text(text)
+        timings["parse"] = clock() - start
+        result["parsed"] = parsed
+        hint = parsed.get("product_hint")
+        if hint and _processor is not None:
+            start = clock()
+            items = _processor.find_barcode_by_product_name(hint)
+            timings["match"] = clock() - start
+            if items:
+                result["barcode"] = items[0]["barcode"]
+                result["product_name"] = items[0]["product_name"]
+                result["items"] = items
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc(limit=3)
+    return result
+
+
+def _report(done, total, errors, started, stream):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    stream.write(f"\r처리 {done}/{total}건 (오류 {errors}건, {rate:,.0f}건/초)")
+    stream.flush()
+
+
+def run_batch(source, master_file_path, output_path, workers=None, chunksize=64, progress=sys.stderr, sources=None):
+    """
+    주문 파일들을 분석해 결과를 output_path(JSON Lines)에 순서대로 기록합니다.
+    sources: 여러 마스터를 합쳐 쓸 때의 카탈로그 소스 목록 (OrderProcessor 참고)
+    반환값: (처리 건수, 오류 건수)
+    """
+    global _processor
+    records = collect_records(source)
+    total = len(records)
+    workers = workers or os.cpu_count() or 1
+
+    # 부모 프로세스에서 한 번만 로드해 워커에 넘김 (마스터가 여러 개라 스냅샷이 없어도 워커는 다시 파싱하지 않음)
+    # (fork 방식에서는 부모의 OrderProcessor를 그대로 물려받음)
+    _processor = OrderProcessor(master_file_path, sources=sources)
+    if _processor.catalog is None:
+        progress.write(f"경고: 제품 목록을 불러오지 못해 바코드 매칭 없이 분석만 합니다 ({master_file_path})\n")
+
+    done = errors = 0
+    started = time.perf_counter()
+    last_report = 0.0
+
+    with open(output_path, "w", encoding="utf-8") as out:
+        if workers <= 1:
+            results = map(process_record, records)
+            executor = log_listener = None
+        else:
+            log_queue, log_listener = worker_log_queue()
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(master_file_path, sources, log_queue, _processor.catalog))
+            results = executor.map(process_record, records, chunksize=chunksize)
+        try:
+            for result in results:
+                # 워커 프로세스의 처리시간을 부모 프로세스 집계에 합침
+                for name, seconds in result.pop(TIMINGS_KEY, {}).items():
+                    observe(f"batch_{name}", seconds)
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                done += 1
+                if result["error"]:
+                    errors += 1
+                    inc("batch_errors")
+                now = time.perf_counter()
+                if progress and now - last_report >= 0.5:
+                    _report(done, total, errors, started, progress)
+                    last_report = now
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+                log_listener.stop()
+
+    if progress:
+        _report(done, total, errors, started, progress)
+        progress.write("\n")
+    return done, errors
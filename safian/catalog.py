@@ -0,0 +1,163 @@
+import sys
+from types import MappingProxyType
+from typing import NamedTuple
+
+import pandas as pd
+
+from safian.fuzzy import FuzzyIndex
+from safian.index import NgramIndex
+from safian.prefix import PrefixIndex
+
+GIFT_COLUMNS = [f'사은품 {i}' for i in range(1, 6)]
+# '코드' 시트에서 실제로 사용하는 컬럼 (나머지 컬럼은 읽지 않음)
+CATALOG_COLUMNS = ['품번', '제품명'] + GIFT_COLUMNS
+
+
+class Gift(NamedTuple):
+    barcode: str
+    product_name: str
+
+
+class Bundle(NamedTuple):
+    """바코드 하나에 대응하는 본품 + 사은품 묶음 (불변)"""
+    barcode: str
+    product_name: str
+    gifts: tuple
+
+    def to_items(self):
+        """기존 조회 메서드들이 반환하던 [{'type', 'product_name', 'barcode'}, ...] 형식"""
+        items = [{'type': '본품', 'product_name': self.product_name, 'barcode': self.barcode}]
+        for gift in self.gifts:
+            items.append({'type': '사은품', 'product_name': gift.product_name, 'barcode': gift.barcode})
+        return items
+
+
+def rows_from_dataframe(df):
+    """
+    정제된 '코드' 시트 DataFrame을 (품번, 제품명, [사은품 바코드...]) 행 목록으로 변환합니다.
+    사은품 셀은 기존 조회 로직과 동일하게 문자열로 바꾸고 빈 값/'nan'은 건너뜁니다.
+    바코드/제품명 문자열은 intern하여 본품과 사은품 칸에 같은 바코드가 나와도 객체 하나만 둡니다.
+    """
+    intern = sys.intern
+    gift_cols = [c for c in GIFT_COLUMNS if c in df.columns]
+    rows = []
+    for record in df[['품번', '제품명'] + gift_cols].itertuples(index=False, name=None):
+        barcode, name = intern(record[0]), intern(record[1])
+        gifts = []
+        for value in record[2:]:
+            if pd.notna(value):
+                gift_barcode = str(value).strip()
+                if gift_barcode and gift_barcode != 'nan':
+                    gifts.append(intern(gift_barcode))
+        rows.append((barcode, name, tuple(gifts)))
+    return rows
+
+
+def build_bundle_table(rows):
+    """
+    행 목록으로부터 바코드 -> Bundle 해시 테이블을 만듭니다.
+
+    반환값: (bundles, row_bundles, dangling)
+      - bundles: 바코드 -> Bundle (읽기 전용 매핑, 중복 품번은 첫 번째 행 기준)
+      - row_bundles: 시트 행 순서대로의 Bundle 튜플 (이름 검색 결과 위치용)
+      - dangling: 시트에 없는 사은품 바코드 목록 [(본품 바코드, 사은품 바코드), ...]
+    """
+    names = {}
+    for barcode, name, _ in rows:
+        names.setdefault(barcode, name)
+
+    bundles = {}
+    row_bundles = []
+    dangling = []
+    gift_cache = {}  # 같은 사은품은 Gift 객체 하나를 여러 묶음이 공유
+    for barcode, name, gift_barcodes in rows:
+        gifts = []
+        for gift_barcode in gift_barcodes:
+            gift = gift_cache.get(gift_barcode)
+            if gift is None:
+                gift = gift_cache[gift_barcode] = Gift(gift_barcode, names.get(gift_barcode, ""))
+            if gift_barcode not in names:
+                dangling.append((barcode, gift_barcode))
+            gifts.append(gift)
+        bundle = Bundle(barcode, name, tuple(gifts))
+        row_bundles.append(bundle)
+        bundles.setdefault(barcode, bundle)
+
+    return MappingProxyType(bundles), tuple(row_bundles), tuple(dangling)
+
+
+class ReloadSummary(NamedTuple):
+    """마스터 파일을 다시 읽었을 때 바뀐 바코드 목록"""
+    added: tuple
+    removed: tuple
+    changed: tuple
+
+    def __str__(self):
+        return f"추가 {len(self.added)}건, 삭제 {len(self.removed)}건, 변경 {len(self.changed)}건"
+
+
+def diff_catalogs(old, new):
+    """두 카탈로그의 바코드 묶음을 비교해 ReloadSummary를 만듭니다."""
+    old_bundles = old.bundles if old is not None else {}
+    new_bundles = new.bundles
+    added = tuple(b for b in new_bundles if b not in old_bundles)
+    removed = tuple(b for b in old_bundles if b not in new_bundles)
+    changed = tuple(b for b, bundle in new_bundles.items() if b in old_bundles and old_bundles[b] != bundle)
+    return ReloadSummary(added, removed, changed)
+
+
+class Catalog:
+    """
+    조회에 필요한 모든 구조를 담은 제품 카탈로그.
+    정제된 행 목록(rows)으로부터 제품명 역색인(포함 검색/유사도 검색/자동완성)과 바코드 묶음 테이블을 만듭니다.
+    """
+
+    def __init__(self, rows, sources=(), origins=None):
+        """
+        sources: 카탈로그를 만든 소스 이름들 (우선순위 순)
+        origins: 바코드 -> 소스 이름. 소스가 하나뿐이면 None (모든 바코드가 sources[0])
+        """
+        # 행 목록은 색인을 만드는 데만 쓰고 보관하지 않음 (행 내용은 row_bundles에 그대로 있음)
+        self.size = len(rows)
+        self.sources = tuple(sources)
+        self.origins = origins
+        self.name_index = NgramIndex(name for _, name, _ in rows)
+        self.fuzzy_index = FuzzyIndex(name for _, name, _ in rows)
+        # 자동완성 색인은 유사도 색인의 자모 분해 문자열을 그대로 공유
+        self.prefix_index = PrefixIndex(rows, jamo_keys=self.fuzzy_index.keys)
+        self.bundles, self.row_bundles, self.dangling_gifts = build_bundle_table(rows)
+
+    @classmethod
+    def from_dataframe(cls, df, source=""):
+        return cls(rows_from_dataframe(df), sources=(source,) if source else ())
+
+    def __len__(self):
+        return self.size
+
+    def rows(self):
+        """카탈로그를 만든 (품번, 제품명, (사은품 바코드, ...)) 행 목록 (row_bundles에서 다시 만듦)"""
+        return [(bundle.barcode, bundle.product_name, tuple(gift.barcode for gift in bundle.gifts))
+                for bundle in self.row_bundles]
+
+    def same_content(self, rows, sources=(), origins=None):
+        """같은 행/소스로 만든 카탈로그인지 (같으면 색인을 다시 만들 필요가 없음)"""
+        return (self.size == len(rows) and self.sources == tuple(sources) and self.origins == origins
+                and self.rows() == rows)
+
+    def source_of(self, barcode):
+        """바코드가 어느 소스(마스터 파일:시트)에서 왔는지 반환 (없는 바코드면 None)"""
+        if barcode not in self.bundles:
+            return None
+        if self.origins is not None:
+            return self.origins.get(barcode)
+        return self.sources[0] if self.sources else None
+
+    def __getstate__(self):
+        # MappingProxyType은 pickle이 안 되므로 일반 dict로 저장
+        state = self.__dict__.copy()
+        state['bundles'] = dict(self.bundles)
+        return state
+
+    def __setstate__(self, state):
+        state['bundles'] = MappingProxyType(state['bundles'])
+        self.__dict__.update(state)
@@ -1,243 +1,727 @@
 import pandas as pd
+import logging
 import os
 import platform
 import random
 import string
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from safian.dedup import ORIGIN_SESSION, ORIGIN_SHEET, DuplicateIndex, key_from_row, read_sheet_keys
+from safian.catalog import CATALOG_COLUMNS, Catalog, diff_catalogs, rows_from_dataframe
+from safian.logs import get_logger, setup_logging
+from safian.metrics import dump_metrics, inc, span
+from safian.snapshot import fingerprint, load_snapshot, save_snapshot
+from safian.sources import CatalogSource, as_source, merge_rows, precedence
+from safian.excel_sink import ComSheetSink, SaveCancelled, XlsxSink, iter_order_rows, order_rows
+from safian.excel_session import DEFAULT_IDLE_TIMEOUT, ExcelSession, ExcelSessionError
+from safian import importer
+from safian.parser import parse_order_text
+from safian.postal import DEFAULT_POSTAL_DB, PostalIndex
+
+logger = get_logger("core")
+
+# 여러 마스터 파일을 동시에 읽을 때 최대 스레드 수
+MAX_LOAD_WORKERS = 4
 
 class OrderProcessor:
-    def __init__(self, master_file_path):
-        self.master_file_path = master_file_path
-        self.products_df = None
+    def __init__(self, master_file_path, use_snapshot=True, background=False, excel_backend=None, source_df=None,
+                 metrics_path=None, sources=None, duplicate_window=None, postal_db=DEFAULT_POSTAL_DB,
+                 source_catalog=None, excel_idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        sources: 카탈로그를 읽어올 마스터 목록 (CatalogSource, 경로, (경로, 시트, 우선순위) 등).
+                 없으면 master_file_path의 '코드' 시트 하나만 사용합니다.
+                 주문 저장(append_orders_to_excel)은 항상 master_file_path에 합니다.
+        duplicate_window: 대기 리스트 주문끼리 중복으로 볼 시간 범위(초). None이면 기간 제한 없음
+                          (발주내역 시트에는 주문 날짜가 없으므로 시트에 있는 주문에는 적용하지 않음)
+        postal_db: 우편번호 조회용 주소 DB(SQLite). 파일이 없으면 우편번호는 빈칸으로 둡니다.
+        source_catalog: 다른 프로세스가 이미 만든 Catalog. 주어지면 마스터를 읽지 않고 그대로 사용 (일괄 처리 워커용)
+        excel_idle_timeout: 마지막 엑셀 저장 후 마스터 워크북을 닫기까지의 시간(초). 0이면 저장마다 닫고
+                            None이면 앱 종료까지 열어 둡니다. (safian.excel_session 참고)
+        """
+        # 로그는 큐에 넣고 백그라운드 스레드가 debug.log에 기록 (최초 1회 설정)
+        setup_logging()
+        if sources:
+            self.sources = [as_source(s) for s in sources]
+        else:
+            self.sources = [CatalogSource(master_file_path)]
+        self.master_file_path = master_file_path or self.sources[0].path
+        self.metrics_path = metrics_path    # close() 시 단계별 소요시간 집계를 기록할 파일 (.json / .prom)
+        self.source_df = source_df          # 파일 대신 사용할 '코드' 시트 DataFrame (벤치마크/테스트용)
+        self.source_catalog = source_catalog
+        self.use_snapshot = use_snapshot
+        self.excel_backend = excel_backend  # None이면 pywin32 사용 (테스트 시 가짜 COM 백엔드 주입)
+        self.excel_session = None           # 저장 시 처음 생성 (워크북은 유휴 시간이 지나면 닫음)
+        self.excel_idle_timeout = excel_idle_timeout
+        self.catalog = None        # 제품명 역색인 + 바코드 묶음 테이블
+        self._master_stat = None   # 마지막으로 읽은 마스터 파일들의 (크기, 수정시각)
+        self._reload_lock = threading.Lock()
+        # (핸드폰, 주소, 바코드, 수량) -> 먼저 들어온 주문 (대기 리스트 + 발주내역 시트)
+        self.order_history = DuplicateIndex(window=duplicate_window)
+        self._watch_stop = None
+        self.postal_db = postal_db
+        self._postal = None        # 처음 우편번호를 조회할 때 엶 (False: 파일 없음/열기 실패)
+        self._postal_lock = threading.Lock()
+        
+        # 로드 완료 시 catalog(실패 시 None)로 완료되는 Future
+        self.load_future = Future()
         
         # Load Code map immediately upon initialization
-        self._load_products()
+        # background=True 이면 별도 스레드에서 로드하고 바로 반환 (GUI 창을 먼저 띄우기 위함)
+        if background:
+            threading.Thread(target=self._run_load, name="catalog-loader", daemon=True).start()
+        else:
+            self._run_load()
 
-    def _log(self, msg):
-        """디버깅용 로그 저장"""
+    @classmethod
+    def from_dataframe(cls, df, **kwargs):
+        """xlsb 파일 없이 '코드' 시트와 같은 형식의 DataFrame으로 바로 생성 (벤치마크/테스트용)"""
+        kwargs.setdefault("use_snapshot", False)
+        return cls("", source_df=df, **kwargs)
+
+    def _run_load(self):
         try:
-            with open("debug.log", "a", encoding="utf-8") as f:
-                f.write(f"{datetime.now()}: {msg}\n")
-        except:
-             pass
+            self._load_products()
+        finally:
+            self.load_future.set_result(self.catalog)
+
+    @property
+    def ready(self):
+        """마스터 데이터 로드가 끝났는지 (성공/실패 무관)"""
+        return self.load_future.done()
+
+    @property
+    def product_count(self):
+        """현재 카탈로그의 제품 수 (로드 전이거나 실패하면 None)"""
+        catalog = self.catalog
+        return None if catalog is None else len(catalog)
+
+    def wait_until_ready(self, timeout=None):
+        """로드가 끝날 때까지 기다린 뒤 현재 catalog를 반환 (실패 시 None)"""
+        self.load_future.result(timeout)
+        return self.catalog
+
+    def when_ready(self, fn, *args):
+        """
+        로드가 끝나면 fn(*args)를 실행하고 그 결과를 담은 Future를 반환합니다.
+        이미 로드된 상태면 즉시 실행됩니다. (콜백은 로더 스레드에서 실행될 수 있음)
+        """
+        result = Future()
+        
+        def run(_):
+            try:
+                result.set_result(fn(*args))
+            except Exception as e:
+                result.set_exception(e)
+                
+        self.load_future.add_done_callback(run)
+        return result
+
+    def _log(self, msg, level=logging.INFO):
+        """디버깅용 로그 저장 (파일 쓰기는 로그 스레드에서 처리)"""
+        logger.log(level, msg)
 
     def _load_products(self):
         """마스터 엑셀에서 제품명 <-> 바코드 매핑 데이터 로드"""
-        if not os.path.exists(self.master_file_path):
-            self._log(f"엑셀 파일을 찾을 수 없습니다: {self.master_file_path}")
-            return
+        with span("catalog_load"):
+            catalog = self._build_catalog()
+        if catalog is not None:
+            self._set_catalog(catalog)
+
+    def _build_catalog(self, current=None):
+        """
+        마스터 엑셀(또는 스냅샷)로부터 새 카탈로그를 만들어 반환합니다. (실패 시 None)
+        현재 사용 중인 catalog는 건드리지 않으므로 다시 읽기(reload)에도 그대로 사용합니다.
+        source_df가 주어졌으면 파일 대신 그 DataFrame을 '코드' 시트로 사용합니다.
+        마스터가 여러 개면 스레드 풀에서 동시에 읽은 뒤 우선순위대로 합칩니다.
+        current: 지금 쓰는 카탈로그. 새로 읽은 '코드' 행이 그대로면 색인을 다시 만들지 않고 current를 반환
+        (발주내역 시트만 바뀐 저장 등)
+        """
+        if self.source_catalog is not None:
+            return self.source_catalog
+        if self.source_df is not None:
+            try:
+                products_df = self._clean_products(self.source_df.copy())
+                if products_df is None:
+                     return None
+                catalog = Catalog.from_dataframe(products_df)
+                self._log("상품/바코드 목록 로드 성공 완료")
+                return catalog
+            except Exception as e:
+                 self._log(f"상품 목록 로드 실패: {e}", logging.ERROR)
+                 return None
+                 
+        # 파일이 바뀌었는지 감시하기 위해 읽기 직전의 상태를 기억
+        self._master_stat = self._stat_master()
+        if len(self.sources) == 1:
+            return self._build_single(self.sources[0], current)
             
+        sources = precedence(self.sources)
+        with ThreadPoolExecutor(max_workers=min(len(sources), MAX_LOAD_WORKERS),
+                                thread_name_prefix="catalog-source") as pool:
+            loaded = list(zip(sources, pool.map(self._read_source, sources)))
+        loaded = [(source, rows) for source, rows in loaded if rows is not None]
+        if not loaded:
+             return None
+             
+        rows, origins, conflicts = merge_rows(loaded)
+        labels = [source.label for source, _ in loaded]
+        if current is not None and current.same_content(rows, labels, origins):
+             return current
+        if conflicts:
+             samples = ", ".join(f"{barcode}({kept} > {dropped})" for barcode, kept, dropped in conflicts[:10])
+             self._log(f"여러 마스터에 중복된 바코드 {len(conflicts)}건은 우선순위가 높은 쪽을 사용 ({samples})",
+                       logging.WARNING)
         try:
-            # pyxlsb를 이용하여 '코드' 시트 읽기 (발주서 연습 파일 기준)
-            df = pd.read_excel(self.master_file_path, sheet_name='코드', engine='pyxlsb', header=0)
-            
-            # 컬럼명 정제 (공백 등 제거)
-            df.columns = [str(c).strip() for c in df.columns]
+            catalog = Catalog(rows, sources=labels, origins=origins)
+        except Exception as e:
+             self._log(f"상품 목록 로드 실패: {e}", logging.ERROR)
+             return None
+        self._log(f"상품/바코드 목록 로드 성공 완료 (마스터 {len(loaded)}/{len(sources)}개, {len(catalog)}행)")
+        return catalog
+
+    def _build_single(self, source, current=None):
+        """마스터가 하나일 때: 스냅샷이 있으면 그대로 쓰고, 없으면 읽은 뒤 스냅샷 저장"""
+        if not os.path.exists(source.path):
+            self._log(f"엑셀 파일을 찾을 수 없습니다: {source.path}", logging.ERROR)
+            return None
             
-            # None/NaN 데이터 제거 (품번, 제품명이 있는 행만)
-            if '품번' in df.columns and '제품명' in df.columns:
-                 self.products_df = df[df['품번'].notna() & df['제품명'].notna()].copy()
-                 self.products_df['품번'] = self.products_df['품번'].astype(str).str.strip()
-                 self.products_df['제품명'] = self.products_df['제품명'].astype(str).str.strip()
-                 self._log("상품/바코드 목록 로드 성공 완료")
-            else:
-                 self._log(f"오류: '코드' 시트에 '품번'이나 '제품명' 열이 없습니다. (현재열: {df.columns.tolist()})")
-                 
+        # 마스터 파일이 바뀌지 않았으면 저장된 스냅샷으로 바로 시작 (xlsb 파싱 생략)
+        if self.use_snapshot:
+            try:
+                catalog = load_snapshot(source.path, source.sheet)
+            except Exception as e:
+                catalog = None
+                self._log(f"카탈로그 스냅샷 읽기 실패 (원본에서 다시 로드): {e}", logging.WARNING)
+            if catalog is not None:
+                if current is not None and current.same_content(catalog.rows(), catalog.sources):
+                     return current
+                self._log("상품/바코드 목록 스냅샷 로드 성공 완료")
+                return catalog
+                
+        # 읽는 도중 마스터가 저장되면 스냅샷이 새 파일 정보와 옛 카탈로그를 묶지 않도록 읽기 전에 지문을 구함
+        before = None
+        if self.use_snapshot:
+            try:
+                before = fingerprint(source.path, source.sheet)
+            except OSError as e:
+                self._log(f"마스터 파일 확인 실패 (스냅샷 저장 생략): {e}", logging.WARNING)
+
+        rows = self._read_source(source)
+        if rows is None:
+             return None
+        if current is not None and current.same_content(rows, [source.label]):
+             # 행이 그대로면 지금 카탈로그를 새 파일 지문으로 다시 저장만 함
+             catalog = current
+        else:
+            try:
+                # 제품명 n-gram 역색인 + 바코드 -> 본품/사은품 묶음 테이블 (로드 시 1회 생성)
+                catalog = Catalog(rows, sources=[source.label])
+                self._log("상품/바코드 목록 로드 성공 완료")
+            except Exception as e:
+                 self._log(f"상품 목록 로드 실패: {e}", logging.ERROR)
+                 return None
+
+        if before is not None:
+            try:
+                if not save_snapshot(source.path, catalog, source.sheet, before):
+                    self._log("마스터 파일이 읽는 도중 바뀌어 스냅샷을 저장하지 않음", logging.WARNING)
+            except Exception as e:
+                self._log(f"카탈로그 스냅샷 저장 실패: {e}", logging.WARNING)
+                
+        return catalog
+
+    def _read_source(self, source):
+        """
+        마스터 파일 하나의 시트를 읽어 정제된 행 목록으로 반환합니다. (실패 시 None)
+        시트는 카탈로그에 필요한 컬럼만 읽고, DataFrame은 행 목록을 만든 뒤 버립니다.
+        """
+        if not os.path.exists(source.path):
+            self._log(f"엑셀 파일을 찾을 수 없습니다: {source.path}", logging.ERROR)
+            return None
+        try:
+            # pyxlsb를 이용하여 시트 읽기 (발주서 연습 파일 기준 '코드' 시트)
+            df = pd.read_excel(source.path, sheet_name=source.sheet, engine='pyxlsb', header=0,
+                               usecols=lambda c: str(c).strip() in CATALOG_COLUMNS)
+            products_df = self._clean_products(df, source.sheet)
+            del df
+            if products_df is None:
+                 return None
+            return rows_from_dataframe(products_df)
         except Exception as e:
-             self._log(f"상품 목록 로드 실패: {e}")
+             self._log(f"상품 목록 로드 실패 ({source.label}): {e}", logging.ERROR)
+             return None
+
+    def _clean_products(self, df, sheet='코드'):
+        """'코드' 시트 DataFrame 정제: 품번/제품명이 있는 행만 남기고 문자열로 통일"""
+        # 컬럼명 정제 (공백 등 제거)
+        df.columns = [str(c).strip() for c in df.columns]
+        
+        # None/NaN 데이터 제거 (품번, 제품명이 있는 행만)
+        if '품번' not in df.columns or '제품명' not in df.columns:
+             self._log(f"오류: '{sheet}' 시트에 '품번'이나 '제품명' 열이 없습니다. (현재열: {df.columns.tolist()})", logging.ERROR)
+             return None
+             
+        products_df = df[df['품번'].notna() & df['제품명'].notna()].copy()
+        products_df['품번'] = products_df['품번'].astype(str).str.strip()
+        products_df['제품명'] = products_df['제품명'].astype(str).str.strip()
+        return products_df
+
+    def _set_catalog(self, catalog):
+        # 완성된 카탈로그를 참조 하나로 교체 (조회 중인 스레드는 이전 카탈로그를 끝까지 사용)
+        self.catalog = catalog
+        if catalog.dangling_gifts:
+             samples = ", ".join(f"{main}->{gift}" for main, gift in catalog.dangling_gifts[:10])
+             self._log(f"경고: 코드 시트에 없는 사은품 바코드 {len(catalog.dangling_gifts)}건 ({samples})", logging.WARNING)
+
+    # ------------------ 마스터 파일 변경 감시 ------------------ #
+    def _stat_master(self):
+        """마스터 파일마다 (크기, 수정시각). 하나라도 바뀌면 다시 읽음"""
+        if self.source_df is not None or self.source_catalog is not None:
+            return None
+        stats = []
+        for source in self.sources:
+            try:
+                st = os.stat(source.path)
+                stats.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                stats.append(None)
+        if not any(stats):
+            return None
+        return tuple(stats)
+
+    def reload(self):
+        """
+        마스터 엑셀을 다시 읽어 새 카탈로그로 교체하고 변경 요약(ReloadSummary)을 반환합니다.
+        새 카탈로그가 완성된 뒤에만 교체하며, 읽기에 실패하거나 '코드' 행이 그대로면 기존 카탈로그를 유지하고 None을 반환합니다.
+        """
+        with self._reload_lock, span("catalog_reload"):
+            catalog = self._build_catalog(self.catalog)
+            if catalog is None:
+                return None
+            if catalog is self.catalog:
+                # 발주내역 저장 등으로 파일만 바뀌고 '코드' 행은 그대로
+                self._log("마스터 파일이 바뀌었지만 '코드' 시트 내용은 같아 카탈로그를 유지")
+                return None
+                
+            summary = diff_catalogs(self.catalog, catalog)
+            self._set_catalog(catalog)
+            self._log(f"마스터 파일 다시 읽기 완료: {summary}")
+            return summary
 
-    def find_barcode_by_product_name(self, hint):
+    def watch_master_file(self, interval=2.0, on_reload=None):
+        """
+        마스터 파일 변경을 백그라운드 스레드에서 감시하다가 바뀌면 reload 합니다.
+        on_reload(summary)는 감시 스레드에서 호출되므로 GUI에서는 메인 스레드로 넘겨 처리해야 합니다.
+        """
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+        
+        def watch():
+            # 초기 로드가 끝난 뒤부터 감시
+            self.load_future.result()
+            pending = None
+            while not stop.wait(interval):
+                current = self._stat_master()
+                if current is None or current == self._master_stat:
+                    pending = None
+                    continue
+                # 엑셀이 저장 중일 수 있으므로 한 주기 동안 변화가 없을 때 읽음
+                if current != pending:
+                    pending = current
+                    continue
+                pending = None
+                try:
+                    summary = self.reload()
+                except Exception as e:
+                    self._log(f"마스터 파일 다시 읽기 실패: {e}", logging.ERROR)
+                    continue
+                if summary is not None and on_reload:
+                    on_reload(summary)
+                    
+        threading.Thread(target=watch, name="master-watcher", daemon=True).start()
+
+    def stop_watching(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def parse_order(self, text):
+        """카카오톡/표 복사 텍스트 1건을 주문 필드 dict로 분석 (parse_order_text)"""
+        return parse_order_text(text)
+
+    def find_barcode_by_product_name(self, hint, first_match=True):
         """
         고객이 쓴 상품명(힌트)을 바탕으로 바코드를 찾아냅니다. (본품과 사은품 모두)
         예: hint="나주배" -> 바코드: A001, 제품명: 명품 나주배, 사은품: 배즙
+
+        first_match=True 이면 기존처럼 시트 순서상 첫 번째 일치 항목을,
+        False 이면 길이가 힌트와 가장 비슷한(가장 구체적인) 일치 항목을 반환합니다.
         """
         result = []
-        
-        if self.products_df is None or not hint:
+        if not hint:
              return result
              
-        # 공백 제거하여 매칭 확률 증가
-        hint_clean = hint.replace(" ", "")
-        
-        best_match_row = None
-        
-        # 1. '코드' 시트에서 제품명에 힌트가 포함되어 있거나 힌트에 제품명이 포함되어 있는지 검색
-        for idx, row in self.products_df.iterrows():
-            prod_name = row['제품명']
-            prod_name_clean = prod_name.replace(" ", "")
-            
-            # 둘 중 하나라도 포함관계면 매칭 성공
-            if prod_name_clean in hint_clean or hint_clean in prod_name_clean:
-                best_match_row = row
-                break # 첫 번째 일치 항목 반환
-                
-        if best_match_row is not None:
-             barcode = best_match_row['품번']
+        # 로드 중이면 완료될 때까지 대기 후 조회
+        catalog = self.wait_until_ready()
+        if catalog is None:
+             return result
              
-             # 본품 추가
-             result.append({
-                 'type': '본품',
-                 'product_name': best_match_row['제품명'],
-                 'barcode': barcode
-             })
+        # 1. 제품명에 힌트가 포함되어 있거나 힌트에 제품명이 포함되어 있는지 역색인으로 검색
+        #    (공백 제거 정규화는 NgramIndex 내부에서 동일하게 처리)
+        with span("match"):
+            if first_match:
+                pos = catalog.name_index.first(hint)
+            else:
+                pos = catalog.name_index.best(hint)
+            
+        if pos is None:
+             inc("match_miss")
+             return result
              
-             # 사은품 추가 (코드 시트에 사은품1 ~ 5 까지 있다고 가정)
-             for i in range(1, 6):
-                  gift_col = f'사은품 {i}'
-                  if gift_col in best_match_row and pd.notna(best_match_row[gift_col]):
-                       gift_barcode = str(best_match_row[gift_col]).strip()
-                       if gift_barcode and gift_barcode != 'nan':
-                            # 사은품 바코드로 제품명 조회
-                            gift_match = self.products_df[self.products_df['품번'] == gift_barcode]
-                            gift_name = gift_match.iloc[0]['제품명'] if not gift_match.empty else ""
-                            result.append({
-                                'type': '사은품',
-                                'product_name': gift_name,
-                                'barcode': gift_barcode
-                            })
-                            
-             self._log(f"힌트 '{hint}' -> 바코드 '{barcode}' 매칭 성공")
+        # 2. 매칭된 행의 본품 + 사은품 묶음을 그대로 반환
+        inc("match_hit")
+        with span("bundle"):
+             bundle = catalog.row_bundles[pos]
+             result = bundle.to_items()
+        # 조회마다 파일에 남기지 않도록 디버그 수준으로만 기록
+        if logger.isEnabledFor(logging.DEBUG):
+             logger.debug(f"힌트 '{hint}' -> 바코드 '{bundle.barcode}' 매칭 성공")
                             
         return result
 
+    def search_products(self, hint, k=5, budget=0.005):
+        """
+        오타/순서 바뀜을 허용하는 유사도 검색.
+        점수 높은 순으로 최대 k개 [{'barcode', 'product_name', 'score'}, ...]를 반환합니다.
+        budget: 검색에 쓸 대략적인 최대 시간(초)
+        """
+        if not hint:
+             return []
+             
+        catalog = self.wait_until_ready()
+        if catalog is None:
+             return []
+             
+        with span("fuzzy_match"):
+             matches = catalog.fuzzy_index.search(hint, k=k, budget=budget)
+        result = []
+        for match in matches:
+             bundle = catalog.row_bundles[match.pos]
+             result.append({'barcode': bundle.barcode, 'product_name': bundle.product_name, 'score': match.score})
+        return result
+
+    def suggest_products(self, prefix, limit=10):
+        """
+        입력 중인 상품명/품번 앞부분으로 제품을 찾습니다. (자모 단위, 초성만 입력해도 가능)
+        예: "ㄷㅇㅍ", "듀얼픽", "B25" -> [{'barcode', 'product_name'}, ...]
+        로딩이 끝나지 않았으면 기다리지 않고 빈 목록을 반환합니다. (키 입력마다 호출되므로)
+        """
+        catalog = self.catalog
+        if not prefix or catalog is None:
+             return []
+             
+        with span("suggest"):
+             positions = catalog.prefix_index.search(prefix, limit=limit)
+        result = []
+        for pos in positions:
+             bundle = catalog.row_bundles[pos]
+             result.append({'barcode': bundle.barcode, 'product_name': bundle.product_name})
+        return result
+
     def lookup_product_by_barcode(self, barcode):
          """수기로 바코드를 쳤을때 (기존 로직)"""
-         result = []
-         if self.products_df is None or not barcode: return result
+         if not barcode: return []
          
-         match = self.products_df[self.products_df['품번'] == barcode]
-         if not match.empty:
-             row = match.iloc[0]
-             result.append({'type': '본품', 'product_name': row['제품명'], 'barcode': barcode})
-             
-             for i in range(1, 6):
-                  gift_col = f'사은품 {i}'
-                  if gift_col in row and pd.notna(row[gift_col]):
-                       gift_barcode = str(row[gift_col]).strip()
-                       if gift_barcode and gift_barcode != 'nan':
-                            gm = self.products_df[self.products_df['품번'] == gift_barcode]
-                            g_name = gm.iloc[0]['제품명'] if not gm.empty else ""
-                            result.append({'type': '사은품', 'product_name': g_name, 'barcode': gift_barcode})
-         return result
-
-    def append_orders_to_excel(self, order_list):
+         catalog = self.wait_until_ready()
+         if catalog is None: return []
+         
+         with span("bundle"):
+             bundle = catalog.bundles.get(barcode)
+             return bundle.to_items() if bundle else []
+
+    # ------------------ 일괄 조회 ------------------ #
+    def lookup_products_by_barcodes(self, barcodes):
+        """
+        lookup_product_by_barcode의 일괄 버전. 입력 순서대로 [본품+사은품 목록, ...]을 반환합니다.
+        같은 바코드는 한 번만 펼치고 같은 목록 객체를 공유하므로 반환된 목록/dict는 수정하지 마세요.
+        """
+        barcodes = list(barcodes)
+        catalog = self.wait_until_ready()
+        if catalog is None:
+             return [[] for _ in barcodes]
+
+        with span("bundle_many"):
+             bundles = catalog.bundles
+             expanded = {}
+             for barcode in set(barcodes):
+                 bundle = bundles.get(barcode) if barcode else None
+                 expanded[barcode] = bundle.to_items() if bundle else []
+             return [expanded[barcode] for barcode in barcodes]
+
+    def find_barcodes_by_product_names(self, hints, first_match=True):
+        """
+        find_barcode_by_product_name의 일괄 버전. 입력 순서대로 [본품+사은품 목록, ...]을 반환합니다.
+        공백을 뺀 힌트가 같으면 한 번만 검색하고, 같은 행에 매칭된 힌트끼리는 같은 목록 객체를 공유합니다.
+        """
+        hints = [hint or "" for hint in hints]
+        catalog = self.wait_until_ready()
+        if catalog is None:
+             return [[] for _ in hints]
+
+        with span("match_many"):
+            if first_match:
+                positions = catalog.name_index.first_many(hints)
+            else:
+                positions = catalog.name_index.best_many(hints)
+
+        misses = positions.count(None)
+        inc("match_hit", len(positions) - misses)
+        inc("match_miss", misses)
+        with span("bundle_many"):
+             row_bundles = catalog.row_bundles
+             expanded = {pos: row_bundles[pos].to_items() for pos in set(positions) if pos is not None}
+             return [expanded[pos] if pos is not None else [] for pos in positions]
+
+    def resolve_many(self, barcodes=None, hints=None, first_match=True):
+        """
+        바코드 목록과 힌트 목록을 행 단위로 함께 조회합니다. (둘 다 주면 길이가 같아야 함)
+        행마다 바코드가 카탈로그에 있으면 그 묶음을, 없으면 힌트로 찾은 묶음을 반환합니다.
+        예: resolve_many(["A001", "", "X"], ["", "나주배", "사과"]) -> [A001 묶음, 나주배 묶음, 사과 묶음]
+        """
+        if barcodes is None and hints is None:
+             return []
+        if barcodes is None:
+             return self.find_barcodes_by_product_names(hints, first_match)
+        result = self.lookup_products_by_barcodes(barcodes)
+        if hints is None:
+             return result
+
+        hints = list(hints)
+        if len(hints) != len(result):
+             raise ValueError(f"바코드 {len(result)}개와 힌트 {len(hints)}개의 길이가 다릅니다.")
+        # 바코드로 못 찾은 행만 모아 힌트로 한 번에 조회
+        missing = [row for row, items in enumerate(result) if not items and hints[row]]
+        found = self.find_barcodes_by_product_names([hints[row] for row in missing], first_match)
+        for row, items in zip(missing, found):
+             result[row] = items
+        return result
+
+    def source_of(self, barcode):
+        """바코드가 어느 마스터(파일명:시트 또는 지정한 이름)에서 왔는지 반환 (없으면 None)"""
+        if not barcode: return None
+        
+        catalog = self.wait_until_ready()
+        if catalog is None: return None
+        return catalog.source_of(barcode)
+
+    # ------------------ 중복 주문 감지 ------------------ #
+    def load_order_history(self, path=None, background=False):
+        """
+        발주내역 시트(기본: 마스터 파일)를 한 번에 읽어 중복 감지 색인에 넣습니다.
+        시트의 행에는 입력 시각이 없으므로 파일의 수정시각을 기록 시각으로 표시만 하고,
+        duplicate_window는 적용하지 않습니다. (시트에 있는 주문은 기간과 상관없이 항상 중복)
+        """
+        path = path or self.master_file_path
+        if background:
+            threading.Thread(target=self.load_order_history, args=(path,), name="history-loader", daemon=True).start()
+            return None
+            
+        if not path or not os.path.exists(path):
+             return 0
+        try:
+            with span("history_load"):
+                keys = read_sheet_keys(path)
+                self.order_history.add_many(keys, ORIGIN_SHEET, when=os.path.getmtime(path))
+        except Exception as e:
+             self._log(f"발주내역 읽기 실패 (중복 감지는 이번 실행 입력분만 사용): {e}", logging.WARNING)
+             return 0
+        self._log(f"발주내역 {len(keys)}행을 중복 감지 색인에 적재")
+        return len(keys)
+
+    def find_duplicate(self, order):
+        """
+        같은 (핸드폰, 주소, 바코드, 수량)의 주문이 이미 있으면 DuplicateHit, 없으면 None.
+        order: 발주내역 행 dict (핸드폰/전화번호/주소/바코드/수량)
+        """
+        hit = self.order_history.find(key_from_row(order))
+        inc("duplicate_hit" if hit else "duplicate_miss")
+        return hit
+
+    def remember_orders(self, order_list):
+        """대기 리스트에 추가한 주문을 중복 감지 색인에 기록"""
+        for order in order_list:
+             self.order_history.add(key_from_row(order), ORIGIN_SESSION)
+
+    def forget_orders(self, order_list):
+        """대기 리스트에서 삭제한 주문을 중복 감지 색인에서 제외"""
+        for order in order_list:
+             self.order_history.remove(key_from_row(order))
+
+    # ------------------ 우편번호 ------------------ #
+    def _get_postal_index(self):
+        with self._postal_lock:
+            if self._postal is None:
+                if self.postal_db and os.path.exists(self.postal_db):
+                    try:
+                        self._postal = PostalIndex(self.postal_db)
+                        self._log(f"우편번호 주소 DB 연결: {self.postal_db}")
+                    except Exception as e:
+                        self._log(f"우편번호 주소 DB 열기 실패 (우편번호는 빈칸으로 저장): {e}", logging.WARNING)
+                        self._postal = False
+                else:
+                    self._postal = False
+            return self._postal if self._postal is not False else None
+
+    def postal_code(self, address):
+        """도로명주소 -> 우편번호 (주소 DB가 없거나 찾지 못하면 "")"""
+        if not address:
+             return ""
+        postal = self._get_postal_index()
+        if postal is None:
+             return ""
+        with span("postal_lookup"):
+             code = postal.postal_code(address)
+        inc("postal_hit" if code else "postal_miss")
+        return code
+
+    def postal_codes(self, addresses):
+        """postal_code의 일괄 버전 (입력 순서대로)"""
+        return [self.postal_code(address) for address in addresses]
+
+    # ------------------ 거래처 주문서 가져오기 ------------------ #
+    def import_orders(self, path, profile):
+        """
+        거래처 주문서(엑셀/CSV)를 매핑 프로필대로 읽어 대기 리스트에 넣을 행을 만듭니다.
+        반환값: (성공 여부, 메시지, ImportResult 또는 None)
+        바코드로 못 찾은 행은 제품명 역색인으로 찾고, 그래도 없으면 '수기' 행으로 넣습니다.
+        """
+        def resolve_names(names):
+             return [items[0]["barcode"] if items else None for items in self.find_barcodes_by_product_names(names)]
+
+        try:
+             with span("import_orders"):
+                 result = importer.import_orders(path, profile, self.lookup_products_by_barcodes, resolve_names)
+        except ImportError as e:
+             return False, f"주문서를 읽는 데 필요한 패키지가 없습니다: {e}", None
+        except (KeyError, ValueError) as e:
+             return False, f"주문서 형식이 '{profile.name}' 프로필과 맞지 않습니다: {e}", None
+        except Exception as e:
+             return False, f"주문서 읽기 오류: {e}", None
+
+        # 주문서에 우편번호가 없으면 주소 DB로 채움 (같은 주소는 한 번만 조회)
+        missing = [excel_data for excel_data, _ in result.rows if not excel_data["우편번호"]]
+        addresses = list({excel_data["주소"] for excel_data in missing})
+        codes = dict(zip(addresses, self.postal_codes(addresses)))
+        for excel_data in missing:
+             excel_data["우편번호"] = codes[excel_data["주소"]]
+
+        inc("imported_orders", result.orders)
+        msg = f"{os.path.basename(path)}: 주문 {result.orders}건 -> {len(result.rows)}행"
+        if result.unresolved:
+             shown = ", ".join(map(str, result.unresolved[:10])) + "행" + (" 외" if len(result.unresolved) > 10 else "")
+             msg += f"\n바코드를 찾지 못해 '수기'로 넣은 주문 {len(result.unresolved)}건 (엑셀 {shown})"
+        self._log(msg.replace("\n", " / "))
+        return True, msg, result
+
+    def _get_excel_session(self):
+        if self.excel_session is None:
+            self.excel_session = ExcelSession(self.master_file_path, self.excel_backend, self.excel_idle_timeout)
+        return self.excel_session
+
+    def append_orders_to_excel(self, order_list, progress=None, cancel=None):
         """
         윈도우 환경에서만 동작 O
         기존 엑셀파일 밑에 레코드 통째로 붙여넣어줍니다.
         임시 파일이 아닌 COM 객체를 직접 핸들링하며, 파일이 이미 열려있는 경우를 방어합니다.
+        엑셀/워크북 연결은 ExcelSession이 연속 저장 사이에 유지하므로 유휴 시간 안의 다음 저장은 바로 기록합니다.
+
+        progress(완료 행 수, 전체 행 수): 진행 상황 알림 (COM 스레드에서 호출됨)
+        cancel: threading.Event. 저장(Save) 전에 설정되면 이미 쓴 행을 지우고 취소합니다.
         """
         if not order_list:
              return False, "저장할 데이터가 없습니다."
              
-        if platform.system() != 'Windows':
+        if platform.system() != 'Windows' and self.excel_backend is None:
              return False, "엑셀 자동 저장은 윈도우 환경에서만 지원됩니다."
              
-        try:
-            import win32com.client
-            import pythoncom
-            import os
-        except ImportError:
-            return False, "pywin32 패키지가 필요합니다 (pip install pywin32)"
-            
-        excel = None
-        workbook = None
-        was_open_by_user = False
+        rows = order_rows(order_list)
         
-        try:
-             pythoncom.CoInitialize()
-             
-             # 절대 경로 변환 및 wsl 등 이상 경로 보정
-             abs_path = os.path.abspath(self.master_file_path)
-             if abs_path.startswith("\\\\wsl.localhost") or abs_path.startswith("\\\\wsl$"):
-                 pass
-             elif abs_path.startswith("\\wsl"):
-                 abs_path = "\\" + abs_path
-                 
-             if not os.path.exists(abs_path):
-                 return False, f"엑셀 파일 접근 불가: {abs_path}"
-
-             # 열려있는 엑셀 인스턴스가 있는지 먼저 확인 (없으면 Dispatch로 새로 생성)
+        def write(workbook):
+             # 발주내역 시트를 찾거나 생성 후, 마지막 행 아래에 주문 블록을 한 번에 기록
+             sink = ComSheetSink(workbook)
              try:
-                 excel = win32com.client.GetActiveObject("Excel.Application")
-             except:
-                 excel = win32com.client.Dispatch("Excel.Application")
-                 excel.DisplayAlerts = False
-                 excel.Visible = False
-
-             # 이미 열려있는 동일 파일이 있는지 확인
-             for wb in excel.Workbooks:
-                 if wb.FullName.lower() == abs_path.lower():
-                     workbook = wb
-                     was_open_by_user = True
-                     break
-                     
-             if not workbook:
+                 sink.append(rows, progress, cancel)
+                 if cancel is not None and cancel.is_set():
+                     raise SaveCancelled()
+                 # 워크북은 닫지 않고 저장만 (유휴 시간 안의 다음 저장 때 그대로 재사용)
+                 workbook.Save()
+             except Exception:
+                 # 일부만 쓰였거나 저장에 실패하면 쓴 행을 지워 다시 저장할 때 중복되지 않게 함
                  try:
-                     # UpdateLinks=0, ReadOnly=False 강제
-                     workbook = excel.Workbooks.Open(abs_path, 0, False)
-                 except Exception as open_err:
-                     err_msg = str(open_err)
-                     if hasattr(open_err, 'excepinfo') and open_err.excepinfo:
-                         err_msg += f"\n상세: {open_err.excepinfo}"
-                     return False, f"엑셀 파일을 여는 중 오류 발생 (다른 프로그램에서 사용중일 수 있습니다):\n{err_msg}"
-
-             if workbook.ReadOnly and not was_open_by_user:
-                 # ReadOnly로 열린 경우 (다른 사람이 열고 있거나 권한 문제)
-                 workbook.Close(SaveChanges=False)
-                 return False, "엑셀 파일이 읽기 전용 상태입니다. 편집 중인 엑셀 창을 모두 닫고 다시 시도해주세요."
-                 
-             # 발주내역 시트를 찾거나 생성
-             sheet_name = '발주내역'
-             try:
-                 sheet = workbook.Sheets(sheet_name)
-             except:
-                 sheet = workbook.Sheets.Add(After=workbook.Sheets(workbook.Sheets.Count))
-                 sheet.Name = sheet_name
-                 # 헤더
-                 headers = ["거래처명", "주문번호", "주문인", "수취인", "전화번호", "핸드폰", "우편번호", "주소", "바코드", "제품명", "사은품", "수량", "수수료", "배송비", "배송메모"]
-                 for c, h in enumerate(headers):
-                      sheet.Cells(1, c + 1).Value = h
-                      
-             # 마지막 행 찾기 (xlUp의 값은 -4162)
-             last_row = sheet.Cells(sheet.Rows.Count, 1).End(-4162).Row
-             if last_row == 1 and sheet.Cells(1, 1).Value is None:
-                 last_row = 0
-                 
-             start_row = last_row + 1
-             cols = ["거래처명", "주문번호", "주문인", "수취인", "전화번호", "핸드폰", "우편번호", "주소", "바코드", "제품명", "사은품", "수량", "수수료", "배송비", "배송메모"]
+                     sink.undo()
+                 except Exception as e:
+                     self._log(f"발주내역 되돌리기 실패: {e}", logging.WARNING)
+                 raise
              
-             # 데이터 채우기
-             for i, order in enumerate(order_list):
-                  for c, key in enumerate(cols):
-                       # 빈 문자열 대신 nan이나 None이 들어가면 에러 나므로 확인
-                       val = order.get(key, "")
-                       sheet.Cells(start_row + i, c + 1).Value = "" if val is None else str(val)
-                       
-             # 저장 및 정리
-             if was_open_by_user:
-                 # 사용자가 이미 열어두고 있었으면 덮어쓰기 저장만 하고 닫지는 않음
-                 workbook.Save()
-                 workbook = None  # finally 구문에서 close 시키지 않기 위함
-             else:
-                 # 백그라운드에서 우리가 열었으면 저장 후 닫기
-                 workbook.Close(SaveChanges=True)
-                 workbook = None
-
+        try:
+             # 저장 전에 마스터가 이미 읽은 그대로였다면, 저장 후의 파일 상태를 읽은 상태로 기록해
+             # 자기 저장(발주내역만 바뀜) 때문에 감시 스레드가 마스터를 다시 읽지 않게 함
+             before = self._stat_master()
+             with span("excel_save"):
+                 self._get_excel_session().run(write)
+             with self._reload_lock:
+                 if before is not None and before == self._master_stat:
+                     self._master_stat = self._stat_master()
+             inc("saved_rows", len(rows))
+             self.order_history.mark_saved(key_from_row(order) for order in order_list)
              return True, "엑셀(발주내역 시트)에 자동 저장을 완료했습니다."
-             
+        except SaveCancelled:
+             return False, "저장을 취소했습니다. (기록하던 행은 되돌렸습니다)"
+        except ExcelSessionError as e:
+             return False, str(e)
         except Exception as e:
              return False, f"엑셀 저장 오류: {e}"
-        finally:
-             if workbook and not was_open_by_user: 
-                 try: workbook.Close(SaveChanges=False)
-                 except: pass
-                 
-             if excel and not was_open_by_user:
-                 # 활성화된 워크북 갯수 점검 후 종료
-                 try:
-                     if excel.Workbooks.Count == 0:
-                         excel.Quit()
-                 except: pass
-                 
-             try: pythoncom.CoUninitialize()
-             except: pass
+
+    def export_orders_to_xlsx(self, order_list, path, progress=None, cancel=None):
+        """
+        엑셀 없이 .xlsx 파일의 발주내역 시트에 주문을 추가합니다. (모든 OS 지원)
+        파일이 없으면 헤더와 함께 새로 만들고, 있으면 기존 내용 아래에 붙입니다.
+        progress/cancel은 append_orders_to_excel과 같으며, 취소하면 원본 파일은 바뀌지 않습니다.
+        """
+        if not order_list:
+             return False, "저장할 데이터가 없습니다."
+             
+        try:
+             with span("xlsx_save"):
+                 count = XlsxSink(path).append(iter_order_rows(order_list), progress, cancel, total=len(order_list))
+             inc("saved_rows", count)
+             self.order_history.mark_saved(key_from_row(order) for order in order_list)
+             return True, f"{os.path.basename(path)} (발주내역 시트)에 {count}건 저장을 완료했습니다."
+        except SaveCancelled:
+             return False, "저장을 취소했습니다. (파일은 바뀌지 않았습니다)"
+        except ImportError:
+             return False, "openpyxl 패키지가 필요합니다 (pip install openpyxl)"
+        except PermissionError:
+             return False, f"파일에 쓸 수 없습니다. 엑셀에서 열려있다면 닫고 다시 시도해주세요:\n{path}"
+        except Exception as e:
+             return False, f"xlsx 저장 오류: {e}"
+
+    def close(self):
+        """앱 종료 시 호출: 파일 감시 중지, 엑셀 세션 정리 및 처리시간 집계 기록"""
+        self.stop_watching()
+        if self.metrics_path:
+             try:
+                 dump_metrics(self.metrics_path)
+             except OSError as e:
+                 self._log(f"처리시간 집계 기록 실패: {e}", logging.WARNING)
+        if self.excel_session is not None:
+             try:
+                 self.excel_session.close()
+             except Exception as e:
+                 self._log(f"엑셀 세션 정리 실패: {e}", logging.WARNING)
+             self.excel_session = None
+        if self._postal not in (None, False):
+             self._postal.close()
+             self._postal = None
@@ -0,0 +1,157 @@
+"""
+중복 주문 감지 색인.
+
+같은 카카오톡 주문을 두 번 붙여넣는 실수를 막기 위해 (핸드폰, 주소, 바코드, 수량)을 정규화한 키로
+이미 입력했거나 발주내역 시트에 저장된 주문을 해시 테이블에 보관하고, 새 주문이 들어올 때마다 O(1)로 확인합니다.
+- 핸드폰: 숫자만 (010-1234-5678 == 01012345678), 비어 있으면 전화번호 사용
+- 주소: 공백/기호 제거, 소문자
+- 바코드: 앞뒤 공백 제거, 대문자
+- 수량: 숫자만 (비어 있으면 1)
+window(초)를 주면 대기 리스트 주문은 그 시간 안에 들어온 것끼리만 중복으로 봅니다. (없으면 기간 제한 없음)
+발주내역 시트에는 주문 날짜 열이 없으므로 시트에 있는 주문은 기간과 상관없이 항상 중복으로 봅니다.
+"""
+import re
+import threading
+import time
+from typing import NamedTuple
+
+from safian.excel_sink import ORDER_SHEET_NAME
+
+ORIGIN_SESSION = "대기 리스트"
+ORIGIN_SHEET = "발주내역 시트"
+
+_NON_DIGIT = re.compile(r'\D+')
+_ADDRESS_NOISE = re.compile(r'[\s\-_/.,()\[\]·#]+')
+
+
+def _digits(value):
+    return _NON_DIGIT.sub('', str(value or ''))
+
+
+def order_key(mobile, address, barcode, qty, phone=""):
+    """중복 판정용 정규화 키. 연락처와 주소가 모두 비어 있으면 None (판정 불가)"""
+    contact = _digits(mobile) or _digits(phone)
+    address = _ADDRESS_NOISE.sub('', str(address or '')).lower()
+    if not contact and not address:
+        return None
+    quantity = _digits(qty).lstrip('0') or '1'
+    return (contact, address, str(barcode or '').strip().upper(), quantity)
+
+
+def key_from_row(order):
+    """발주내역 행 dict(엑셀 헤더 기준)의 중복 판정 키"""
+    return order_key(order.get("핸드폰"), order.get("주소"), order.get("바코드"), order.get("수량"),
+                     phone=order.get("전화번호"))
+
+
+class DuplicateHit(NamedTuple):
+    """먼저 들어와 있던 같은 주문"""
+    origin: str   # ORIGIN_SESSION / ORIGIN_SHEET
+    when: float   # 기록 시각 (time.time(), 시트에서 읽은 주문은 파일 수정시각)
+    count: int    # 같은 키로 들어와 있는 건수
+
+
+class DuplicateIndex:
+    """정규화 키 -> [마지막 기록 시각, 출처, 건수] 해시 테이블 (스레드 안전)"""
+
+    def __init__(self, window=None):
+        self.window = window
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def find(self, key, now=None):
+        """같은 키의 주문이 있으면 DuplicateHit, 없으면 None (window는 대기 리스트 주문에만 적용)"""
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        when, origin, count = entry
+        if self.window is not None and origin != ORIGIN_SHEET and (now or time.time()) - when > self.window:
+            return None
+        return DuplicateHit(origin, when, count)
+
+    def add(self, key, origin=ORIGIN_SESSION, when=None):
+        """주문 1건 추가. 이미 시트에 있는 키는 대기 리스트에 다시 들어와도 시트 출처를 유지"""
+        if key is None:
+            return
+        when = time.time() if when is None else when
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [when, origin, 1]
+            else:
+                entry[0] = max(entry[0], when)
+                if entry[1] != ORIGIN_SHEET:
+                    entry[1] = origin
+                entry[2] += 1
+
+    def add_many(self, keys, origin=ORIGIN_SHEET, when=None):
+        """여러 키를 한 번에 추가 (발주내역 시트 일괄 적재용)"""
+        when = time.time() if when is None else when
+        counts = {}
+        for key in keys:
+            if key is not None:
+                counts[key] = counts.get(key, 0) + 1
+        with self._lock:
+            entries = self._entries
+            for key, count in counts.items():
+                entry = entries.get(key)
+                if entry is None:
+                    entries[key] = [when, origin, count]
+                else:
+                    entry[0] = max(entry[0], when)
+                    entry[1] = origin if origin == ORIGIN_SHEET else entry[1]
+                    entry[2] += count
+
+    def mark_saved(self, keys, when=None):
+        """
+        발주내역에 저장된 주문을 시트 출처로 표시합니다.
+        대기 리스트에서 이미 세어 둔 주문은 출처만 바꾸고, 처음 보는 주문은 새로 추가합니다.
+        """
+        when = time.time() if when is None else when
+        with self._lock:
+            entries = self._entries
+            for key in keys:
+                if key is None:
+                    continue
+                entry = entries.get(key)
+                if entry is None:
+                    entries[key] = [when, ORIGIN_SHEET, 1]
+                else:
+                    entry[1] = ORIGIN_SHEET
+
+    def remove(self, key):
+        """대기 리스트에서 지운 주문 1건을 빼냄 (건수가 0이 되면 키 삭제)"""
+        if key is None:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[2] -= 1
+            if entry[2] <= 0:
+                del self._entries[key]
+
+
+def read_sheet_keys(path, sheet_name=ORDER_SHEET_NAME):
+    """
+    발주내역 시트를 한 번에 읽어 행마다의 중복 판정 키 목록을 반환합니다. (.xlsb / .xlsx)
+    시트나 파일이 없으면 빈 목록.
+    """
+    import pandas as pd
+
+    columns = {"핸드폰", "전화번호", "주소", "바코드", "수량"}
+    engine = 'pyxlsb' if str(path).lower().endswith('.xlsb') else None
+    try:
+        df = pd.read_excel(path, sheet_name=sheet_name, engine=engine, header=0, dtype=str,
+                           usecols=lambda c: str(c).strip() in columns)
+    except (FileNotFoundError, ValueError):
+        # 파일이나 발주내역 시트가 아직 없음
+        return []
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.reindex(columns=sorted(columns)).fillna('')
+    return [key_from_row(row) for row in df.to_dict('records')]
@@ -0,0 +1,251 @@
+"""
+저장할 때 쓰는 엑셀 COM 세션.
+
+COM 초기화/엑셀 실행/워크북 열기는 저장마다 수 초가 걸리므로 연속으로 저장할 때는 연결을 재사용하고,
+마지막 저장 후 idle_timeout초 동안 다음 저장이 없으면 우리가 연 워크북(과 우리가 띄운 엑셀)을 닫습니다.
+워크북을 열어 두는 동안에는 숨은 엑셀이 마스터 파일을 잠그므로 다른 PC/사용자가 편집할 수 없고,
+닫은 뒤 다음 저장은 다시 여는 시간만큼 느려집니다.
+- idle_timeout을 줄이면 파일이 잠기는 시간이 줄고, 늘리면 연속 저장이 빨라집니다.
+- 0이면 저장 묶음(run 1회)마다 바로 닫고, None이면 close()까지 계속 열어 둡니다.
+- 사용자가 직접 열어 둔 워크북/엑셀은 닫지 않습니다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+# 마지막 저장 후 워크북을 닫기까지 기다리는 시간(초)
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+class ExcelSessionError(Exception):
+    """사용자에게 그대로 보여줄 수 있는 엑셀 연동 오류"""
+
+
+class ComBackend(NamedTuple):
+    """COM 초기화/해제와 Excel.Application 획득 방법 (테스트 시 가짜 객체로 교체)"""
+    co_initialize: Callable
+    co_uninitialize: Callable
+    get_active: Callable   # 실행 중인 Excel.Application (없으면 예외)
+    dispatch: Callable     # 새 Excel.Application 생성
+
+
+def pywin32_backend():
+    """실제 윈도우 엑셀용 백엔드"""
+    try:
+        import win32com.client
+        import pythoncom
+    except ImportError:
+        raise ExcelSessionError("pywin32 패키지가 필요합니다 (pip install pywin32)")
+
+    return ComBackend(
+        co_initialize=pythoncom.CoInitialize,
+        co_uninitialize=pythoncom.CoUninitialize,
+        get_active=lambda: win32com.client.GetActiveObject("Excel.Application"),
+        dispatch=lambda: win32com.client.Dispatch("Excel.Application"),
+    )
+
+
+def normalize_com_path(path):
+    """절대 경로 변환 및 wsl 등 이상 경로 보정"""
+    abs_path = os.path.abspath(path)
+    if abs_path.startswith("\\\\wsl.localhost") or abs_path.startswith("\\\\wsl$"):
+        pass
+    elif abs_path.startswith("\\wsl"):
+        abs_path = "\\" + abs_path
+    return abs_path
+
+
+class ExcelSession:
+    """
+    저장할 때마다 COM 초기화/엑셀 실행/워크북 열기를 반복하지 않도록
+    하나의 COM 아파트먼트(전용 스레드)와 워크북 핸들을 유지하는 세션.
+
+    - 모든 COM 호출은 전용 스레드 한 곳에서만 실행됩니다. (COM 객체는 만든 스레드에서만 사용 가능)
+    - 사용자가 워크북이나 엑셀을 닫았으면 다음 호출 때 자동으로 다시 연결합니다.
+    - idle_timeout초 동안 호출이 없으면 우리가 연 워크북/엑셀을 닫아 파일 잠금을 풉니다. (모듈 설명 참고)
+    - close()에서 우리가 연 워크북/엑셀만 정리하고 COM을 해제합니다.
+    """
+
+    def __init__(self, path, backend=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self._backend = backend
+        self._executor = None
+        self._lock = threading.Lock()
+        self._idle_timer = None
+        self._generation = 0             # run 호출마다 증가 (늦게 도착한 유휴 정리 무시용)
+        self._excel = None
+        self._workbook = None
+        self._started_excel = False    # 우리가 새로 띄운 엑셀인지
+        self._opened_by_user = False   # 사용자가 이미 열어둔 워크북인지
+        self._com_ready = False
+
+    # ------------------ 전용 COM 스레드 ------------------ #
+    def run(self, fn, *args):
+        """
+        fn(workbook, *args)를 COM 스레드에서 실행하고 결과를 반환합니다.
+        워크북 연결이 끊겼으면 다시 연결한 뒤 실행합니다.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-com")
+            executor = self._executor
+            self._cancel_idle_timer()
+            self._generation += 1
+            generation = self._generation
+        try:
+            return executor.submit(self._call, fn, args).result()
+        finally:
+            self._schedule_release(generation)
+
+    def _call(self, fn, args):
+        workbook = self._ensure_workbook()
+        try:
+            return fn(workbook, *args)
+        finally:
+            if self.idle_timeout == 0:
+                self._release_workbook()
+
+    # ------------------ 유휴 시 워크북 닫기 ------------------ #
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _schedule_release(self, generation):
+        if not self.idle_timeout:
+            return
+        timer = threading.Timer(self.idle_timeout, self._on_idle, (generation,))
+        timer.daemon = True
+        with self._lock:
+            if self._executor is None or generation != self._generation:
+                # 이미 닫혔거나 그 사이 다른 호출이 들어옴 (그 호출이 다시 예약)
+                return
+            self._cancel_idle_timer()
+            self._idle_timer = timer
+        timer.start()
+
+    def _on_idle(self, generation):
+        with self._lock:
+            if self._executor is None or generation != self._generation:
+                return
+            self._idle_timer = None
+            executor = self._executor
+            # 대기열에 먼저 들어간 호출이 없을 때만 닫음 (COM 스레드에서 다시 확인)
+            executor.submit(self._release_if_idle, generation)
+
+    def _release_if_idle(self, generation):
+        if generation == self._generation:
+            self._release_workbook()
+
+    def _ensure_com(self):
+        if self._com_ready:
+            return
+        if self._backend is None:
+            self._backend = pywin32_backend()
+        self._backend.co_initialize()
+        self._com_ready = True
+
+    @staticmethod
+    def _alive(probe):
+        """COM 핸들이 아직 유효한지 (닫힌 엑셀/워크북은 속성 접근 시 예외 발생)"""
+        try:
+            probe()
+            return True
+        except Exception:
+            return False
+
+    def _ensure_excel(self):
+        if self._excel is not None and self._alive(lambda: self._excel.Workbooks.Count):
+            return self._excel
+
+        # 엑셀이 닫혔으면 핸들을 버리고 다시 연결
+        self._excel = None
+        self._workbook = None
+        backend = self._backend
+        try:
+            # 열려있는 엑셀 인스턴스가 있는지 먼저 확인 (없으면 Dispatch로 새로 생성)
+            self._excel = backend.get_active()
+            self._started_excel = False
+        except Exception:
+            self._excel = backend.dispatch()
+            self._excel.DisplayAlerts = False
+            self._excel.Visible = False
+            self._started_excel = True
+        return self._excel
+
+    def _ensure_workbook(self):
+        self._ensure_com()
+        excel = self._ensure_excel()
+        if self._workbook is not None and self._alive(lambda: self._workbook.FullName):
+            return self._workbook
+
+        # 사용자가 워크북을 닫았으면 다시 찾거나 연다
+        self._workbook = None
+        abs_path = normalize_com_path(self.path)
+        if not os.path.exists(abs_path):
+            raise ExcelSessionError(f"엑셀 파일 접근 불가: {abs_path}")
+
+        # 이미 열려있는 동일 파일이 있는지 확인
+        for wb in excel.Workbooks:
+            if wb.FullName.lower() == abs_path.lower():
+                self._workbook = wb
+                self._opened_by_user = True
+                return wb
+
+        try:
+            # UpdateLinks=0, ReadOnly=False 강제
+            workbook = excel.Workbooks.Open(abs_path, 0, False)
+        except Exception as open_err:
+            err_msg = str(open_err)
+            if hasattr(open_err, 'excepinfo') and open_err.excepinfo:
+                err_msg += f"\n상세: {open_err.excepinfo}"
+            raise ExcelSessionError(f"엑셀 파일을 여는 중 오류 발생 (다른 프로그램에서 사용중일 수 있습니다):\n{err_msg}")
+
+        if workbook.ReadOnly:
+            # ReadOnly로 열린 경우 (다른 사람이 열고 있거나 권한 문제)
+            workbook.Close(SaveChanges=False)
+            raise ExcelSessionError("엑셀 파일이 읽기 전용 상태입니다. 편집 중인 엑셀 창을 모두 닫고 다시 시도해주세요.")
+
+        self._workbook = workbook
+        self._opened_by_user = False
+        return workbook
+
+    # ------------------ 정리 ------------------ #
+    def _release_workbook(self):
+        """우리가 연 워크북과 우리가 띄운 엑셀을 닫음 (COM은 유지, 다음 호출 때 다시 연결)"""
+        workbook, excel = self._workbook, self._excel
+        self._workbook = None
+        self._excel = None
+
+        if workbook is not None and not self._opened_by_user:
+            # 우리가 연 워크북은 저장은 매번 했으므로 변경 없이 닫음
+            try: workbook.Close(SaveChanges=False)
+            except Exception: pass
+
+        if excel is not None and self._started_excel:
+            # 활성화된 워크북 갯수 점검 후 종료
+            try:
+                if excel.Workbooks.Count == 0:
+                    excel.Quit()
+            except Exception: pass
+
+    def _release(self):
+        self._release_workbook()
+        if self._com_ready:
+            try: self._backend.co_uninitialize()
+            except Exception: pass
+            self._com_ready = False
+
+    def close(self):
+        """앱 종료 시 호출: 우리가 연 워크북/엑셀을 정리하고 COM 스레드를 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._cancel_idle_timer()
+        if executor is None:
+            return
+        try:
+            executor.submit(self._release).result()
+        finally:
+            executor.shutdown(wait=True)
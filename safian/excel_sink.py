@@ -0,0 +1,217 @@
+"""
+발주내역 저장 대상(sink) 모음.
+
+주문 목록을 행 단위의 2차원 블록으로 바꾼 뒤, 저장 대상에 한 번에 넘깁니다.
+COM(엑셀) 대상은 셀마다 값을 쓰지 않고 Range 하나에 블록 전체를 대입하므로
+주문 수와 상관없이 왕복 호출 횟수가 거의 일정합니다.
+엑셀이 없는 환경에서는 XlsxSink로 .xlsx 파일에 직접 기록합니다.
+"""
+import os
+
+ORDER_SHEET_NAME = '발주내역'
+
+# 발주내역 시트 컬럼 순서 (엑셀 헤더와 동일)
+ORDER_COLUMNS = ["거래처명", "주문번호", "주문인", "수취인", "전화번호", "핸드폰", "우편번호", "주소", "바코드", "제품명", "사은품", "수량", "수수료", "배송비", "배송메모"]
+
+XL_UP = -4162  # Excel 상수 xlUp
+
+# XlsxSink가 진행 상황을 알리고 취소 여부를 확인하는 간격 (행)
+PROGRESS_EVERY = 1000
+
+
+class SaveCancelled(Exception):
+    """저장 도중 사용자가 취소함 (쓰던 행은 되돌리거나 원본을 건드리지 않음)"""
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise SaveCancelled()
+
+
+def iter_order_rows(order_list, columns=ORDER_COLUMNS):
+    """주문 dict를 하나씩 컬럼 순서의 문자열 튜플로 변환 (None은 빈 문자열)"""
+    for order in order_list:
+        yield tuple("" if order.get(key) is None else str(order.get(key)) for key in columns)
+
+
+def order_rows(order_list, columns=ORDER_COLUMNS):
+    """주문 dict 목록을 컬럼 순서의 문자열 튜플 목록으로 변환"""
+    return list(iter_order_rows(order_list, columns))
+
+
+def column_letter(index):
+    """1부터 시작하는 열 번호를 엑셀 열 문자로 변환 (1 -> A, 15 -> O, 27 -> AA)"""
+    letters = ""
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+def range_address(first_row, last_row, n_cols, first_col=1):
+    """행/열 번호로 'A2:O10' 형식의 주소를 만듭니다."""
+    return f"{column_letter(first_col)}{first_row}:{column_letter(first_col + n_cols - 1)}{last_row}"
+
+
+class OrderSink:
+    """발주내역 행을 받아 저장하는 대상의 공통 인터페이스"""
+
+    def append(self, rows, progress=None, cancel=None):
+        """
+        행(튜플) 목록을 마지막 행 아래에 추가하고 추가한 행 수를 반환
+        progress(완료 행 수, 전체 행 수)로 진행 상황을 알리고, cancel(threading.Event)이 설정되면
+        SaveCancelled를 던집니다.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ComSheetSink(OrderSink):
+    """
+    열려 있는 엑셀 COM 워크북의 발주내역 시트에 블록 단위로 쓰는 sink.
+    chunk_size 행마다 Range 대입 1회로 나누어 씁니다. (한 번에 너무 큰 배열을 넘기지 않기 위함)
+    """
+
+    def __init__(self, workbook, sheet_name=ORDER_SHEET_NAME, columns=ORDER_COLUMNS, chunk_size=5000):
+        self.workbook = workbook
+        self.sheet_name = sheet_name
+        self.columns = list(columns)
+        self.chunk_size = chunk_size
+        self._sheet = None
+        self._appended = None  # 마지막 append로 채운 (첫 행, 끝 행) - 저장 실패 시 되돌리기용
+
+    def _get_sheet(self):
+        """발주내역 시트를 찾거나, 없으면 만들고 헤더를 한 번에 기록"""
+        if self._sheet is not None:
+            return self._sheet
+        workbook = self.workbook
+        try:
+            sheet = workbook.Sheets(self.sheet_name)
+        except Exception:
+            sheets = workbook.Sheets
+            sheet = sheets.Add(After=sheets(sheets.Count))
+            sheet.Name = self.sheet_name
+            sheet.Range(range_address(1, 1, len(self.columns))).Value = (tuple(self.columns),)
+        self._sheet = sheet
+        return sheet
+
+    def last_row(self):
+        """A열 기준 마지막 데이터 행 (빈 시트면 0)"""
+        sheet = self._get_sheet()
+        last = sheet.Cells(sheet.Rows.Count, 1).End(XL_UP).Row
+        if last == 1 and sheet.Cells(1, 1).Value is None:
+            return 0
+        return last
+
+    def append(self, rows, progress=None, cancel=None):
+        if not rows:
+            return 0
+        sheet = self._get_sheet()
+        first_row = next_row = self.last_row() + 1
+        n_cols = len(self.columns)
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                _check_cancel(cancel)
+                block = tuple(tuple(row) for row in rows[start:start + self.chunk_size])
+                sheet.Range(range_address(next_row, next_row + len(block) - 1, n_cols)).Value = block
+                next_row += len(block)
+                if progress is not None:
+                    progress(start + len(block), len(rows))
+        finally:
+            self._appended = (first_row, next_row - 1) if next_row > first_row else None
+        return len(rows)
+
+    def undo(self):
+        """
+        마지막 append로 쓴 행을 지웁니다. (블록 일부만 쓰였거나 저장에 실패했을 때)
+        다시 저장할 때 같은 주문이 두 번 들어가지 않도록 시트를 append 이전 상태로 돌립니다.
+        """
+        if self._appended is None:
+            return
+        first_row, last_row = self._appended
+        self._appended = None
+        self._get_sheet().Range(range_address(first_row, last_row, len(self.columns))).ClearContents()
+
+
+class XlsxSink(OrderSink):
+    """
+    엑셀 없이(리눅스/서버 포함) .xlsx 파일에 발주내역을 기록하는 sink.
+
+    openpyxl 스트리밍 모드만 사용합니다. 기존 파일이 있으면 읽기 전용 모드로 한 행씩 읽어
+    새 파일에 그대로 옮겨 쓰면서 발주내역 시트 끝에 새 행을 붙인 뒤, 원본과 교체합니다.
+    전체 워크북을 메모리에 올리지 않으므로 행 수와 상관없이 메모리 사용량이 일정합니다.
+    (셀 서식/수식은 값으로만 옮겨집니다)
+    """
+
+    def __init__(self, path, sheet_name=ORDER_SHEET_NAME, columns=ORDER_COLUMNS):
+        self.path = path
+        self.sheet_name = sheet_name
+        self.columns = list(columns)
+
+    def append(self, rows, progress=None, cancel=None, total=None):
+        """total: rows가 이터레이터일 때 진행 상황 표시에 쓸 전체 행 수"""
+        from openpyxl import Workbook, load_workbook
+
+        out = Workbook(write_only=True)
+        try:
+            written = self._fill(out, load_workbook, rows, progress, cancel, total)
+            # 임시 파일에 다 쓴 뒤 교체하여 저장 중 오류가 나도 원본은 그대로 유지
+            # (교체 전에 취소하면 원본 파일은 그대로)
+            _check_cancel(cancel)
+        except SaveCancelled:
+            # 쓰다 만 시트의 임시 파일 정리
+            for ws in out.worksheets:
+                ws.close()
+            raise
+
+        tmp_path = self.path + ".tmp"
+        try:
+            out.save(tmp_path)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return written
+
+    def _fill(self, out, load_workbook, rows, progress, cancel, total):
+        """기존 시트를 옮겨 쓰고 발주내역 시트 끝에 rows를 붙인 뒤 추가한 행 수를 반환"""
+        written = 0
+        found = False
+
+        src = load_workbook(self.path, read_only=True) if os.path.exists(self.path) else None
+        try:
+            if src is not None:
+                for ws in src.worksheets:
+                    dst = out.create_sheet(ws.title)
+                    for i, row in enumerate(ws.iter_rows(values_only=True)):
+                        if i % PROGRESS_EVERY == 0:
+                            _check_cancel(cancel)
+                        dst.append(row)
+                    if ws.title == self.sheet_name:
+                        found = True
+                        written = self._write_rows(dst, rows, progress, cancel, total)
+        finally:
+            if src is not None:
+                src.close()
+
+        if not found:
+            dst = out.create_sheet(self.sheet_name)
+            dst.append(self.columns)
+            written = self._write_rows(dst, rows, progress, cancel, total)
+        return written
+
+    @staticmethod
+    def _write_rows(ws, rows, progress=None, cancel=None, total=None):
+        count = 0
+        for row in rows:
+            ws.append(list(row))
+            count += 1
+            if count % PROGRESS_EVERY == 0:
+                _check_cancel(cancel)
+                if progress is not None:
+                    progress(count, total)
+        if progress is not None:
+            progress(count, total)
+        return count
@@ -0,0 +1,366 @@
+"""
+엑셀 COM 객체를 흉내 내는 메모리 내 가짜 구현.
+
+윈도우/엑셀 없이(리눅스 등) 저장 로직을 확인하거나 벤치마크할 때 사용합니다.
+실제 COM처럼 속성 읽기/쓰기와 메서드 호출을 모두 "왕복(round-trip)"으로 세어
+calls 카운터에 기록합니다.
+"""
+import os
+import re
+
+from safian.excel_session import ComBackend
+from safian.excel_sink import XL_UP
+
+MAX_ROWS = 1048576
+
+_ADDRESS_RE = re.compile(r'^([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$')
+
+
+def _column_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord('A') + 1)
+    return index
+
+
+class ComCounter:
+    """COM 왕복 횟수 집계"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def hit(self, n=1):
+        self.calls += n
+
+
+class FakeRows:
+    def __init__(self, counter):
+        self._counter = counter
+
+    @property
+    def Count(self):
+        self._counter.hit()
+        return MAX_ROWS
+
+
+class FakeRange:
+    def __init__(self, sheet, first_row, first_col, last_row=None, last_col=None):
+        self._sheet = sheet
+        self._counter = sheet._counter
+        self.first_row, self.first_col = first_row, first_col
+        self.last_row = first_row if last_row is None else last_row
+        self.last_col = first_col if last_col is None else last_col
+
+    @property
+    def Row(self):
+        self._counter.hit()
+        return self.first_row
+
+    @property
+    def Value(self):
+        self._counter.hit()
+        cells = self._sheet.cells
+        if self.first_row == self.last_row and self.first_col == self.last_col:
+            return cells.get((self.first_row, self.first_col))
+        return tuple(
+            tuple(cells.get((r, c)) for c in range(self.first_col, self.last_col + 1))
+            for r in range(self.first_row, self.last_row + 1)
+        )
+
+    @Value.setter
+    def Value(self, value):
+        self._counter.hit()
+        n_rows = self.last_row - self.first_row + 1
+        n_cols = self.last_col - self.first_col + 1
+        if n_rows == 1 and n_cols == 1 and not isinstance(value, (tuple, list)):
+            self._sheet._set(self.first_row, self.first_col, value)
+            return
+        if len(value) != n_rows or any(len(row) != n_cols for row in value):
+            raise ValueError("Range 크기와 값 배열 크기가 다릅니다.")
+        for r, row in enumerate(value, start=self.first_row):
+            for c, v in enumerate(row, start=self.first_col):
+                self._sheet._set(r, c, v)
+
+    def ClearContents(self):
+        self._counter.hit()
+        for r in range(self.first_row, self.last_row + 1):
+            for c in range(self.first_col, self.last_col + 1):
+                self._sheet._set(r, c, None)
+
+    def End(self, direction):
+        self._counter.hit()
+        if direction != XL_UP:
+            raise NotImplementedError("가짜 COM은 xlUp 방향만 지원합니다.")
+        rows = self._sheet.column_rows(self.first_col)
+        above = [r for r in rows if r < self.first_row]
+        return FakeRange(self._sheet, max(above) if above else 1, self.first_col)
+
+
+class FakeSheet:
+    def __init__(self, workbook, name):
+        self._workbook = workbook
+        self._counter = workbook._counter
+        self._name = name
+        self.cells = {}
+        self._rows_by_col = {}
+
+    def _set(self, r, c, value):
+        if value is None:
+            self.cells.pop((r, c), None)
+            self._rows_by_col.get(c, set()).discard(r)
+            return
+        self.cells[(r, c)] = value
+        self._rows_by_col.setdefault(c, set()).add(r)
+
+    def column_rows(self, col):
+        return self._rows_by_col.get(col, set())
+
+    @property
+    def Name(self):
+        self._counter.hit()
+        return self._name
+
+    @Name.setter
+    def Name(self, value):
+        self._counter.hit()
+        self._name = value
+
+    @property
+    def Rows(self):
+        self._counter.hit()
+        return FakeRows(self._counter)
+
+    def Cells(self, row, col):
+        self._counter.hit()
+        return FakeRange(self, row, col)
+
+    def Range(self, first, last=None):
+        self._counter.hit()
+        if last is not None:
+            return FakeRange(self, first.first_row, first.first_col, last.first_row, last.first_col)
+        m = _ADDRESS_RE.match(first.replace("$", "").upper())
+        if not m:
+            raise ValueError(f"지원하지 않는 주소 형식: {first}")
+        c1, r1, c2, r2 = m.groups()
+        if c2 is None:
+            c2, r2 = c1, r1
+        return FakeRange(self, int(r1), _column_index(c1), int(r2), _column_index(c2))
+
+    @property
+    def UsedRange(self):
+        self._counter.hit()
+        if not self.cells:
+            return FakeRange(self, 1, 1)
+        rows = [r for r, _ in self.cells]
+        cols = [c for _, c in self.cells]
+        return FakeRange(self, min(rows), min(cols), max(rows), max(cols))
+
+    def rows(self):
+        """(테스트/벤치마크용) 시트 내용을 행 목록으로 반환 - 왕복 횟수에 포함되지 않음"""
+        if not self.cells:
+            return []
+        n_rows = max(r for r, _ in self.cells)
+        n_cols = max(c for _, c in self.cells)
+        return [tuple(self.cells.get((r, c)) for c in range(1, n_cols + 1)) for r in range(1, n_rows + 1)]
+
+
+class FakeSheets:
+    def __init__(self, workbook):
+        self._workbook = workbook
+        self._counter = workbook._counter
+        self._items = []
+
+    def __call__(self, key):
+        self._counter.hit()
+        if isinstance(key, int):
+            return self._items[key - 1]
+        for sheet in self._items:
+            if sheet._name == key:
+                return sheet
+        raise KeyError(f"시트를 찾을 수 없습니다: {key}")
+
+    def __iter__(self):
+        self._counter.hit()
+        return iter(list(self._items))
+
+    @property
+    def Count(self):
+        self._counter.hit()
+        return len(self._items)
+
+    def Add(self, Before=None, After=None):
+        self._counter.hit()
+        name = f"Sheet{len(self._items) + 1}"
+        sheet = FakeSheet(self._workbook, name)
+        if After is not None:
+            self._items.insert(self._items.index(After) + 1, sheet)
+        elif Before is not None:
+            self._items.insert(self._items.index(Before), sheet)
+        else:
+            self._items.append(sheet)
+        return sheet
+
+
+class FakeWorkbook:
+    def __init__(self, full_name="C:\\fake\\master.xlsb", sheet_names=("코드",), counter=None, read_only=False):
+        self._counter = counter or ComCounter()
+        self._full_name = full_name
+        self._read_only = read_only
+        self.Sheets = FakeSheets(self)
+        for name in sheet_names:
+            self.Sheets._items.append(FakeSheet(self, name))
+        self.closed = False
+        self.save_count = 0
+        self._app = None
+
+    @property
+    def com_calls(self):
+        """(테스트/벤치마크용) 지금까지의 COM 왕복 횟수"""
+        return self._counter.calls
+
+    def sheet(self, name):
+        """(테스트/벤치마크용) 이름으로 시트 조회 - 왕복 횟수에 포함되지 않음"""
+        for sheet in self.Sheets._items:
+            if sheet._name == name:
+                return sheet
+        return None
+
+    def _check_open(self):
+        if self.closed:
+            # 사용자가 워크북을 닫은 뒤 핸들을 쓰면 실제 COM도 예외를 던짐
+            raise RuntimeError("워크북이 이미 닫혔습니다.")
+
+    @property
+    def FullName(self):
+        self._counter.hit()
+        self._check_open()
+        return self._full_name
+
+    @property
+    def ReadOnly(self):
+        self._counter.hit()
+        self._check_open()
+        return self._read_only
+
+    def Save(self):
+        self._counter.hit()
+        self._check_open()
+        self.save_count += 1
+
+    def Close(self, SaveChanges=False):
+        self._counter.hit()
+        self._check_open()
+        if SaveChanges:
+            self.save_count += 1
+        self.closed = True
+        if self._app is not None and self in self._app.Workbooks._items:
+            self._app.Workbooks._items.remove(self)
+
+
+class FakeWorkbooks:
+    def __init__(self, app):
+        self._app = app
+        self._counter = app._counter
+        self._items = []
+
+    def __iter__(self):
+        self._counter.hit()
+        self._app._check_running()
+        return iter(list(self._items))
+
+    @property
+    def Count(self):
+        self._counter.hit()
+        self._app._check_running()
+        return len(self._items)
+
+    def Open(self, path, UpdateLinks=0, ReadOnly=False):
+        self._counter.hit()
+        self._app._check_running()
+        workbook = self._app.disk.open(path)
+        workbook._app = self._app
+        self._items.append(workbook)
+        return workbook
+
+
+class FakeDisk:
+    """
+    가짜 파일 저장소. 워크북을 닫았다 다시 열어도 저장된 시트 내용이 유지됩니다.
+    register(경로)로 등록한 파일만 열 수 있습니다.
+    """
+
+    def __init__(self, counter=None):
+        self.counter = counter or ComCounter()
+        self._sheets = {}
+        self._options = {}
+
+    def register(self, path, sheet_names=("코드",), read_only=False):
+        key = os.path.abspath(path).lower()
+        self._options[key] = (path, tuple(sheet_names), read_only)
+
+    def open(self, path):
+        key = path.lower()
+        if key not in self._options:
+            raise FileNotFoundError(path)
+        full_name, sheet_names, read_only = self._options[key]
+        workbook = FakeWorkbook(os.path.abspath(full_name), sheet_names, self.counter, read_only)
+        if key in self._sheets:
+            workbook.Sheets._items = self._sheets[key]
+        self._sheets[key] = workbook.Sheets._items
+        return workbook
+
+
+class FakeExcel:
+    """가짜 Excel.Application"""
+
+    def __init__(self, disk):
+        self.disk = disk
+        self._counter = disk.counter
+        self.Workbooks = FakeWorkbooks(self)
+        self.DisplayAlerts = True
+        self.Visible = True
+        self.running = True
+
+    def _check_running(self):
+        if not self.running:
+            # 사용자가 엑셀을 종료한 뒤 핸들을 쓰면 실제 COM도 예외를 던짐
+            raise RuntimeError("엑셀이 종료되었습니다.")
+
+    def Quit(self):
+        self._counter.hit()
+        self.running = False
+        for wb in list(self.Workbooks._items):
+            wb.closed = True
+        self.Workbooks._items.clear()
+
+
+class FakeComBackend:
+    """
+    ExcelSession에 주입할 가짜 COM 백엔드.
+    실행 중인 엑셀(excel)이 있으면 get_active가 그것을, 없으면 dispatch가 새 엑셀을 돌려줍니다.
+    """
+
+    def __init__(self, disk=None):
+        self.disk = disk or FakeDisk()
+        self.excel = None
+        self.com_depth = 0
+        self.dispatch_count = 0
+
+    def co_initialize(self):
+        self.com_depth += 1
+
+    def co_uninitialize(self):
+        self.com_depth -= 1
+
+    def get_active(self):
+        if self.excel is None or not self.excel.running:
+            raise RuntimeError("실행 중인 엑셀이 없습니다.")
+        return self.excel
+
+    def dispatch(self):
+        self.dispatch_count += 1
+        self.excel = FakeExcel(self.disk)
+        return self.excel
+
+    def as_backend(self):
+        return ComBackend(self.co_initialize, self.co_uninitialize, self.get_active, self.dispatch)
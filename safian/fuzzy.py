@@ -0,0 +1,199 @@
+"""
+오타/순서 바뀜에 강한 제품명 유사도 검색.
+
+제품명을 정규화(소문자, 공백/기호 제거)한 뒤 한글 자모로 풀어 쓴 문자열의
+문자 3-gram 역색인을 후보 색인으로 사용합니다.
+- 자모 단위라 '티크' -> '티코' 같은 한 글자 오타도 3-gram 일부만 달라집니다.
+- 3-gram 집합 비교는 단어 순서에 거의 영향을 받지 않으므로 "티크 DUALFIXPRO"도 찾습니다.
+게시목록은 드문 3-gram부터 이어 붙여 np.bincount로 한꺼번에 세고, 후보 점수도 배열 연산으로 계산합니다.
+시간 예산(budget)을 넘기면 남은 흔한 3-gram은 건너뛴 뒤 공통 개수가 많은 후보만 제품명과 직접 비교합니다.
+"""
+import heapq
+import math
+import re
+import time
+from array import array
+from typing import NamedTuple
+
+import numpy as np
+
+from safian.hangul import decompose
+
+_STRIP_PATTERN = re.compile(r'[\s\-_/.,()\[\]·]+')
+
+# 게시목록을 이어 붙여 한 번에 셀 최대 길이 (이 묶음마다 시간 예산을 확인)
+MERGE_CHUNK = 1 << 18
+# 배열 연산으로 고른 상위 후보 중 점수를 다시 계산할 여유분 (반올림 경계의 동점 대비)
+SCORE_SLACK = 16
+
+
+class FuzzyMatch(NamedTuple):
+    pos: int        # 카탈로그 행 위치
+    score: float    # 0~1 (1이면 힌트가 제품명에 그대로 포함)
+
+
+def fuzzy_key(text):
+    """비교용 문자열: 소문자 + 공백/하이픈 등 제거 + 자모 분해"""
+    return decompose(_STRIP_PATTERN.sub('', str(text).lower()))
+
+
+class FuzzyIndex:
+    """
+    제품명 3-gram 역색인 + 한글 자모 기반 유사도 점수.
+
+    점수 = 0.7 * (힌트 3-gram 중 제품명에 있는 비율) + 0.3 * Dice 계수
+    힌트가 제품명 안에 그대로 들어있으면 0.9 이상을 줍니다.
+    """
+
+    def __init__(self, names, n=3):
+        self.n = n
+        self.keys = [fuzzy_key(name) for name in names]
+        self._sizes = array('H', bytes(2 * len(self.keys)))
+        self._postings = {}
+        # 짧은 제품명부터 게시목록에 넣어 두면, 공통 개수가 같은 후보 중 짧은(더 구체적인) 것이 먼저 뽑힘
+        for pos in sorted(range(len(self.keys)), key=lambda p: len(self.keys[p])):
+            grams = self._grams(self.keys[pos])
+            self._sizes[pos] = min(len(grams), 0xFFFF)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(pos)
+        # 게시목록은 int 객체 목록 대신 4바이트 정수 배열로 보관 (메모리 절약)
+        self._postings = {gram: array('i', posting) for gram, posting in self._postings.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _grams(self, key):
+        n = self.n
+        if len(key) < n:
+            return {key} if key else set()
+        return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+    def _count_shared(self, grams, deadline, clock):
+        """
+        힌트 3-gram의 게시목록을 드문 것부터 합쳐 행별 공통 3-gram 수를 셉니다.
+        게시목록 여러 개를 이어 붙여 np.bincount 한 번으로 세므로 행 수가 많아도 빠릅니다.
+        반환값: (행별 공통 개수 배열, 예산 초과로 합치지 못한 3-gram 수)
+        """
+        postings = sorted((p for p in map(self._postings.get, grams) if p), key=len)
+        counts = None
+        merged = 0
+        while merged < len(postings):
+            # 최소 한 묶음은 끝까지 보고, 이후 예산을 넘기면 흔한 3-gram은 생략
+            if counts is not None and clock() > deadline:
+                break
+            batch, total = [], 0
+            while merged < len(postings) and (not batch or total + len(postings[merged]) <= MERGE_CHUNK):
+                batch.append(np.frombuffer(postings[merged], dtype=np.int32))
+                total += len(postings[merged])
+                merged += 1
+            batch_counts = np.bincount(np.concatenate(batch), minlength=len(self.keys))
+            counts = batch_counts if counts is None else counts + batch_counts
+        return counts, len(postings) - merged
+
+    def _score(self, key, n_grams, pos, shared):
+        coverage = shared / n_grams
+        dice = 2.0 * shared / (n_grams + self._sizes[pos])
+        score = 0.7 * coverage + 0.3 * dice
+        if shared == n_grams and key in self.keys[pos]:
+            score = max(score, 0.9 + 0.1 * dice)
+        return min(score, 1.0)
+
+    def search(self, hint, k=5, min_score=0.4, budget=0.005, pool=200):
+        """
+        힌트와 비슷한 제품명 상위 k개를 [FuzzyMatch, ...] (점수 내림차순)로 반환합니다.
+        budget: 이 호출 전체(세기 + 점수 계산)에 쓸 최대 시간(초). 넘기면 흔한 3-gram을 건너뛰고
+                공통 개수가 많은 pool개 후보만 제품명과 직접 비교합니다.
+                (가장 드문 게시목록 한 묶음과 마지막 정렬은 예산과 상관없이 끝까지 수행)
+        """
+        key = fuzzy_key(hint)
+        grams = self._grams(key)
+        if not grams or not self.keys:
+            return []
+
+        clock = time.perf_counter
+        deadline = clock() + budget
+        counts, unseen = self._count_shared(grams, deadline, clock)
+        if counts is None:
+            return []
+        # 점수가 min_score 이상이려면 (Dice가 coverage보다 크지 않은 한) 공통 3-gram도 그 비율 이상 필요
+        n_grams = len(grams)
+        need = max(1, math.ceil(min_score * n_grams)) - unseen
+        candidates = np.flatnonzero(counts >= need)
+        shared = counts[candidates]
+        if unseen:
+            return self._rescore(key, grams, candidates, shared, k, min_score, pool, deadline, clock)
+
+        sizes = np.frombuffer(self._sizes, dtype=np.uint16)[candidates]
+        scores = 0.7 * (shared / n_grams) + 0.3 * (2.0 * shared / (n_grams + sizes))
+        self._contained_scores(key, n_grams, candidates, shared, sizes, scores, k, deadline, clock)
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], np.minimum(scores[keep], 1.0)
+        top = k + SCORE_SLACK
+        if len(scores) > top:
+            # 상위 top번째 점수와 반올림하면 같아질 수 있는 후보까지만 남김 (전체 정렬 생략)
+            floor = np.partition(scores, -top)[-top] - 1e-4
+            keep = scores >= floor
+            candidates, scores = candidates[keep], scores[keep]
+        # (점수 내림차순, 행 순서)로 앞쪽 몇 개만 골라 기존 _score로 다시 계산 (반올림 결과를 정확히 맞춤)
+        order = np.lexsort((candidates, -np.round(scores, 4)))[:top]
+        scored = [FuzzyMatch(pos, round(self._score(key, n_grams, pos, int(counts[pos])), 4))
+                  for pos in candidates[order].tolist()]
+        return heapq.nsmallest(k, scored, key=lambda m: (-m.score, m.pos))
+
+    def _contained_scores(self, key, n_grams, candidates, shared, sizes, scores, k, deadline, clock):
+        """
+        3-gram을 모두 가진 후보 중 힌트가 제품명 안에 그대로 들어있는 것의 점수를 올립니다.
+        포함 점수(0.9 + 0.1 * Dice)는 짧은 제품명일수록 높으므로 짧은 것부터 확인하고,
+        k개를 찾은 뒤에는 k번째를 앞설 수 있는 후보만 더 확인합니다. (짧은 힌트는 수만 행이 해당)
+        """
+        full = np.flatnonzero(shared == n_grams)
+        # full은 행 순서이므로 안정 정렬하면 (제품명 길이, 행 순서) 순
+        order = full[np.argsort(sizes[full], kind='stable')]
+        bounds = np.minimum(0.9 + 0.1 * (2.0 * n_grams / (n_grams + sizes[order])), 1.0)
+        found = []
+        for i in range(len(order)):
+            if i >= k and clock() > deadline:
+                return
+            j = int(order[i])
+            pos = int(candidates[j])
+            if key not in self.keys[pos]:
+                continue
+            scores[j] = self._score(key, n_grams, pos, n_grams)
+            found.append((-round(scores[j], 4), pos))
+            if len(found) == k:
+                break
+        else:
+            return
+
+        # k번째보다 점수가 높거나, 반올림하면 같으면서 행 순서가 앞설 수 있는 후보만 남김
+        kth_score, kth_pos = max(found)
+        kth_score = -kth_score
+        rest, bounds = order[i + 1:], bounds[i + 1:]
+        ahead = (bounds > kth_score + 5e-5 - 1e-9) | ((bounds >= kth_score - 5e-5 - 1e-9) & (candidates[rest] < kth_pos))
+        for j in rest[ahead].tolist():
+            if clock() > deadline:
+                return
+            pos = int(candidates[j])
+            if key in self.keys[pos]:
+                scores[j] = self._score(key, n_grams, pos, n_grams)
+
+    def _rescore(self, key, grams, candidates, shared, k, min_score, pool, deadline, clock):
+        """예산 초과로 일부 3-gram을 못 셌을 때: 공통 개수가 많은 pool개 후보만 제품명과 직접 비교해 정확히 셈"""
+        # 공통 개수가 많은 후보부터, 같으면 3-gram이 적은(짧은) 제품명부터 (Dice가 더 큼)
+        sizes = np.frombuffer(self._sizes, dtype=np.uint16)[candidates]
+        rank = shared.astype(np.int64) * 0x10000 + (0xFFFF - sizes)
+        if len(candidates) > pool:
+            top = np.argpartition(-rank, pool)[:pool]
+            candidates, rank = candidates[top], rank[top]
+        order = np.lexsort((candidates, -rank))
+        n_grams = len(grams)
+        scored = []
+        for i, pos in enumerate(candidates[order].tolist()):
+            # 남은 예산도 없으면 공통 개수가 적은 뒤쪽 후보는 생략
+            if i >= k and clock() > deadline:
+                break
+            count = len(grams & self._grams(self.keys[pos]))
+            score = self._score(key, n_grams, pos, count)
+            if score >= min_score:
+                scored.append(FuzzyMatch(pos, round(score, 4)))
+        return heapq.nsmallest(k, scored, key=lambda m: (-m.score, m.pos))
@@ -1,11 +1,24 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import traceback
+import platform
+import queue
+import time
 from safian.core import OrderProcessor
-from safian.parser import parse_order_text
+from safian.importer import DEFAULT_PROFILE_DIR, list_profiles, match_profile
+from safian.journal import DEFAULT_JOURNAL_PATH, OrderJournal
+from safian.listview import DISPLAY_COLUMNS, OrderListModel, VirtualTreeview, display_values
+from safian.remote import RemoteProcessor
+from safian.tasks import TaskRunner
+
+# 작업 레인: 분석/조회/추가는 입력 순서대로 한 스레드에서, 저장은 별도 스레드에서 실행
+WORK_LANE = "work"
+SAVE_LANE = "save"
+# 자동완성은 키 입력마다 요청하므로 분석/추가 작업 뒤에 줄 서지 않도록 레인을 따로 둠
+SUGGEST_LANE = "suggest"
 
 class OrderApp:
-    def __init__(self, root, master_file):
+    def __init__(self, root, master_file, sources=None, journal_path=DEFAULT_JOURNAL_PATH, server_url=None):
         self.root = root
         self.root.title("주문 발주서 자동화 (클립보드 AI 파서 1.0)")
         self.root.geometry("1100x650")
@@ -18,12 +31,67 @@ class OrderApp:
         style.configure("Treeview", font=default_font)
         style.configure("Treeview.Heading", font=default_font, font_weight="bold")
 
-        # 코어 초기화
-        self.processor = OrderProcessor(master_file)
+        # 코어 초기화 (마스터 데이터는 백그라운드에서 로드하고 창은 바로 띄움)
+        # 종료 시 단계별 처리시간 집계를 metrics.json에 기록 (어디서 시간이 드는지 확인용)
+        # server_url을 주면 마스터를 직접 읽지 않고 주문 분석 서버(python -m safian serve)에 조회
+        if server_url:
+            self.processor = RemoteProcessor(server_url, master_file, metrics_path="metrics.json")
+        else:
+            self.processor = OrderProcessor(master_file, background=True, metrics_path="metrics.json",
+                                            sources=sources)
         self.master_file = master_file
-        self.order_list = [] # Treeview와 연동할 대기 리스트
+        # 대기 리스트: 저널 id -> (엑셀 행, 화면 표시 값). 화면에는 보이는 구간만 그림
+        self.orders = OrderListModel()
+        # 대기 리스트를 추가/삭제할 때마다 SQLite 저널에 기록 (비정상 종료 후 재실행 시 복원)
+        self.journal = OrderJournal(journal_path)
+        self._pending_until_ready = [] # 로딩 완료 후 실행할 작업 (조회/추가)
+        self._reload_events = queue.Queue() # 감시 스레드 -> 메인 스레드 마스터 갱신 알림
+        # 분석/조회/저장은 작업 스레드에서 실행하고 결과만 메인 스레드로 받아 화면에 반영
+        self.tasks = TaskRunner(self.root)
+        self._paste_seq = 0        # 마지막 붙여넣기 번호 (늦게 끝난 이전 분석 결과는 무시)
+        self._suggest_seq = 0      # 마지막 자동완성 요청 번호 (입력이 바뀐 뒤 도착한 결과는 무시)
+        self._save_task = None     # 진행 중인 저장 작업
+        self._saving_ids = set()   # 저장 중인 행 id (저장이 끝날 때까지 삭제 불가)
 
         self._create_ui()
+        self._restore_pending()
+        self._poll_loading()
+        
+        # 중복 주문 감지용으로 기존 발주내역을 백그라운드에서 한 번에 읽음
+        # (윈도우는 마스터 파일, 그 외에는 마지막으로 저장한 xlsx)
+        history_path = self.processor.master_file_path
+        if platform.system() != 'Windows':
+            history_path = self.journal.last_export_target()
+        if history_path:
+            self.processor.load_order_history(history_path, background=True)
+        
+        # 영업팀이 마스터 엑셀을 수정하면 재시작 없이 자동 반영
+        self.processor.watch_master_file(on_reload=self._reload_events.put)
+        self._poll_reload()
+        
+        # 창을 닫을 때 엑셀 세션(COM) 정리
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        if self._save_task is not None:
+             if not messagebox.askyesno("저장 중", "엑셀 저장이 진행 중입니다. 저장을 취소하고 종료하시겠습니까?"):
+                 return
+             self._save_task.cancel()
+        try:
+            # 진행 중인 작업(취소된 저장 포함)이 정리될 때까지 기다린 뒤 종료
+            self.tasks.shutdown(wait=True)
+            self.processor.close()
+            self.journal.close()
+        finally:
+            self.root.destroy()
+
+    def _restore_pending(self):
+        """지난 실행에서 저장하지 못한 대기 주문을 저널에서 복원"""
+        entries = self.journal.pending()
+        self.order_view.append(entries)
+        self.processor.remember_orders(entry.data for entry in entries)
+        if entries:
+             self.status_var.set(f"♻ 지난번에 저장하지 않은 주문 {len(entries)}행을 대기 리스트에 복원했습니다.")
 
     def _create_ui(self):
         # 상단 타이틀 & 설명 영역
@@ -60,10 +128,21 @@ class OrderApp:
             if var_name in ["address", "memo", "product_hint"]:
                 entry.config(width=35)
                 
+            # 상품명 힌트를 입력하는 동안 앞부분이 일치하는 제품을 후보 목록에 표시
+            if var_name == "product_hint":
+                entry.bind("<KeyRelease>", self._on_hint_typed)
+                
             # 바코드 입력 시 엔터 치면 제품 다시 검색
             if var_name == "barcode":
                 entry.bind("<Return>", lambda e: self._on_barcode_manual_search())
 
+        # 유사 상품 후보 (오타/순서 바뀜으로 정확히 일치하는 상품이 없을 때 골라서 사용)
+        ttk.Label(input_frame, text="후보 상품").grid(row=3, column=0, padx=5, pady=8, sticky="e")
+        self.candidate_box = ttk.Combobox(input_frame, state="readonly", width=90)
+        self.candidate_box.grid(row=3, column=1, columnspan=7, padx=5, pady=8, sticky="w")
+        self.candidate_box.bind("<<ComboboxSelected>>", self._on_candidate_selected)
+        self._candidates = []
+
         # 2. 버튼 영역
         btn_frame = ttk.Frame(self.root)
         btn_frame.pack(fill="x", padx=10, pady=5)
@@ -76,24 +155,30 @@ class OrderApp:
 
         ttk.Button(btn_frame, text="➖ 선택 삭제 (Del)", command=self.remove_item).pack(side="left", padx=5)
         
+        ttk.Button(btn_frame, text="📂 거래처 주문서 가져오기", command=self.import_partner_orders).pack(side="left", padx=5)
+        
         btn_save = tk.Button(btn_frame, text="💾 엑셀파일에 저장", bg="#ffaaa5", fg="white", font=("Malgun Gothic", 10, "bold"), height=2, command=self.export_to_excel)
         btn_save.pack(side="right", padx=5)
+        
+        # 저장 진행 표시 / 취소 (저장 중에만 보임)
+        self.save_progress = ttk.Progressbar(btn_frame, length=180, mode="determinate")
+        self.btn_cancel_save = ttk.Button(btn_frame, text="⏹ 저장 취소", command=self._cancel_save)
+
+        # 상태 표시줄 (리스트가 남은 공간을 모두 차지하기 전에 하단에 먼저 배치)
+        self.status_var = tk.StringVar(value="⏳ 제품 목록(마스터 엑셀) 로딩 중... 붙여넣기는 바로 가능합니다.")
+        ttk.Label(self.root, textvariable=self.status_var, anchor="w", relief="sunken").pack(fill="x", side="bottom")
 
         # 3. 리스트 (Treeview) 영역
         tree_frame = ttk.LabelFrame(self.root, text="[ 발주 대기 리스트 ]")
         tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # 엑셀에 저장될 컬럼 구성
-        cols = ("주문인", "주소", "핸드폰", "바코드", "상품명", "수량", "배송메모", "타입")
-        self.tree = ttk.Treeview(tree_frame, columns=cols, show="headings", height=10)
-        
+        cols = DISPLAY_COLUMNS
         # 컬럼 너비 설정
         widths = {"주문인": 70, "주소": 300, "핸드폰": 120, "바코드": 110, "상품명": 150, "수량": 50, "배송메모": 150, "타입": 60}
-        for col in cols:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=widths.get(col, 100), anchor="center")
-            
-        self.tree.pack(fill="both", expand=True, padx=5, pady=5)
+        # 수만 행이어도 Treeview에는 화면에 보이는 행만 넣음 (가상 스크롤)
+        self.order_view = VirtualTreeview(tree_frame, self.orders, cols, widths)
+        self.order_view.pack(fill="both", expand=True, padx=5, pady=5)
 
         # 단축키 설정
         self.root.bind("<Control-v>", lambda e: self.paste_and_analyze())
@@ -116,9 +201,18 @@ class OrderApp:
 
         if not content.strip(): return
 
-        # AI 파서 가동 (parser.py)
-        parsed = parse_order_text(content)
+        # AI 파서 가동 (parser.py) - 작업 스레드에서 분석하고 결과만 화면에 채움
+        self._paste_seq += 1
+        seq = self._paste_seq
+        self.tasks.submit(WORK_LANE, self.processor.parse_order, content,
+                          on_done=lambda parsed: self._apply_parsed(seq, content, parsed))
 
+    def _apply_parsed(self, seq, content, parsed):
+        """분석 결과를 입력창에 채움 (메인 스레드)"""
+        # 분석하는 사이 다시 붙여넣었으면 이전 결과는 버림
+        if seq != self._paste_seq:
+            return
+            
         # 복사한 내용이 표 형태(Tab 구분이 여러개)이거나 
         # 연락처/주소가 명확히 있거나, 내용이 15글자 이상이면 "전체 주문 복사"로 간주합니다.
         is_full_order = False
@@ -160,28 +254,152 @@ class OrderApp:
             self.entries["product_hint"].insert(0, hint)
             
             # [핵심] 상품명 힌트를 바탕으로 바코드 자동 검색 (core.py)
-            products = self.processor.find_barcode_by_product_name(hint)
-            if products:
-                # 첫번째 제품의 바코드를 넣음
-                main_barcode = products[0]["barcode"]
-                self.entries["barcode"].insert(0, main_barcode)
-                self.entries["barcode"].configure(foreground="blue")
-            else:
-                self.entries["barcode"].insert(0, "[검색실패] 직접입력")
-                self.entries["barcode"].configure(foreground="red")
+            # 마스터 데이터 로딩 중이면 로딩 완료 후 자동으로 검색
+            if not self.processor.ready:
+                self.entries["barcode"].insert(0, "[로딩중] 잠시 후 자동 검색")
+                self.entries["barcode"].configure(foreground="gray")
+            self._run_when_ready(self._fill_barcode_from_hint, hint)
                 
         # 포커스를 바코드로 이동시켜 사용자가 최종 확인하도록 유도
         self.entries["barcode"].focus()
 
+    def _fill_barcode_from_hint(self, hint):
+        """상품명 힌트로 바코드를 찾아 바코드 칸에 채움 (검색은 작업 스레드에서)"""
+        # 로딩을 기다리는 사이 다른 주문으로 넘어갔으면 무시
+        if self.entries["product_hint"].get() != hint:
+            return
+        self.tasks.submit(WORK_LANE, self._lookup_hint, hint,
+                          on_done=lambda result: self._show_hint_result(hint, *result))
+
+    def _lookup_hint(self, hint):
+        """(작업 스레드) 포함 검색 + 유사도 후보"""
+        return self.processor.find_barcode_by_product_name(hint), self.processor.search_products(hint)
+
+    def _show_hint_result(self, hint, products, candidates):
+        # 검색하는 사이 다른 주문으로 넘어갔으면 무시
+        if self.entries["product_hint"].get() != hint:
+            return
+        self._show_candidates(candidates)
+        self.entries["barcode"].delete(0, 'end')
+        if products:
+            # 첫번째 제품의 바코드를 넣음
+            main_barcode = products[0]["barcode"]
+            self.entries["barcode"].insert(0, main_barcode)
+            self.entries["barcode"].configure(foreground="blue")
+        elif candidates:
+            # 정확히 포함되는 상품은 없지만 비슷한 상품이 있으면 후보에서 고르도록 안내
+            self.entries["barcode"].insert(0, "[검색실패] 후보에서 선택")
+            self.entries["barcode"].configure(foreground="red")
+            self.status_var.set(f"🔎 '{hint}'와(과) 비슷한 상품 {len(candidates)}건 - [후보 상품]에서 선택해주세요.")
+        else:
+            self.entries["barcode"].insert(0, "[검색실패] 직접입력")
+            self.entries["barcode"].configure(foreground="red")
+
+    def _show_candidates(self, candidates):
+        """유사도 검색(점수 표시)/자동완성 결과를 후보 상품 목록에 표시"""
+        self._candidates = candidates
+        self.candidate_box["values"] = [
+            f"{c['score']:.0%}  {c['barcode']}  {c['product_name']}" if 'score' in c
+            else f"{c['barcode']}  {c['product_name']}"
+            for c in candidates
+        ]
+        self.candidate_box.set("")
+
+    def _on_hint_typed(self, event=None):
+        """
+        힌트 칸에 글자를 입력할 때마다 자동완성 후보 갱신 (초성 입력 가능, 로딩 중에는 생략)
+        서버 모드에서는 조회가 HTTP 호출이므로 작업 스레드에서 찾고 결과만 메인 스레드에서 표시합니다.
+        """
+        if event is not None and event.keysym in ("Return", "Tab", "Up", "Down", "Left", "Right", "Home", "End"):
+            return
+        self._suggest_seq += 1
+        seq = self._suggest_seq
+        hint = self.entries["product_hint"].get().strip()
+        if not hint:
+            self._show_candidates([])
+            return
+        self.tasks.submit(SUGGEST_LANE, self._lookup_suggestions, seq, hint,
+                          on_done=lambda suggestions: self._show_suggestions(seq, hint, suggestions))
+
+    def _lookup_suggestions(self, seq, hint):
+        """(작업 스레드) 자동완성 조회. 그사이 더 입력했으면 조회하지 않음"""
+        if seq != self._suggest_seq:
+            return None
+        return self.processor.suggest_products(hint)
+
+    def _show_suggestions(self, seq, hint, suggestions):
+        # 조회하는 사이 더 입력했으면 이전 결과는 버림
+        if suggestions is None or seq != self._suggest_seq:
+            return
+        self._show_candidates(suggestions)
+        if suggestions:
+            self.status_var.set(f"🔎 '{hint}'(으)로 시작하는 상품 {len(suggestions)}건 - [후보 상품]에서 선택할 수 있습니다.")
+
+    def _on_candidate_selected(self, event=None):
+        """후보를 고르면 그 바코드를 바코드 칸에 채움"""
+        idx = self.candidate_box.current()
+        if idx < 0 or idx >= len(self._candidates):
+            return
+        self.entries["barcode"].delete(0, 'end')
+        self.entries["barcode"].insert(0, self._candidates[idx]["barcode"])
+        self.entries["barcode"].configure(foreground="blue")
+        self.entries["barcode"].focus()
+
+    # ------------------ 마스터 데이터 로딩 ------------------ #
+    def _poll_loading(self):
+        """백그라운드 로딩 완료 여부를 주기적으로 확인 (Tk 메인 스레드에서 실행)"""
+        if not self.processor.ready:
+            self.root.after(100, self._poll_loading)
+            return
+            
+        count = self.processor.product_count
+        if count is None:
+            self.status_var.set("⚠ 제품 목록 로드 실패 - 마스터 엑셀 파일(또는 서버 연결)을 확인해주세요 (debug.log)")
+        else:
+            self.status_var.set(f"✅ 제품 {count}건 로드 완료")
+            
+        # 로딩 중에 쌓인 작업을 순서대로 처리
+        pending, self._pending_until_ready = self._pending_until_ready, []
+        for fn, args in pending:
+            try:
+                fn(*args)
+            except Exception:
+                traceback.print_exc()
+
+    def _poll_reload(self):
+        """마스터 파일 자동 갱신 결과를 상태 표시줄에 반영 (Tk 메인 스레드에서 실행)"""
+        try:
+            while True:
+                summary = self._reload_events.get_nowait()
+                self.status_var.set(f"🔄 마스터 엑셀 변경 반영 (제품 {self.processor.product_count}건) - {summary}")
+        except queue.Empty:
+            pass
+        self.root.after(1000, self._poll_reload)
+
+    def _run_when_ready(self, fn, *args):
+        """마스터 데이터가 준비됐으면 바로, 아니면 로딩 완료 후 실행"""
+        if self.processor.ready and not self._pending_until_ready:
+            fn(*args)
+            return
+        self._pending_until_ready.append((fn, args))
+        self.status_var.set(f"⏳ 제품 목록 로딩 중... (대기 작업 {len(self._pending_until_ready)}건, 완료 후 자동 처리)")
+
     def _on_barcode_manual_search(self):
         """바코드 창에서 엔터쳤을때 수동으로 제품명 검색"""
         bc = self.entries["barcode"].get()
         if bc:
-             res = self.processor.lookup_product_by_barcode(bc)
-             if res:
-                  messagebox.showinfo("검색 완료", f"제품명: {res[0]['product_name']}")
-             else:
-                  messagebox.showwarning("검색 실패", "등록되지 않은 바코드입니다.")
+             self._run_when_ready(self._show_barcode_lookup, bc)
+
+    def _show_barcode_lookup(self, bc):
+        """바코드 조회는 작업 스레드에서 하고 결과 창만 메인 스레드에서 띄움"""
+        self.tasks.submit(WORK_LANE, self.processor.lookup_product_by_barcode, bc,
+                          on_done=self._show_barcode_result)
+
+    def _show_barcode_result(self, res):
+        if res:
+             messagebox.showinfo("검색 완료", f"제품명: {res[0]['product_name']}")
+        else:
+             messagebox.showwarning("검색 실패", "등록되지 않은 바코드입니다.")
 
     def add_item(self, event=None):
         """현재 입력창의 데이터를 Treeview와 내부 리스트에 추가"""
@@ -190,27 +408,65 @@ class OrderApp:
         if not data["mobile"] and not data["address"]:
              return # 빈 데이터 무시
              
+        if "로딩중" in data["barcode"]:
+             messagebox.showinfo("로딩 중", "제품 목록을 불러오는 중입니다. 바코드가 채워지면 다시 추가해주세요.")
+             return
+             
         if not data["barcode"] or "검색실패" in data["barcode"]:
              messagebox.showwarning("바코드 누락", "정확한 바코드를 입력해주세요.")
              self.entries["barcode"].focus()
              return
              
+        # 같은 (핸드폰, 주소, 바코드, 수량) 주문이 이미 있으면 추가 전에 확인
+        order = {"핸드폰": data["mobile"], "전화번호": data["phone"], "주소": data["address"],
+                 "바코드": data["barcode"], "수량": data["qty"]}
+        duplicate = self.processor.find_duplicate(order)
+        if duplicate:
+             when = time.strftime("%m/%d %H:%M", time.localtime(duplicate.when))
+             if not messagebox.askyesno(
+                     "중복 주문 의심",
+                     f"같은 연락처/주소/바코드/수량의 주문이 {duplicate.origin}에 이미 있습니다. ({when}, {duplicate.count}건)\n"
+                     "그래도 추가하시겠습니까?", icon="warning"):
+                 return
+             
+        # 작업 스레드가 기록하기 전에 같은 주문을 또 추가(더블 클릭 등)해도 경고하도록 키를 바로 기록
+        # (작업 스레드가 행을 기록하면 이 임시 키는 뺌)
+        self.processor.remember_orders([order])
+        # 로딩 중이면 입력 내용을 보관해 두었다가 로딩 완료 후 목록에 추가
+        self._run_when_ready(self._add_order, data, order)
+            
+        # 추가 성공 시 입력창 깨끗하게 비우기 (반복 작업 편의성)
+        self.entries["barcode"].delete(0, 'end')
+        self.entries["product_hint"].delete(0, 'end')
+        self._show_candidates([])
+
+    def _add_order(self, data, pending_key):
+        """
+        주문 1건 추가: 조회/저널 기록은 작업 스레드에서 하고 화면에는 결과만 반영
+        pending_key: add_item에서 미리 중복 감지 색인에 넣어 둔 주문 (기록이 끝나거나 실패하면 뺌)
+        """
+        def on_done(entries):
+            self.processor.forget_orders([pending_key])
+            self.order_view.append(entries)
+
+        def on_error(e):
+            self.processor.forget_orders([pending_key])
+            messagebox.showerror("추가 오류", f"주문을 대기 리스트에 기록하지 못했습니다: {e}")
+
+        self.tasks.submit(WORK_LANE, self._record_order, data, on_done=on_done, on_error=on_error)
+
+    def _record_order(self, data):
+        """(작업 스레드) 입력 데이터 1건을 본품+사은품 행으로 펼쳐 저널에 기록하고 (id, 엑셀 행, 표시 값) 목록을 반환"""
         # 바코드를 바탕으로 해당 제품(본품+사은품) 조회
         products = self.processor.lookup_product_by_barcode(data["barcode"])
         
         items_to_add = products if products else [{'type': '수기', 'product_name': '알수없음', 'barcode': data["barcode"]}]
-             
+        # 우편번호는 주소 DB(postal_codes.db)가 있을 때 주소로 찾아 채움
+        postal_code = self.processor.postal_code(data["address"])
+        
+        rows = []
         for item in items_to_add:
             row_data = data.copy()
-            row_data["product_name"] = item["product_name"]
-            row_data["barcode"] = item["barcode"]
-            
-            # Treeview 표시 포맷 반영 (엑셀 컬럼과 얼버무려서 화면용으로만)
-            values = (
-                row_data["orderer"], row_data["address"], row_data["mobile"],
-                item["barcode"], item["product_name"], row_data["qty"],
-                row_data["memo"], item["type"]
-            )
             
             # 엑셀 헤더: [거래처명, 주문번호, 주문인, 수취인, 전화번호, 핸드폰, 우편번호, 주소, 바코드, 제품명, 사은품, 수량, 수수료, 배송비, 배송메모]
             # 내부 저장용 Data 구성
@@ -221,7 +477,7 @@ class OrderApp:
                 "수취인": row_data["mid_recipient"],
                 "전화번호": row_data["phone"],
                 "핸드폰": row_data["mobile"],
-                "우편번호": "",
+                "우편번호": postal_code,
                 "주소": row_data["address"],
                 "바코드": item["barcode"],
                 "제품명": item["product_name"],
@@ -231,36 +487,149 @@ class OrderApp:
                 "배송비": row_data["ship_fee"],
                 "배송메모": row_data["memo"]
             }
+            # Treeview 표시 포맷 반영 (엑셀 컬럼과 얼버무려서 화면용으로만)
+            rows.append((excel_data, display_values(excel_data, item["type"])))
             
-            self.order_list.append(excel_data)
-            self.tree.insert("", "end", values=values)
-            
-        # 추가 성공 시 입력창 깨끗하게 비우기 (반복 작업 편의성)
-        self.entries["barcode"].delete(0, 'end')
-        self.entries["product_hint"].delete(0, 'end')
+        # 본품+사은품 행을 한 트랜잭션으로 저널에 먼저 기록한 뒤 화면에 반영
+        ids = self.journal.add(rows)
+        self.processor.remember_orders(excel_data for excel_data, _ in rows)
+        return [(row_id, excel_data, values) for row_id, (excel_data, values) in zip(ids, rows)]
 
     def remove_item(self, event=None):
         """Treeview 선택 삭제"""
-        selected = self.tree.selection()
+        selected = self.order_view.selected_ids()
         if not selected: return
         
-        # 뒤에서부터 삭제하여 인덱스 꼬임 방지
-        for s in reversed(selected):
-            idx = self.tree.index(s)
-            del self.order_list[idx]
-            self.tree.delete(s)
+        if self._saving_ids.intersection(selected):
+             messagebox.showinfo("저장 중", "저장 중인 행은 저장이 끝난 뒤에 삭제할 수 있습니다.")
+             return
+        
+        # 선택한 행은 id로 바로 찾아 저널/목록/화면에서 한 번에 삭제
+        self.journal.remove(selected)
+        self.processor.forget_orders(self.order_view.remove(selected))
+
+    def import_partner_orders(self):
+        """거래처 주문서(엑셀/CSV)를 매핑 프로필대로 읽어 대기 리스트에 한 번에 추가"""
+        path = filedialog.askopenfilename(
+            title="거래처 주문서 선택",
+            filetypes=[("주문서", "*.xlsx *.xls *.xlsb *.csv"), ("모든 파일", "*.*")])
+        if not path: return
+        
+        profiles = list_profiles()
+        if not profiles:
+             messagebox.showwarning("프로필 없음", f"'{DEFAULT_PROFILE_DIR}' 폴더에 거래처 매핑 프로필(.json)이 없습니다.\n"
+                                    "README의 '거래처 주문서 가져오기' 항목을 참고해 만들어주세요.")
+             return
+             
+        # 파일 이름으로 프로필을 고르고, 맞는 것이 없으면 이름을 물어봄
+        profile = match_profile(path, profiles)
+        if profile is None:
+             names = [p.name for p in profiles]
+             name = simpledialog.askstring("프로필 선택", "사용할 매핑 프로필 이름:\n" + "\n".join(names), parent=self.root)
+             profile = next((p for p in profiles if p.name == (name or "").strip()), None)
+             if profile is None: return
+             
+        self.status_var.set(f"📂 {profile.name} 주문서 읽는 중...")
+        self.tasks.submit(WORK_LANE, self._run_import, path, profile, on_done=self._on_imported,
+                          on_error=lambda e: messagebox.showerror("가져오기 오류", f"주문서를 가져오지 못했습니다: {e}"))
+
+    def _run_import(self, path, profile):
+        """(작업 스레드) 주문서를 읽어 한 트랜잭션으로 저널에 기록하고 (성공 여부, 메시지, 목록 행) 반환"""
+        success, msg, result = self.processor.import_orders(path, profile)
+        if not success:
+             return success, msg, []
+        duplicates = sum(1 for excel_data, _ in result.rows if self.processor.find_duplicate(excel_data))
+        if duplicates:
+             msg += f"\n이미 있는 주문과 같은 행 {duplicates}행 (목록에서 확인 후 삭제해주세요)"
+        ids = self.journal.add(result.rows)
+        self.processor.remember_orders(excel_data for excel_data, _ in result.rows)
+        return True, msg, [(row_id, excel_data, values) for row_id, (excel_data, values) in zip(ids, result.rows)]
+
+    def _on_imported(self, result):
+        success, msg, entries = result
+        if not success:
+             self.status_var.set("⚠ 주문서를 가져오지 못했습니다.")
+             messagebox.showerror("가져오기 오류", msg)
+             return
+        self.order_view.append(entries)
+        self.status_var.set(f"📂 {len(entries)}행을 대기 리스트에 추가했습니다. (대기 리스트 {len(self.orders)}행)")
+        messagebox.showinfo("가져오기 완료", msg)
 
     def export_to_excel(self):
-        answer = messagebox.askyesno("저장", f"{len(self.order_list)}건의 데이터를 엑셀 제일 아래에 추가합니다.\n진행하시겠습니까?")
-        if not answer: return
+        if self._save_task is not None:
+             messagebox.showinfo("저장 중", "이전 저장이 아직 진행 중입니다. 끝난 뒤 다시 시도해주세요.")
+             return
+             
+        # 저널에 아직 저장되지 않은 것으로 남아 있는 행만 보냄 (저장 실패 후 재시도 포함)
+        # 저장하는 동안 새로 추가한 주문은 이번 저장에 포함되지 않고 대기 리스트에 남음
+        ids = self.orders.ids()
+        orders = self.orders.orders(ids)
+        if not orders:
+             messagebox.showinfo("저장", "저장할 데이터가 없습니다.")
+             return
+             
+        if platform.system() != 'Windows':
+            # 엑셀(COM)이 없는 환경: .xlsx 파일에 직접 저장 (기존 파일이면 아래에 추가)
+            path = filedialog.asksaveasfilename(
+                title="발주내역 xlsx 저장", defaultextension=".xlsx",
+                filetypes=[("Excel 통합 문서", "*.xlsx")], confirmoverwrite=False)
+            if not path: return
+            target = path
+        else:
+            answer = messagebox.askyesno("저장", f"{len(orders)}건의 데이터를 엑셀 제일 아래에 추가합니다.\n진행하시겠습니까?")
+            if not answer: return
+            
+            target = self.processor.master_file_path
+
+        # 저장은 별도 스레드에서 실행하고, 그동안 다음 주문 입력/추가는 계속 가능
+        self._saving_ids = set(ids)
+        self._save_task = self.tasks.submit(
+            SAVE_LANE, self._run_save, ids, orders, target, with_task=True,
+            on_done=lambda result: self._on_saved(ids, *result),
+            on_error=lambda e: self._on_saved(ids, False, f"저장 오류: {e}"),
+            on_progress=self._on_save_progress)
+        self.save_progress.configure(value=0, maximum=len(orders))
+        self.btn_cancel_save.configure(state="normal")
+        self.btn_cancel_save.pack(side="right", padx=5)
+        self.save_progress.pack(side="right", padx=5)
+        self.status_var.set(f"💾 {len(orders)}건 저장 중... (저장하는 동안 다음 주문을 계속 입력할 수 있습니다)")
+
+    def _run_save(self, task, ids, orders, target):
+        """(저장 스레드) 저장 후 성공한 행을 바로 저널에 표시 (창을 닫는 중이어도 기록이 남도록)"""
+        if platform.system() != 'Windows':
+            success, msg = self.processor.export_orders_to_xlsx(orders, target, task.report, task.cancel_event)
+        else:
+            success, msg = self.processor.append_orders_to_excel(orders, task.report, task.cancel_event)
+        if success:
+            self.journal.mark_exported(ids, target)
+        return success, msg
+
+    def _on_save_progress(self, done, total):
+        self.save_progress.configure(value=done, maximum=total or max(done, 1))
+        self.status_var.set(f"💾 저장 중... {done}/{total or '?'}건")
+
+    def _cancel_save(self):
+        if self._save_task is not None:
+             self._save_task.cancel()
+             self.btn_cancel_save.configure(state="disabled")
+             self.status_var.set("⏹ 저장 취소 중... (기록하던 행을 되돌리는 중)")
+
+    def _on_saved(self, ids, success, msg):
+        """저장 작업 완료 (메인 스레드)"""
+        self._save_task = None
+        self._saving_ids = set()
+        self.save_progress.pack_forget()
+        self.btn_cancel_save.pack_forget()
         
-        success, msg = self.processor.append_orders_to_excel(self.order_list)
         if success:
+             # 저널에는 저장 스레드에서 이미 표시했으므로 대기 리스트에서만 제거
+             self.order_view.remove(ids)
+             self.status_var.set(f"✅ {len(ids)}건 저장 완료")
              messagebox.showinfo("저장 성공", msg)
-             # 리스트 초기화 여부?
-             self.tree.delete(*self.tree.get_children())
-             self.order_list.clear()
         else:
+             # 저장에 실패/취소한 행은 대기 리스트와 저널에 그대로 남아 다시 저장할 수 있음
+             msg += f"\n\n저장되지 않은 {len(ids)}건은 대기 리스트에 그대로 남아 있습니다."
+             self.status_var.set(f"⚠ 저장되지 않음 - 대기 리스트 {len(self.orders)}건")
              messagebox.showerror("저장 오류", msg)
 
 # --- 독립 실행 테스트용 ---
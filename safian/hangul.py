@@ -0,0 +1,42 @@
+"""
+한글 자모 분해 도구.
+
+완성형 음절(가~힣)을 초성/중성/종성 호환 자모로 풀어 씁니다.
+오타가 한 글자 안의 자모 하나에 그치면 분해한 문자열에서는 한 글자 차이가 되므로
+유사도 검색과 초성 검색의 기준 문자열로 사용합니다.
+"""
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+            "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+
+def _decompose_char(ch):
+    code = ord(ch) - HANGUL_BASE
+    jong = code % 28
+    jung = (code // 28) % 21
+    cho = code // 588
+    return CHOSUNG[cho] + JUNGSUNG[jung] + JONGSUNG[jong]
+
+
+# 음절 11,172자는 미리 풀어 둔 변환표로 한 번에 바꿈 (str.translate)
+_JAMO_TABLE = {c: _decompose_char(chr(c)) for c in range(HANGUL_BASE, HANGUL_LAST + 1)}
+_CHOSUNG_TABLE = {c: CHOSUNG[(c - HANGUL_BASE) // 588] for c in range(HANGUL_BASE, HANGUL_LAST + 1)}
+
+
+def is_syllable(ch):
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+
+def decompose(text):
+    """'티크' -> 'ㅌㅣㅋㅡ' (한글 외 문자는 그대로)"""
+    return text.translate(_JAMO_TABLE)
+
+
+def chosung(text):
+    """'듀얼픽스' -> 'ㄷㅇㅍㅅ' (한글 외 문자는 그대로)"""
+    return text.translate(_CHOSUNG_TABLE)
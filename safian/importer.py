@@ -0,0 +1,229 @@
+"""
+거래처 주문서(엑셀/CSV) 일괄 가져오기.
+
+거래처마다 컬럼 이름이 다르므로 거래처별 매핑 프로필(JSON)로 원본 컬럼 -> 발주내역 컬럼을 지정합니다.
+시트는 한 번에 읽고, 연락처/수량 정규화는 행마다 파싱하지 않고 컬럼 단위 연산으로 처리하며,
+바코드는 주문서에 나온 바코드 목록을 한 번에 조회한 뒤 주문과 한 번 조인(merge)해서 본품+사은품 행으로 펼칩니다.
+
+프로필 예 (import_profiles/베이비코.json):
+{
+  "name": "베이비코",
+  "file_pattern": "베이비코*",
+  "partner": "베이비코",
+  "sheet": 0,
+  "header_row": 0,
+  "columns": {
+    "주문번호": "주문번호",
+    "주문인": "주문자",
+    "수취인": "수령자",
+    "핸드폰": "수령자 연락처",
+    "주소": ["주소", "상세주소"],
+    "바코드": "바코드",
+    "제품명": "상품명",
+    "수량": "수량",
+    "배송메모": "배송메시지"
+  },
+  "defaults": {"배송비": "0"}
+}
+- columns의 값이 목록이면 여러 원본 컬럼을 공백으로 이어 붙입니다.
+- 바코드가 없거나 카탈로그에 없는 행은 제품명으로 찾고(같은 제품명은 한 번만 검색), 그래도 없으면 '수기' 행이 됩니다.
+"""
+import fnmatch
+import json
+import os
+from typing import NamedTuple
+
+import pandas as pd
+
+from safian.excel_sink import ORDER_COLUMNS
+from safian.listview import display_values
+
+DEFAULT_PROFILE_DIR = "import_profiles"
+
+_QTY_DIGITS = r'(\d+)'
+
+
+class ImportProfile(NamedTuple):
+    """거래처 주문서 컬럼 매핑 프로필"""
+    name: str
+    columns: dict              # 발주내역 컬럼 -> 원본 컬럼 이름 (또는 이름 목록)
+    partner: str = ""          # 거래처명 칸에 넣을 값 (원본에 거래처명 컬럼이 없을 때)
+    sheet: object = 0          # 시트 이름 또는 순서
+    header_row: int = 0        # 헤더가 있는 행 (0부터)
+    file_pattern: str = ""     # 이 프로필을 자동 선택할 파일 이름 패턴
+    defaults: dict = None      # 값이 비었을 때 채울 기본값 (발주내역 컬럼 -> 값)
+
+
+class ImportResult(NamedTuple):
+    """가져오기 결과"""
+    rows: list         # [(발주내역 행 dict, 화면 표시 값), ...] (본품+사은품으로 펼친 행)
+    orders: int        # 원본 주문 행 수
+    unresolved: list   # 바코드를 찾지 못한 원본 행 번호 (엑셀 행 번호 기준)
+
+
+def load_profile(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for field in ("columns", "defaults"):
+        unknown = set(data.get(field) or {}) - set(ORDER_COLUMNS)
+        if unknown:
+            raise ValueError(f"{field}: 발주내역에 없는 컬럼: {', '.join(sorted(unknown))}")
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return ImportProfile(**{key: data[key] for key in ImportProfile._fields if key in data})
+
+
+def save_profile(profile, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile._asdict(), f, ensure_ascii=False, indent=2)
+
+
+def list_profiles(directory=DEFAULT_PROFILE_DIR):
+    """프로필 폴더의 모든 프로필 (읽을 수 없는 파일은 건너뜀)"""
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.lower().endswith(".json"):
+            try:
+                profiles.append(load_profile(os.path.join(directory, filename)))
+            except (OSError, ValueError, TypeError):
+                continue
+    return profiles
+
+
+def match_profile(path, profiles):
+    """파일 이름이 file_pattern에 맞는 첫 번째 프로필 (없으면 None)"""
+    filename = os.path.basename(path)
+    for profile in profiles:
+        if profile.file_pattern and fnmatch.fnmatch(filename, profile.file_pattern):
+            return profile
+    return None
+
+
+def read_sheet(path, profile):
+    """주문서 시트를 문자열 DataFrame으로 한 번에 읽음 (매핑에 쓰는 컬럼만)"""
+    wanted = set()
+    for source in profile.columns.values():
+        wanted.update([source] if isinstance(source, str) else source)
+    usecols = lambda c: str(c).strip() in wanted
+    if str(path).lower().endswith(".csv"):
+        df = pd.read_csv(path, header=profile.header_row, dtype=str, usecols=usecols, encoding="utf-8-sig")
+    else:
+        engine = 'pyxlsb' if str(path).lower().endswith('.xlsb') else None
+        df = pd.read_excel(path, sheet_name=profile.sheet, engine=engine, header=profile.header_row, dtype=str,
+                           usecols=usecols)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def map_columns(df, profile):
+    """원본 DataFrame -> 발주내역 컬럼 DataFrame (모든 값은 앞뒤 공백 없는 문자열)"""
+    out = pd.DataFrame(index=df.index)
+    for column in ORDER_COLUMNS:
+        source = profile.columns.get(column)
+        if source is None:
+            out[column] = ""
+            continue
+        sources = [source] if isinstance(source, str) else list(source)
+        parts = [df[s].fillna("").str.strip() if s in df.columns else pd.Series("", index=df.index) for s in sources]
+        value = parts[0]
+        for part in parts[1:]:
+            value = (value + " " + part).str.strip()
+        out[column] = value
+    if profile.partner:
+        out["거래처명"] = out["거래처명"].mask(out["거래처명"] == "", profile.partner)
+    for column, default in (profile.defaults or {}).items():
+        out[column] = out[column].mask(out[column] == "", str(default))
+    return out
+
+
+def normalize_phones(series):
+    """숫자만 남겨 11자리는 010-1234-5678, 10자리는 011-123-4567 형식으로 (그 외는 원문 그대로)"""
+    digits = series.str.replace(r'\D', '', regex=True)
+    length = digits.str.len()
+    eleven = digits.str[:3] + "-" + digits.str[3:7] + "-" + digits.str[7:]
+    ten = digits.str[:3] + "-" + digits.str[3:6] + "-" + digits.str[6:]
+    return eleven.where(length == 11, ten.where(length == 10, series))
+
+
+def normalize_quantities(series):
+    """'2개', '3 박스' -> '2', '3' (숫자가 없으면 1)"""
+    return series.str.extract(_QTY_DIGITS, expand=False).str.lstrip("0").replace("", pd.NA).fillna("1")
+
+
+def _item_records(expanded):
+    """
+    {주문서 바코드: 본품+사은품 목록} -> DataFrame[key, seq, 타입, 제품명_cat, 바코드_cat]
+    (lookup_products_by_barcodes가 돌려주는 [{'type', 'product_name', 'barcode'}, ...] 형식)
+    """
+    records = [(barcode, seq, item['type'], item['product_name'], item['barcode'])
+               for barcode, items in expanded.items() for seq, item in enumerate(items)]
+    items = pd.DataFrame.from_records(records, columns=["key", "seq", "타입", "제품명_cat", "바코드_cat"])
+    return items.astype({"key": object, "seq": int})
+
+
+def resolve_orders(orders, lookup_barcodes=None, resolve_names=None):
+    """
+    정규화된 주문 DataFrame의 바코드를 본품+사은품 목록과 조인하여 행으로 펼칩니다.
+    lookup_barcodes([바코드, ...]) -> [본품+사은품 목록, ...]: 바코드를 한 번에 조회하는 함수
+        (OrderProcessor.lookup_products_by_barcodes. None이면 모든 행을 '수기'로)
+    resolve_names([제품명, ...]) -> [바코드 또는 None, ...]: 바코드가 없거나 카탈로그에 없는 행을 제품명으로 한 번에 찾는 함수
+    반환값: (펼친 DataFrame, 바코드를 찾지 못한 주문의 index 목록)
+    """
+    orders = orders.copy()
+    orders["key"] = orders["바코드"]
+    expanded = {}
+    if lookup_barcodes is not None:
+        # 주문서에 나온 바코드는 종류별로 한 번만 조회
+        barcodes = [barcode for barcode in orders["key"].unique().tolist() if barcode]
+        expanded = {barcode: items for barcode, items in zip(barcodes, lookup_barcodes(barcodes)) if items}
+        known = orders["key"].isin(expanded.keys())
+        if resolve_names is not None:
+            # 바코드로 못 찾은 행은 제품명으로 찾되, 같은 제품명은 한 번만 검색
+            names = orders.loc[~known & (orders["제품명"] != ""), "제품명"].unique().tolist()
+            found = dict(zip(names, resolve_names(names)))
+            by_name = orders["제품명"].map(found)
+            fill = ~known & by_name.notna() & (by_name != "")
+            orders.loc[fill, "key"] = by_name[fill]
+            extra = [barcode for barcode in set(by_name[fill]) if barcode not in expanded]
+            expanded.update((barcode, items) for barcode, items in zip(extra, lookup_barcodes(extra)) if items)
+    items = _item_records(expanded)
+
+    orders["_order"] = range(len(orders))
+    merged = orders.merge(items, on="key", how="left")
+    unresolved_mask = merged["타입"].isna()
+    unresolved = merged.loc[unresolved_mask, "_order"].tolist()
+
+    # 카탈로그에 없으면 입력한 바코드/제품명 그대로 '수기' 행
+    merged["seq"] = merged["seq"].fillna(0)
+    merged["타입"] = merged["타입"].fillna("수기")
+    merged["바코드"] = merged["바코드_cat"].fillna(merged["바코드"])
+    merged["제품명"] = merged["제품명_cat"].where(merged["제품명_cat"].notna(),
+                                              merged["제품명"].mask(merged["제품명"] == "", "알수없음"))
+    merged = merged.sort_values(["_order", "seq"], kind="stable")
+    return merged, [orders.index[i] for i in unresolved]
+
+
+def import_orders(path, profile, lookup_barcodes=None, resolve_names=None):
+    """
+    거래처 주문서를 읽어 대기 리스트에 넣을 행 목록(ImportResult)을 만듭니다.
+    lookup_barcodes/resolve_names는 resolve_orders 참고 (OrderProcessor.import_orders가 넘겨줌)
+    """
+    raw = read_sheet(path, profile)
+    orders = map_columns(raw, profile)
+    del raw
+    # 빈 줄(연락처/주소/바코드/제품명이 모두 비어 있는 행)은 제외
+    orders = orders[(orders[["핸드폰", "전화번호", "주소", "바코드", "제품명"]] != "").any(axis=1)]
+
+    orders["핸드폰"] = normalize_phones(orders["핸드폰"])
+    orders["전화번호"] = normalize_phones(orders["전화번호"])
+    orders["수량"] = normalize_quantities(orders["수량"])
+
+    expanded, unresolved = resolve_orders(orders, lookup_barcodes, resolve_names)
+    rows = []
+    for record, item_type in zip(expanded[ORDER_COLUMNS].to_dict("records"), expanded["타입"]):
+        rows.append((record, display_values(record, item_type)))
+    # 엑셀 행 번호 = DataFrame index + 헤더 행 + 2 (헤더 1줄, 1부터 시작)
+    first_row = profile.header_row + 2
+    return ImportResult(rows, len(orders), [int(i) + first_row for i in unresolved])
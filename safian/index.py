@@ -0,0 +1,139 @@
+from array import array
+
+# 후보를 좁힐 때 교집합할 최대 게시목록 수, 교집합을 그만둘 후보 수, 교집합할 게시목록 길이의 상한(후보 수의 배수)
+INTERSECT_POSTINGS = 3
+INTERSECT_MIN = 16
+INTERSECT_RATIO = 8
+
+
+class NgramIndex:
+    """
+    제품명 검색용 문자 n-gram 역색인.
+    '코드' 시트를 매번 iterrows로 훑지 않도록 로드 시 한 번만 만들어 두고,
+    힌트가 들어오면 후보 행 몇 개만 골라 포함관계를 확인합니다.
+
+    - 힌트가 제품명에 포함되는 경우: 힌트의 3-gram 중 가장 드문 것들의 게시목록을 교집합한 후보만 확인
+    - 제품명이 힌트에 포함되는 경우: 힌트의 부분문자열을 정규화된 제품명 사전에서 직접 조회
+    2-gram은 제품명이 많아지면 가장 드문 것도 수천 행에 나오므로 3-gram으로 색인합니다.
+    """
+
+    def __init__(self, names, n=3):
+        self.n = n
+        self.names = [self.normalize(name) for name in names]
+        self._postings = {}
+        self._exact = {}
+        self._max_len = 0
+
+        for pos, name in enumerate(self.names):
+            # 동일한 제품명은 첫 번째 행만 기억 (기존 "첫 번째 일치" 규칙과 동일)
+            self._exact.setdefault(name, pos)
+            if len(name) > self._max_len:
+                self._max_len = len(name)
+            for gram in self._grams(name):
+                self._postings.setdefault(gram, []).append(pos)
+
+        # 게시목록은 int 객체 목록 대신 4바이트 정수 배열로 보관 (메모리 절약)
+        self._postings = {gram: array('i', posting) for gram, posting in self._postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def normalize(text):
+        """매칭 확률을 높이기 위해 공백 제거 (기존 검색 로직과 동일한 정규화)"""
+        return str(text).replace(" ", "")
+
+    def _grams(self, text):
+        n = self.n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _containing(self, hint):
+        """힌트를 포함하는 제품명 위치"""
+        if len(hint) < self.n:
+            # n보다 짧은 힌트는 색인으로 좁힐 수 없으므로 직접 확인
+            return [pos for pos, name in enumerate(self.names) if hint in name]
+
+        postings = []
+        for gram in self._grams(hint):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+
+        # 가장 드문 n-gram의 후보를 다음으로 드문 게시목록들과 교집합한 뒤 실제 포함 여부 확인
+        # (다음 게시목록이 후보보다 훨씬 길면 교집합보다 포함 여부를 바로 확인하는 편이 빠름)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:INTERSECT_POSTINGS]:
+            if len(candidates) <= INTERSECT_MIN or len(posting) > INTERSECT_RATIO * len(candidates):
+                break
+            candidates = set(candidates).intersection(posting)
+        names = self.names
+        return [pos for pos in candidates if hint in names[pos]]
+
+    def _contained(self, hint):
+        """힌트 안에 통째로 들어있는 제품명 위치"""
+        found = []
+        max_len = min(len(hint), self._max_len)
+        for length in range(max_len + 1):
+            for start in range(len(hint) - length + 1):
+                pos = self._exact.get(hint[start:start + length])
+                if pos is not None:
+                    found.append(pos)
+        return found
+
+    def matches(self, hint):
+        """
+        포함관계가 성립하는 모든 행 위치 (원본 행 순서)
+        공백뿐인 힌트는 모든 제품명에 포함되므로 일치 없음으로 처리합니다. (first/best/일괄 조회 공통)
+        """
+        hint = self.normalize(hint)
+        if not self.names or not hint:
+            return []
+        return sorted(set(self._containing(hint)) | set(self._contained(hint)))
+
+    def first(self, hint):
+        """기존 iterrows 검색과 동일한 '첫 번째 일치' 행 위치"""
+        hint = self.normalize(hint)
+        if not hint:
+            return None
+        if len(hint) < self.n:
+            # 색인으로 좁힐 수 없는 짧은 힌트는 전체를 훑되 첫 번째로 포함하는 행에서 멈춤
+            first = next((pos for pos, name in enumerate(self.names) if hint in name), None)
+            found = self._contained(hint) + ([first] if first is not None else [])
+            return min(found) if found else None
+        found = self.matches(hint)
+        return found[0] if found else None
+
+    def first_many(self, hints):
+        """
+        힌트 목록의 '첫 번째 일치' 행 위치 목록 (입력 순서대로, 없으면 None).
+        정규화 후 같은 힌트는 한 번만 검색합니다.
+        """
+        return self._many(hints, self.first)
+
+    def best_many(self, hints):
+        """힌트 목록의 best() 결과 목록 (정규화 후 같은 힌트는 한 번만 검색)"""
+        return self._many(hints, self.best)
+
+    def _many(self, hints, lookup):
+        normalize = self.normalize
+        cache = {}
+        result = []
+        for hint in hints:
+            key = normalize(hint)
+            if key not in cache:
+                cache[key] = lookup(key)
+            result.append(cache[key])
+        return result
+
+    def best(self, hint):
+        """
+        길이가 힌트와 가장 비슷한(가장 구체적인) 일치 행 위치.
+        길이 차이가 같으면 앞쪽 행을 우선합니다.
+        """
+        hint = self.normalize(hint)
+        found = self.matches(hint)
+        if not found:
+            return None
+        return min(found, key=lambda pos: (abs(len(self.names[pos]) - len(hint)), pos))
@@ -0,0 +1,116 @@
+"""
+저장 대기 중인 주문을 SQLite(WAL 모드)에 기록하는 주문 저널.
+
+입력한 주문은 추가/삭제할 때마다 바로 디스크에 기록되므로 프로그램이 비정상 종료되어도
+다음 실행 시 그대로 복원됩니다. 엑셀 저장에 성공한 행은 저장 시각/대상과 함께 '저장됨'으로 표시하고,
+저장에 실패하면 아무 것도 표시하지 않으므로 다시 저장할 때는 아직 저장되지 않은 행만 보냅니다.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+
+DEFAULT_JOURNAL_PATH = "order_queue.db"
+
+# 저장 완료된 행은 이 기간(초)이 지나면 정리
+EXPORTED_RETENTION = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,
+    display TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    exported_at REAL,
+    export_target TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_pending ON orders (exported_at, id);
+"""
+
+
+class JournalEntry(NamedTuple):
+    """저장 대기 주문 1행 (엑셀 행 데이터 + 화면 표시용 값)"""
+    id: int
+    data: dict
+    display: tuple
+
+
+class OrderJournal:
+    """저장 대기 주문 목록을 영속화하는 SQLite 저널 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # 자동 커밋 모드로 열고 여러 행을 바꾸는 작업만 명시적으로 트랜잭션으로 묶음
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + FULL: 커밋마다 WAL 파일을 fsync하여 전원이 나가도 추가한 주문이 남도록 함
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._purge_exported()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _purge_exported(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM orders WHERE exported_at < ?", (time.time() - EXPORTED_RETENTION,))
+
+    def add(self, rows):
+        """
+        (엑셀 행 dict, 화면 표시 값) 목록을 하나의 트랜잭션으로 기록하고 각 행의 id 목록을 반환합니다.
+        (주문 1건이 본품+사은품 여러 행으로 펼쳐지므로 함께 기록되거나 함께 빠지도록 함)
+        """
+        now = time.time()
+        ids = []
+        with self._transaction() as conn:
+            for data, display in rows:
+                cur = conn.execute(
+                    "INSERT INTO orders (data, display, created_at) VALUES (?, ?, ?)",
+                    (json.dumps(data, ensure_ascii=False), json.dumps(list(display), ensure_ascii=False), now))
+                ids.append(cur.lastrowid)
+        return ids
+
+    def remove(self, ids):
+        """대기 중인 행 삭제 (이미 저장된 행은 건드리지 않음)"""
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM orders WHERE id = ? AND exported_at IS NULL", [(i,) for i in ids])
+
+    def pending(self):
+        """아직 저장되지 않은 행을 입력 순서대로 반환"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, data, display FROM orders WHERE exported_at IS NULL ORDER BY id")
+            rows = cursor.fetchall()
+        return [JournalEntry(row_id, json.loads(data), tuple(json.loads(display))) for row_id, data, display in rows]
+
+    def mark_exported(self, ids, target=""):
+        """저장에 성공한 행을 저장 시각/대상과 함께 '저장됨'으로 표시"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE orders SET exported_at = ?, export_target = ? WHERE id = ? AND exported_at IS NULL",
+                [(now, target, i) for i in ids])
+
+    def last_export_target(self):
+        """가장 최근에 저장한 대상 파일 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT export_target FROM orders WHERE exported_at IS NOT NULL ORDER BY exported_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
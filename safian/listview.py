@@ -0,0 +1,215 @@
+"""
+발주 대기 리스트 화면 계층.
+
+- OrderListModel: 저널 id(고정 행 id) -> (엑셀 행 데이터, 화면 표시 값)과 표시 순서를 보관합니다.
+  추가/삭제는 여러 행을 한 번에 처리하고, 선택한 행은 id로 바로 찾으므로 Treeview 인덱스 조회가 필요 없습니다.
+- VirtualTreeview: Treeview에는 화면에 보이는 행만 넣고 스크롤바/휠/방향키로 보이는 구간을 옮깁니다.
+  대기 리스트가 수만 행이어도 Treeview 항목 수는 창 높이만큼이라 추가/삭제/스크롤이 느려지지 않습니다.
+"""
+from tkinter import ttk
+
+# 대기 리스트 화면 컬럼 (엑셀에 저장될 컬럼 중 확인용으로 보여줄 것만)
+DISPLAY_COLUMNS = ("주문인", "주소", "핸드폰", "바코드", "상품명", "수량", "배송메모", "타입")
+
+DEFAULT_ROW_HEIGHT = 20
+_SHIFT_MASK = 0x0001
+_CONTROL_MASK = 0x0004
+
+
+def display_values(order, item_type):
+    """발주내역 행 dict -> 대기 리스트 화면 값 (DISPLAY_COLUMNS 순서)"""
+    return (order["주문인"], order["주소"], order["핸드폰"], order["바코드"], order["제품명"], order["수량"],
+            order["배송메모"], item_type)
+
+
+class OrderListModel:
+    """대기 리스트 데이터 (표시 순서 + id -> 행)"""
+
+    def __init__(self):
+        self._order = []   # 표시 순서대로의 행 id
+        self._rows = {}    # 행 id -> (엑셀 행 dict, 화면 표시 값)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, row_id):
+        return row_id in self._rows
+
+    def extend(self, entries):
+        """(id, 엑셀 행 dict, 화면 표시 값) 목록을 끝에 추가"""
+        rows = self._rows
+        for row_id, data, display in entries:
+            rows[row_id] = (data, display)
+            self._order.append(row_id)
+
+    def remove(self, ids):
+        """여러 행을 한 번에 삭제하고, 삭제한 행의 엑셀 행 dict 목록을 반환"""
+        rows = self._rows
+        removed = [rows.pop(row_id)[0] for row_id in ids if row_id in rows]
+        if removed:
+            # 삭제할 행 수와 상관없이 순서 목록은 한 번만 다시 만듦
+            self._order = [row_id for row_id in self._order if row_id in rows]
+        return removed
+
+    def ids(self):
+        return list(self._order)
+
+    def orders(self, ids=None):
+        """엑셀 행 dict 목록 (ids를 주면 그 행들만, 표시 순서대로)"""
+        rows = self._rows
+        if ids is None:
+            return [rows[row_id][0] for row_id in self._order]
+        return [rows[row_id][0] for row_id in ids if row_id in rows]
+
+    def id_at(self, pos):
+        return self._order[pos]
+
+    def window(self, start, count):
+        """표시 순서 start부터 count개의 (id, 화면 표시 값)"""
+        rows = self._rows
+        return [(row_id, rows[row_id][1]) for row_id in self._order[start:start + count]]
+
+
+class VirtualTreeview(ttk.Frame):
+    """보이는 구간의 행만 Treeview에 넣는 가상 스크롤 목록"""
+
+    def __init__(self, master, model, columns, widths=None, row_height=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="extended")
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=(widths or {}).get(col, 100), anchor="center")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        if row_height is None:
+            row_height = ttk.Style().lookup("Treeview", "rowheight")
+        self.row_height = int(row_height or DEFAULT_ROW_HEIGHT)
+        self.top = 0           # 화면 맨 위 행의 표시 순서
+        self.visible_rows = 10
+        self.selected = set()  # 선택된 행 id (화면 밖으로 스크롤된 행 포함)
+        self._shown = []       # 지금 Treeview에 들어 있는 행 id
+        self._render_pending = False
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<ButtonPress-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move(-1, e))
+        self.tree.bind("<Down>", lambda e: self._move(1, e))
+        self.tree.bind("<Prior>", lambda e: self._move(-self.visible_rows, e))
+        self.tree.bind("<Next>", lambda e: self._move(self.visible_rows, e))
+
+    # ------------------ 데이터 변경 ------------------ #
+    def append(self, entries):
+        """(id, 엑셀 행 dict, 화면 표시 값) 목록을 추가하고 마지막 행이 보이도록 스크롤"""
+        self.model.extend(entries)
+        self.top = max(0, len(self.model) - self.visible_rows)
+        self.refresh()
+
+    def remove(self, ids):
+        """행 id 목록을 한 번에 삭제하고 삭제한 엑셀 행 dict 목록을 반환"""
+        removed = self.model.remove(ids)
+        self.selected.difference_update(ids)
+        self.refresh()
+        return removed
+
+    def selected_ids(self):
+        """선택된 행 id (표시 순서대로)"""
+        return [row_id for row_id in self.model.ids() if row_id in self.selected]
+
+    # ------------------ 그리기 ------------------ #
+    def refresh(self):
+        """다음 유휴 시점에 한 번만 다시 그림 (연속 호출은 합쳐짐)"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        total = len(self.model)
+        self.top = max(0, min(self.top, total - self.visible_rows))
+        window = self.model.window(self.top, self.visible_rows)
+
+        tree = self.tree
+        if self._shown:
+            tree.delete(*self._shown)
+        for row_id, values in window:
+            tree.insert("", "end", iid=row_id, values=values)
+        self._shown = [row_id for row_id, _ in window]
+        visible_selected = [row_id for row_id in self._shown if row_id in self.selected]
+        tree.selection_set(visible_selected)
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + len(window)) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_resize(self, event):
+        # 헤더 한 줄을 빼고 창 높이에 들어가는 행 수
+        rows = max(1, event.height // self.row_height - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+
+    # ------------------ 스크롤 ------------------ #
+    def scroll(self, delta):
+        self.top += delta
+        self.refresh()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.model))
+            self.refresh()
+        elif unit == "pages":
+            self.scroll(int(amount) * self.visible_rows)
+        else:
+            self.scroll(int(amount))
+
+    def _on_wheel(self, event):
+        # 윈도우는 한 칸에 delta 120, macOS는 작은 값
+        steps = -(event.delta // 120) if abs(event.delta) >= 120 else -event.delta
+        return self.scroll(steps * 3)
+
+    # ------------------ 선택 ------------------ #
+    def _on_click(self, event):
+        # Ctrl/Shift 없이 클릭하면 화면 밖에서 선택해 둔 행도 선택 해제
+        if not event.state & (_SHIFT_MASK | _CONTROL_MASK):
+            self.selected.clear()
+
+    def _on_select(self, event=None):
+        shown = set(self._shown)
+        self.selected.difference_update(shown)
+        self.selected.update(row_id for row_id in map(int, self.tree.selection()) if row_id in shown)
+
+    def _move(self, delta, event):
+        """방향키/PageUp/PageDown: 보이는 구간 끝에서는 목록을 스크롤하며 이동"""
+        total = len(self.model)
+        if not total:
+            return "break"
+        focus = self.tree.focus()
+        current = self.top
+        if focus and int(focus) in self._shown:
+            current = self.top + self._shown.index(int(focus))
+        target = max(0, min(total - 1, current + delta))
+        if target < self.top:
+            self.top = target
+        elif target >= self.top + self.visible_rows:
+            self.top = target - self.visible_rows + 1
+
+        row_id = self.model.id_at(target)
+        if not event.state & _SHIFT_MASK:
+            self.selected.clear()
+        self.selected.add(row_id)
+        self._render_pending = False
+        self._render()
+        self.tree.focus(row_id)
+        self.tree.see(row_id)
+        return "break"
@@ -0,0 +1,111 @@
+"""
+비동기(큐) 로그 기록.
+
+호출하는 쪽은 큐에 메시지만 넣고, 파일 쓰기는 백그라운드 리스너 스레드 하나가 맡습니다.
+debug.log는 크기가 정해진 값을 넘으면 debug.log.1, .2 ...로 돌려가며 보관합니다.
+일괄 처리의 워커 프로세스는 파일을 직접 열지 않고 부모 프로세스의 리스너로 로그를 보냅니다.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOGGER_NAME = "safian"
+DEFAULT_LOG_PATH = "debug.log"
+LOG_FORMAT = "%(asctime)s.%(msecs)03d: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_lock = threading.Lock()
+_listener = None
+_listener_pid = None
+
+
+def get_logger(name=None):
+    """safian 로거 (또는 그 하위 로거)"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def setup_logging(path=DEFAULT_LOG_PATH, level=logging.INFO, max_bytes=5 * 1024 * 1024, backup_count=3):
+    """
+    safian 로거에 큐 핸들러를 붙이고 파일 기록용 리스너 스레드를 시작합니다.
+    이미 설정되어 있으면 아무것도 하지 않습니다. (여러 OrderProcessor가 호출해도 한 번만 설정)
+    """
+    global _listener, _listener_pid
+    with _lock:
+        if _listener_pid == os.getpid():
+            return
+        # fork로 만든 프로세스: 부모의 리스너 스레드는 따라오지 않으므로 새로 설정
+        _remove_queue_handlers()
+        file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                           encoding="utf-8", delay=True)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        logger = get_logger()
+        logger.setLevel(level)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.propagate = False
+
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener_pid = os.getpid()
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def worker_log_queue(mp_context=None):
+    """
+    워커 프로세스의 로그를 받아 이 프로세스의 로거로 넘기는 큐와 리스너를 만듭니다.
+    여러 프로세스가 같은 debug.log를 각자 열어 돌려쓰면 기록이 섞이거나 사라지므로,
+    파일에는 이 프로세스의 리스너만 씁니다. 반환값: (큐, 리스너) - 워커가 모두 끝난 뒤 리스너.stop()
+    mp_context: 워커를 만드는 multiprocessing 컨텍스트 (다른 방식의 컨텍스트로 만든 큐는 워커에서 쓸 수 없음)
+    """
+    log_queue = (mp_context or multiprocessing).Queue()
+    listener = QueueListener(log_queue, _ForwardHandler())
+    listener.start()
+    return log_queue, listener
+
+
+def setup_worker_logging(log_queue, level=logging.INFO):
+    """워커 프로세스용 setup_logging: 파일 대신 worker_log_queue()의 큐로 로그를 보냅니다."""
+    global _listener, _listener_pid
+    with _lock:
+        _remove_queue_handlers()
+        logger = get_logger()
+        logger.setLevel(level)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.propagate = False
+        # 이후 OrderProcessor가 부르는 setup_logging은 아무것도 하지 않음
+        _listener = None
+        _listener_pid = os.getpid()
+
+
+class _ForwardHandler(logging.Handler):
+    """워커에서 온 로그 레코드를 같은 이름의 로거로 다시 보냄 (이 프로세스의 debug.log에 기록)"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def shutdown_logging():
+    """남은 로그를 모두 파일에 쓰고 리스너를 멈춥니다. (프로그램 종료 시 자동 호출)"""
+    global _listener, _listener_pid
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is None:
+            return
+        if _listener_pid == os.getpid():
+            listener.stop()
+        _listener_pid = None
+        _remove_queue_handlers()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _remove_queue_handlers():
+    logger = get_logger()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
@@ -0,0 +1,182 @@
+"""
+처리 단계별 소요시간/횟수 집계.
+
+    with span("match"):
+        ...
+
+    @timed("parse")
+    def parse_order_text(...): ...
+
+단계마다 호출 횟수, 누적 시간, 지연시간 히스토그램(버킷)을 모아 두었다가
+dump_metrics(경로)로 JSON 또는 Prometheus 텍스트 형식 파일에 기록합니다.
+"""
+import functools
+import json
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+METRIC_PREFIX = "safian_"
+
+# 지연시간 버킷 상한 (초). 조회는 수십 마이크로초, 저장/로드는 수 초까지 나옴
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """버킷별 관측 횟수와 합계/최대값"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """버킷 상한 기준의 근사 백분위 (q: 0~1)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        cumulative, seen = {}, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            cumulative[repr(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class MetricsRegistry:
+    """카운터와 히스토그램 모음 (여러 스레드에서 동시에 기록해도 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def span(self, name):
+        """블록 실행 시간을 name 히스토그램에 기록 (예외가 나면 name_errors 카운터 증가)"""
+        return _Span(self, name)
+
+    def timed(self, name):
+        """함수 실행 시간을 기록하는 데코레이터"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                except BaseException:
+                    self.inc(f"{name}_errors")
+                    raise
+                finally:
+                    self.observe(name, perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "spans": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = f"{METRIC_PREFIX}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                seen = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    seen += n
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {seen}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum {h.sum:.6f}")
+                lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """확장자가 .prom/.txt이면 Prometheus 텍스트, 그 외에는 JSON으로 기록"""
+        if path.lower().endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+class _Span:
+    """with 블록 시간 측정 (조회 경로에서 쓰이므로 제너레이터 기반 contextmanager 대신 가벼운 클래스)"""
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.registry.inc(f"{self.name}_errors")
+        self.registry.observe(self.name, perf_counter() - self.start)
+        return False
+
+
+# 프로세스 전체에서 공유하는 기본 집계
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+span = REGISTRY.span
+timed = REGISTRY.timed
+dump_metrics = REGISTRY.dump
@@ -0,0 +1,253 @@
+"""
+도로명주소 -> 우편번호(기초구역번호) 조회.
+
+주소 DB 원본(도로명주소 한글 전체분 .txt 또는 헤더가 있는 .csv)은 수백만 행이라 매번 메모리에 올리지 않고
+한 번만 SQLite 파일로 변환해 둡니다. 테이블은 (도로명, 건물본번, 건물부번) 순서의 기본키로 정렬 저장되므로
+조회는 B-tree 탐색 한 번이고, 같은 주소를 반복 조회하면 정규화된 주소 단위 캐시에서 바로 꺼냅니다.
+
+    python -m safian postal 도로명주소_원본폴더/ -o postal_codes.db
+
+- 같은 도로명이 여러 시/군/구에 있으면 주소 앞부분의 시도/시군구로 좁힙니다.
+- 지번 주소(OO동 123-4)나 도로명을 찾지 못한 주소는 빈 문자열을 반환합니다.
+"""
+import csv
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_POSTAL_DB = "postal_codes.db"
+
+# 정규화된 주소 단위 조회 결과 캐시 크기
+CACHE_SIZE = 4096
+
+# 도로명주소 한글 전체분(.txt, '|' 구분) 컬럼 위치 (0부터)
+JUSO_LAYOUT = {"sido": 2, "sigungu": 3, "road": 10, "underground": 11, "main": 12, "sub": 13, "zipcode": 16}
+# 헤더가 있는 .csv의 컬럼 이름
+CSV_LAYOUT = {"sido": "시도명", "sigungu": "시군구명", "road": "도로명", "underground": "지하여부",
+              "main": "건물본번", "sub": "건물부번", "zipcode": "우편번호"}
+
+INSERT_BATCH = 50000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS addresses (
+    road TEXT NOT NULL,
+    main INTEGER NOT NULL,
+    sub INTEGER NOT NULL,
+    sido TEXT NOT NULL,
+    sigungu TEXT NOT NULL,
+    zipcode TEXT NOT NULL,
+    PRIMARY KEY (road, main, sub, sido, sigungu)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# '테헤란로 152', '세종대로23길 47', '논현로 28길 5', '중앙로12번길 3-1', '올림픽로 지하 240'
+_ROAD_PATTERN = re.compile(
+    r'(?:^|\s)([가-힣A-Za-z0-9·]+(?:로|길))(?:\s*(\d+(?:번)?[가-힣]?길))?\s*(지하\s*)?(\d+)(?:\s*-\s*(\d+))?')
+_SPACES = re.compile(r'\s+')
+_SIDO_SUFFIX = re.compile(r'(특별자치시|특별자치도|특별시|광역시|도|시)$')
+_SIGUNGU_SUFFIX = re.compile(r'(시|군|구)$')
+
+
+def road_key(road):
+    """도로명 비교용 키 (공백 제거)"""
+    return _SPACES.sub('', road or '')
+
+
+def sido_key(name):
+    """시도명 비교용 약칭: 서울특별시/서울시/서울 -> 서울, 충청북도 -> 충북, 전북특별자치도 -> 전북"""
+    name = (name or '').strip()
+    if len(name) >= 4 and name[:2] in ("충청", "전라", "경상"):
+        return name[0] + name[2]
+    return _SIDO_SUFFIX.sub('', name)[:2] if len(name) > 2 else name
+
+
+def parse_road_address(address):
+    """
+    주소 문자열 -> (도로명 키, 건물본번, 건물부번, 도로명 앞의 지역 단어 목록). 도로명이 없으면 None
+    예: "경기 성남시 분당구 판교역로 235 에이치스퀘어" -> ("판교역로", 235, 0, ["경기", "성남시", "분당구"])
+    """
+    match = _ROAD_PATTERN.search(address or '')
+    if not match:
+        return None
+    road = match.group(1) + (match.group(2) or '')
+    if match.group(3):
+        road += "지하"
+    region = address[:match.start(1)].split()
+    return road_key(road), int(match.group(4)), int(match.group(5) or 0), region
+
+
+def _region_score(sido, sigungu, region):
+    """후보 주소의 시도/시군구가 입력 주소의 지역 단어와 얼마나 맞는지 (0~2)"""
+    score = 0
+    if region and sido_key(region[0]) == sido_key(sido):
+        score += 1
+    words = {_SIGUNGU_SUFFIX.sub('', word) for word in region if len(word) >= 2}
+    if any(_SIGUNGU_SUFFIX.sub('', part) in words for part in sigungu.split()):
+        score += 1
+    return score
+
+
+def _pick_zipcode(rows, region):
+    """(시도, 시군구, 우편번호) 후보 중 하나로 정해지는 우편번호 (정할 수 없으면 "")"""
+    if not rows:
+        return ""
+    zipcodes = {zipcode for _, _, zipcode in rows}
+    if len(zipcodes) == 1:
+        return zipcodes.pop()
+    # 같은 도로명이 여러 지역에 있으면 지역이 가장 잘 맞는 후보만 남김
+    scored = [(_region_score(sido, sigungu, region), zipcode) for sido, sigungu, zipcode in rows]
+    best = max(score for score, _ in scored)
+    zipcodes = {zipcode for score, zipcode in scored if score == best}
+    return zipcodes.pop() if best and len(zipcodes) == 1 else ""
+
+
+class PostalIndex:
+    """변환해 둔 SQLite 파일로 우편번호를 조회 (읽기 전용, 스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_POSTAL_DB, cache_size=CACHE_SIZE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True, check_same_thread=False)
+        # 정규화된 주소 -> 우편번호 캐시 (인스턴스마다 따로 둠)
+        self._cached_lookup = functools.lru_cache(maxsize=cache_size)(self._lookup)
+
+    def count(self):
+        """저장된 주소 수 (테이블 전체를 세므로 느림: 진리값 확인에 쓰지 않도록 __len__ 대신 메서드로 둠)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+
+    def postal_code(self, address):
+        """주소 -> 5자리 우편번호 (찾지 못하면 "")"""
+        if not address:
+            return ""
+        return self._cached_lookup(_SPACES.sub(' ', address).strip())
+
+    def cache_info(self):
+        return self._cached_lookup.cache_info()
+
+    def _lookup(self, address):
+        parsed = parse_road_address(address)
+        if parsed is None:
+            return ""
+        road, main, sub, region = parsed
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sido, sigungu, zipcode FROM addresses WHERE road = ? AND main = ? AND sub = ?",
+                (road, main, sub)).fetchall()
+            if not rows and sub == 0:
+                # 부번을 빼고 쓴 주소: 본번이 같은 건물들의 우편번호가 하나로 정해지면 사용
+                rows = self._conn.execute(
+                    "SELECT sido, sigungu, zipcode FROM addresses WHERE road = ? AND main = ?",
+                    (road, main)).fetchall()
+        return _pick_zipcode(rows, region)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _open_text(path):
+    """원본 텍스트 파일 열기 (공공데이터 원본은 보통 cp949, 직접 만든 csv는 utf-8)"""
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+    try:
+        head.decode("utf-8")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # 앞부분을 자르다 멀티바이트 문자 중간에서 끊긴 경우는 utf-8로 봄
+        encoding = "utf-8-sig" if e.start >= len(head) - 3 else "cp949"
+    return open(path, encoding=encoding, newline="")
+
+
+def _iter_source_rows(path):
+    """원본 파일 1개 -> (도로명 키, 본번, 부번, 시도, 시군구, 우편번호) 행 (한 줄씩 읽음)"""
+    with _open_text(path) as f:
+        first = f.readline()
+        if "|" in first:
+            layout = JUSO_LAYOUT
+            reader = csv.reader(f, delimiter="|", quoting=csv.QUOTE_NONE)
+            records = ([first.rstrip("\r\n").split("|")], reader)
+        else:
+            header = [name.strip() for name in next(csv.reader([first]))]
+            layout = {key: header.index(name) for key, name in CSV_LAYOUT.items() if name in header}
+            missing = {"road", "main", "zipcode"} - set(layout)
+            if missing:
+                raise ValueError(f"{os.path.basename(path)}: 필요한 컬럼이 없습니다 "
+                                 f"({', '.join(CSV_LAYOUT[key] for key in sorted(missing))})")
+            records = (csv.reader(f),)
+
+        width = max(layout.values()) + 1
+        get = lambda record, key: record[layout[key]].strip() if key in layout else ""
+        for reader in records:
+            for record in reader:
+                if len(record) < width:
+                    continue
+                zipcode = get(record, "zipcode")
+                main = get(record, "main")
+                if not zipcode or not main.isdigit():
+                    continue
+                if get(record, "underground") in ("1", "Y", "지하"):
+                    # 지하 건물은 같은 번호의 지상 건물과 우편번호가 다를 수 있어 지하 표기를 도로명에 붙임
+                    road = road_key(get(record, "road")) + "지하"
+                else:
+                    road = road_key(get(record, "road"))
+                sub = get(record, "sub")
+                yield (road, int(main), int(sub) if sub.isdigit() else 0,
+                       get(record, "sido"), get(record, "sigungu"), zipcode)
+
+
+def _source_files(sources):
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for filename in sorted(files):
+                    if filename.lower().endswith((".txt", ".csv")):
+                        yield os.path.join(root, filename)
+        else:
+            yield source
+
+
+def build_postal_db(sources, db_path=DEFAULT_POSTAL_DB, progress=None):
+    """
+    주소 DB 원본 파일/폴더 목록을 SQLite 파일로 변환하고 저장한 주소 수를 반환합니다.
+    임시 파일에 만든 뒤 바꿔치기하므로 변환 중에도 기존 파일로 조회할 수 있습니다.
+    progress(파일 경로, 누적 행 수): 파일 하나를 마칠 때마다 호출
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # 변환 중에는 중간에 실패해도 임시 파일만 버리면 되므로 저널/동기화를 끔
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(_SCHEMA)
+        insert = "INSERT OR IGNORE INTO addresses VALUES (?, ?, ?, ?, ?, ?)"
+        total = 0
+        files = list(_source_files(sources))
+        conn.execute("BEGIN")
+        for path in files:
+            batch = []
+            for row in _iter_source_rows(path):
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH:
+                    conn.executemany(insert, batch)
+                    total += len(batch)
+                    batch.clear()
+            conn.executemany(insert, batch)
+            total += len(batch)
+            if progress is not None:
+                progress(path, total)
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                         [("built_at", str(time.time())), ("sources", "\n".join(files))])
+        conn.execute("COMMIT")
+        count = conn.execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return count
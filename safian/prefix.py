@@ -0,0 +1,105 @@
+"""
+입력 중인 글자로 제품을 찾는 접두어 색인 (자동완성용).
+
+제품명은 자모로 풀어 쓴 문자열과 초성 문자열을 행마다 하나씩만 두고,
+각 단어가 시작하는 (행, 위치) 쌍을 그 위치부터의 문자열 순서로 정렬해 둡니다. (접미사 배열)
+품번은 소문자 문자열 하나당 (행, 0) 하나입니다.
+조회는 이진 탐색으로 접두어 범위만 읽으므로 트라이와 같은 결과를 노드 객체 없이 얻고,
+단어별 부분 문자열을 따로 만들어 두지 않아 메모리도 행 수에 비례하는 만큼만 씁니다.
+- 자모 단위라 조합 중인 글자("듀어" -> "듀얼")도 그대로 접두어로 일치합니다.
+- 입력이 자음(ㄱ~ㅎ)만으로 되어 있으면 초성 색인에서 찾습니다. (예: "ㄷㅇㅍ" -> "듀얼픽스")
+"""
+import re
+from array import array
+
+from safian.hangul import chosung, decompose
+
+_WORD_SPLIT = re.compile(r'[\s\-_/.,()\[\]·]+')
+_CHOSUNG_ONLY = re.compile(r'^[ㄱ-ㅎ]+$')
+_STRIP_PATTERN = re.compile(r'[\s\-_/.,()\[\]·]+')
+
+
+def _word_starts(words):
+    """['세피앙', 'dualfixpro', '티크'] -> [0, 3, 13] (공백 없이 이어 붙였을 때 각 단어의 시작 위치)"""
+    starts, offset = [], 0
+    for word in words:
+        starts.append(offset)
+        offset += len(word)
+    return starts
+
+
+class _SuffixKeys:
+    """행마다 문자열 하나 + (행, 시작 위치) 쌍을 그 위치부터의 문자열 순서로 정렬한 배열"""
+
+    def __init__(self, keys, rows, offsets):
+        self.keys = keys
+        order = sorted(range(len(rows)), key=lambda e: keys[rows[e]][offsets[e]:])
+        self.rows = array('i', map(rows.__getitem__, order))
+        self.offsets = array('i', map(offsets.__getitem__, order))
+
+    def _lower_bound(self, prefix):
+        keys, rows, offsets = self.keys, self.rows, self.offsets
+        n = len(prefix)
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = offsets[mid]
+            if keys[rows[mid]][offset:offset + n] < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def scan(self, prefix, seen, found, limit):
+        """prefix로 시작하는 항목의 행 위치를 found에 추가 (중복 제외, limit개까지)"""
+        keys, rows, offsets = self.keys, self.rows, self.offsets
+        i = self._lower_bound(prefix)
+        while i < len(rows) and len(found) < limit and keys[rows[i]].startswith(prefix, offsets[i]):
+            pos = rows[i]
+            if pos not in seen:
+                seen.add(pos)
+                found.append(pos)
+            i += 1
+
+
+class PrefixIndex:
+    """제품명(자모/초성)과 품번 접두어 검색"""
+
+    def __init__(self, rows, jamo_keys=None):
+        """
+        jamo_keys: 행마다 소문자/기호 제거/자모 분해한 제품명 (FuzzyIndex.keys와 같은 형식).
+        주어지면 새로 만들지 않고 그대로 공유합니다.
+        """
+        shared_keys = jamo_keys is not None
+        jamo_keys = jamo_keys if shared_keys else []
+        chosung_keys, codes = [], []
+        word_rows, jamo_offsets, chosung_offsets = array('i'), array('i'), array('i')
+        for pos, (barcode, name, _) in enumerate(rows):
+            words = [w for w in _WORD_SPLIT.split(str(name).lower()) if w]
+            jamo_words = [decompose(w) for w in words]
+            if not shared_keys:
+                jamo_keys.append("".join(jamo_words))
+            # 초성 문자열은 한 글자가 한 글자로 바뀌므로 단어 시작 위치가 원래 단어 기준과 같음
+            chosung_keys.append(chosung("".join(words)))
+            word_rows.extend([pos] * len(words))
+            jamo_offsets.extend(_word_starts(jamo_words))
+            chosung_offsets.extend(_word_starts(words))
+            codes.append(str(barcode).lower())
+
+        self._jamo = _SuffixKeys(jamo_keys, word_rows, jamo_offsets)
+        self._chosung = _SuffixKeys(chosung_keys, word_rows, chosung_offsets)
+        self._codes = _SuffixKeys(codes, array('i', range(len(codes))), array('i', bytes(4 * len(codes))))
+
+    def search(self, text, limit=10):
+        """입력 중인 문자열로 시작하는(단어 단위) 제품 행 위치를 최대 limit개 반환"""
+        query = _STRIP_PATTERN.sub('', str(text).lower())
+        if not query:
+            return []
+
+        seen, found = set(), []
+        if _CHOSUNG_ONLY.match(query):
+            self._chosung.scan(query, seen, found, limit)
+        else:
+            self._codes.scan(query, seen, found, limit)
+            self._jamo.scan(decompose(query), seen, found, limit)
+        return found
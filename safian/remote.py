@@ -0,0 +1,208 @@
+"""
+주문 분석 서버(safian.server)를 쓰는 OrderProcessor.
+
+분석/검색/바코드 조회/우편번호는 서버에 묻고, 대기 리스트의 중복 감지와 엑셀 저장은 지금처럼 이 PC에서 합니다.
+마스터 파일을 읽지 않으므로 GUI는 서버에 연결되는 즉시 시작되고, 서버가 마스터를 다시 읽으면
+/health의 generation이 바뀌는 것을 감시해 상태 표시줄에 알립니다.
+"""
+import http.client
+import json
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+from safian.core import OrderProcessor
+from safian.metrics import inc, span
+
+DEFAULT_TIMEOUT = 10.0
+
+# 시작 시 서버 연결/로딩 완료를 기다리는 간격(초)과 최대 시간(초)
+CONNECT_RETRY_INTERVAL = 0.5
+CONNECT_TIMEOUT = 60.0
+
+# 목록 조회를 나눠 보낼 크기 (서버의 요청 본문 제한 1MB 안쪽)
+REQUEST_CHUNK = 5000
+
+
+class RemoteError(Exception):
+    """서버 연결 실패 또는 서버 오류 응답"""
+
+
+class RemoteProcessor(OrderProcessor):
+    """
+    카탈로그 조회 메서드를 서버 호출로 바꾼 OrderProcessor.
+    resolve_many/import_orders는 그대로 두어도 일괄 조회 메서드를 거치므로 서버에 목록 단위로 묻습니다.
+    """
+
+    def __init__(self, url, master_file_path="", timeout=DEFAULT_TIMEOUT, **kwargs):
+        """
+        url: 주문 분석 서버 주소 (예: http://192.168.0.10:8765)
+        master_file_path: 엑셀 저장(append_orders_to_excel)과 발주내역 중복 감지에 쓰는 이 PC의 발주서 파일
+        나머지 인자는 OrderProcessor와 같으며, 카탈로그는 서버에서 조회하므로 이 PC에서는 읽지 않습니다.
+        """
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self.url = f"{parts.scheme}://{parts.netloc}"
+        self._host, self._port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()    # 스레드마다 keep-alive 연결 하나
+        self._remote = None                # 마지막 /health 응답
+        kwargs["use_snapshot"] = False
+        kwargs.setdefault("background", True)
+        super().__init__(master_file_path, **kwargs)
+
+    # ------------------ HTTP ------------------ #
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+        return conn
+
+    def _call(self, method, path, payload=None):
+        """서버 호출 1회 (끊긴 keep-alive 연결은 한 번 다시 연결). 실패하면 RemoteError"""
+        body = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                with span("remote_call"):
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                self._local.conn = None
+                if attempt == 2:
+                    inc("remote_error")
+                    raise RemoteError(f"주문 분석 서버({self.url})에 연결할 수 없습니다: {e}") from e
+        try:
+            result = json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            inc("remote_error")
+            raise RemoteError(f"서버 응답을 읽을 수 없습니다 ({response.status})") from e
+        if response.status != 200:
+            inc("remote_error")
+            raise RemoteError(result.get("error") or f"서버 오류 ({response.status})")
+        return result
+
+    def _ask(self, path, payload, key, default):
+        """조회용 호출: 서버 오류는 로그만 남기고 default 반환 (로컬 조회가 실패했을 때와 같은 동작)"""
+        try:
+            return self._call("POST", path, payload)[key]
+        except RemoteError as e:
+            self._log(f"{path} 조회 실패: {e}", logging.WARNING)
+            return default
+
+    def _ask_many(self, path, name, values, key, default, **extra):
+        """목록 조회: 요청 본문이 너무 커지지 않게 REQUEST_CHUNK개씩 나눠 보내고 결과를 이어 붙임"""
+        result = []
+        for start in range(0, len(values), REQUEST_CHUNK):
+            chunk = values[start:start + REQUEST_CHUNK]
+            result.extend(self._ask(path, dict(extra, **{name: chunk}), key, [default() for _ in chunk]))
+        return result
+
+    # ------------------ 로딩 ------------------ #
+    def _load_products(self):
+        """마스터를 읽는 대신 서버가 카탈로그를 다 읽을 때까지 기다림"""
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            try:
+                health = self._call("GET", "/health")
+            except RemoteError as e:
+                health = {"status": "unreachable", "error": str(e)}
+            if health["status"] == "ok":
+                self._remote = health
+                self._log(f"주문 분석 서버 연결: {self.url} (제품 {health['products']}건)")
+                return
+            if health["status"] == "error" or time.monotonic() > deadline:
+                self._log(f"주문 분석 서버를 사용할 수 없습니다 ({self.url}): {health.get('error', health['status'])}",
+                          logging.ERROR)
+                return
+            time.sleep(CONNECT_RETRY_INTERVAL)
+
+    @property
+    def product_count(self):
+        return None if self._remote is None else self._remote["products"]
+
+    def reload(self):
+        # 마스터는 서버가 다시 읽음
+        return None
+
+    def watch_master_file(self, interval=2.0, on_reload=None):
+        """서버의 마스터 갱신(/health의 generation 변화)을 감시해 on_reload(요약)를 호출"""
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+
+        def watch():
+            self.load_future.result()
+            while not stop.wait(interval):
+                try:
+                    health = self._call("GET", "/health")
+                except RemoteError:
+                    continue
+                previous, self._remote = self._remote, health
+                if previous is not None and health["generation"] != previous["generation"] and on_reload:
+                    on_reload(health["reload"] or "서버 마스터 갱신")
+
+        threading.Thread(target=watch, name="remote-watcher", daemon=True).start()
+
+    # ------------------ 서버에 묻는 조회 ------------------ #
+    def parse_order(self, text):
+        # 분석은 서버에 묻되, 연결이 안 되면 이 PC에서 분석 (카탈로그가 필요 없음)
+        try:
+            return self._call("POST", "/parse", {"text": text})["parsed"]
+        except RemoteError as e:
+            self._log(f"/parse 실패, 이 PC에서 분석: {e}", logging.WARNING)
+            return super().parse_order(text)
+
+    def find_barcode_by_product_name(self, hint, first_match=True):
+        if not hint:
+             return []
+        return self._ask("/match", {"hint": hint, "first_match": bool(first_match)}, "items", [])
+
+    def find_barcodes_by_product_names(self, hints, first_match=True):
+        hints = [hint or "" for hint in hints]
+        return self._ask_many("/match", "hints", hints, "items", list, first_match=bool(first_match))
+
+    def lookup_product_by_barcode(self, barcode):
+        if not barcode:
+             return []
+        return self._ask("/bundle", {"barcode": barcode}, "items", [])
+
+    def lookup_products_by_barcodes(self, barcodes):
+        barcodes = [barcode or "" for barcode in barcodes]
+        return self._ask_many("/bundle", "barcodes", barcodes, "items", list)
+
+    def search_products(self, hint, k=5, budget=0.005):
+        if not hint:
+             return []
+        return self._ask("/search", {"hint": hint, "k": k}, "results", [])
+
+    def suggest_products(self, prefix, limit=10):
+        # 키 입력마다 호출되므로 서버에 연결되기 전에는 기다리지 않음
+        if not prefix or self._remote is None:
+             return []
+        return self._ask("/suggest", {"prefix": prefix, "limit": limit}, "results", [])
+
+    def source_of(self, barcode):
+        if not barcode:
+             return None
+        return self._ask("/source", {"barcode": barcode}, "source", None)
+
+    def postal_code(self, address):
+        if not address:
+             return ""
+        return self._ask("/postal", {"address": address}, "postal_code", "")
+
+    def postal_codes(self, addresses):
+        addresses = [address or "" for address in addresses]
+        return self._ask_many("/postal", "addresses", addresses, "postal_codes", str)
+
+    def close(self):
+        super().close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,405 @@
+"""
+여러 PC가 함께 쓰는 주문 분석 서버 (asyncio HTTP, JSON).
+
+PC마다 마스터 .xlsb를 따로 읽어 색인하면 시작이 느리고 마스터가 바뀌었을 때 PC끼리 결과가 달라집니다.
+서버 한 대가 OrderProcessor 하나를 메모리에 띄워 두고 분석/검색/바코드 조회를 JSON으로 제공하며,
+마스터 파일이 바뀌면 서버만 다시 읽으면 모든 PC에 바로 반영됩니다.
+
+    python -m safian serve --master 2026통합발주서_영업_연습.xlsb --host 0.0.0.0 --port 8765
+
+- 요청 처리는 작업 스레드 풀에서 하고 동시에 처리하는 요청 수를 제한합니다. (대기열이 넘치면 503)
+- 한 건씩 들어오는 바코드/상품명 조회는 아주 짧은 시간(BATCH_WINDOW) 동안 모아 일괄 조회 API로 한 번에 처리합니다.
+
+엔드포인트 (모두 JSON)
+    GET  /health                          -> {"status", "products", "sources", "generation", "reload"}
+    POST /parse    {"text"} | {"texts"}   -> {"parsed"}
+    POST /match    {"hint"} | {"hints"}, "first_match"  -> {"items"}
+    POST /bundle   {"barcode"} | {"barcodes"}           -> {"items"}
+    POST /resolve  {"barcodes", "hints", "first_match"} -> {"items"}
+    POST /search   {"hint", "k"}          -> {"results"}
+    POST /suggest  {"prefix", "limit"}    -> {"results"}
+    POST /source   {"barcode"}            -> {"source"}
+    POST /postal   {"address"} | {"addresses"}          -> {"postal_code"} | {"postal_codes"}
+"""
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from safian.logs import get_logger
+from safian.metrics import inc
+
+logger = get_logger("server")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 동시에 처리하는 요청 수 (= 작업 스레드 수)와 그 뒤에 기다릴 수 있는 요청 수
+MAX_CONCURRENCY = 8
+MAX_PENDING = 256
+
+# 한 건 조회를 모으는 시간(초)과 한 번에 모을 최대 건수
+BATCH_WINDOW = 0.005
+MAX_BATCH = 512
+
+# /search, /suggest에서 한 번에 돌려줄 최대 결과 수
+MAX_RESULTS = 100
+
+MAX_BODY = 1 << 20
+READ_TIMEOUT = 30.0
+
+
+class RequestError(Exception):
+    """클라이언트에 그대로 돌려줄 오류 (HTTP 상태 + 메시지)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _field(payload, name, kind=str):
+    value = payload.get(name)
+    if not isinstance(value, kind):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}' 필드가 필요합니다.")
+    return value
+
+
+def _str_list(payload, name):
+    values = _field(payload, name, list)
+    if not all(isinstance(value, str) for value in values):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}'는 문자열 목록이어야 합니다.")
+    return values
+
+
+def _flag(payload, name, default):
+    """참/거짓 필드 (JSON true/false만 허용, 없으면 default). "false" 같은 문자열은 참으로 읽히므로 거부"""
+    value = payload.get(name, default)
+    if not isinstance(value, bool):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}'는 true 또는 false여야 합니다.")
+    return value
+
+
+def _count(payload, name, default):
+    """결과 개수 필드 (1 ~ MAX_RESULTS의 정수, 없으면 default)"""
+    value = payload.get(name, default)
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        count = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}'는 정수여야 합니다.")
+    if not 1 <= count <= MAX_RESULTS:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}'는 1 ~ {MAX_RESULTS} 사이여야 합니다.")
+    return count
+
+
+class _Batcher:
+    """한 건씩 들어오는 조회를 BATCH_WINDOW 동안 모아 일괄 함수 fn(목록) -> 결과 목록으로 한 번에 처리"""
+
+    def __init__(self, service, fn, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self._service = service
+        self._fn = fn
+        self._window = window
+        self._max_batch = max_batch
+        self._items = []
+        self._timer = None
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._items.append((item, future))
+        if len(self._items) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._items = self._items, []
+        if items:
+            asyncio.ensure_future(self._run(items))
+
+    async def _run(self, items):
+        inc("server_batches")
+        inc("server_batched_requests", len(items))
+        try:
+            results = await self._service.run(self._fn, [item for item, _ in items])
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class OrderService:
+    """OrderProcessor 하나를 HTTP(JSON)로 제공하는 서버"""
+
+    def __init__(self, processor, max_concurrency=MAX_CONCURRENCY, max_pending=MAX_PENDING,
+                 batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.processor = processor
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="order-service")
+        self._slots = None                 # asyncio.Semaphore (서버 루프에서 생성)
+        self._max_concurrency = max_concurrency
+        self._waiting = 0
+        self._server = None
+        self.generation = 0                # 마스터를 다시 읽을 때마다 1 증가 (클라이언트 갱신 감지용)
+        self.last_reload = ""
+        self._batchers = {
+            "bundle": _Batcher(self, processor.lookup_products_by_barcodes, batch_window, max_batch),
+            "match": _Batcher(self, processor.find_barcodes_by_product_names, batch_window, max_batch),
+            "match_best": _Batcher(self, lambda hints: processor.find_barcodes_by_product_names(hints, False),
+                                   batch_window, max_batch),
+            "postal": _Batcher(self, lambda addresses: [processor.postal_code(a) for a in addresses],
+                               batch_window, max_batch),
+        }
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("POST", "/parse"): self._parse,
+            ("POST", "/match"): self._match,
+            ("POST", "/bundle"): self._bundle,
+            ("POST", "/resolve"): self._resolve,
+            ("POST", "/search"): self._search,
+            ("POST", "/suggest"): self._suggest,
+            ("POST", "/source"): self._source,
+            ("POST", "/postal"): self._postal,
+        }
+
+    # ------------------ 실행 ------------------ #
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """서버 소켓을 열고 asyncio.Server를 반환 (port=0이면 빈 포트 자동 선택)"""
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.processor.watch_master_file(on_reload=self._on_reload)
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()[:2] if self._server else None
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        logger.info(f"주문 분석 서버 시작: http://{self.address[0]}:{self.address[1]}")
+        async with server:
+            await server.serve_forever()
+
+    async def shutdown(self):
+        """서버 소켓을 닫고 처리 중인 연결을 정리 (서버 루프에서 호출)"""
+        if self._server is not None:
+            self._server.close()
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        """작업 스레드와 OrderProcessor 정리 (루프가 멈춘 뒤 호출)"""
+        self._executor.shutdown(wait=False)
+        self.processor.close()
+
+    def _on_reload(self, summary):
+        # 감시 스레드에서 호출됨: 정수/문자열 대입만 하므로 잠금 없이 갱신
+        self.last_reload = str(summary)
+        self.generation += 1
+
+    async def run(self, fn, *args):
+        """fn(*args)를 작업 스레드에서 실행 (동시 실행 수 제한, 대기열이 넘치면 503)"""
+        if self._waiting >= self.max_pending:
+            inc("server_rejected")
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+        self._waiting += 1
+        try:
+            async with self._slots:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._waiting -= 1
+
+    # ------------------ HTTP ------------------ #
+    async def _handle(self, reader, writer):
+        """연결 하나: keep-alive로 요청을 차례로 처리"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, path, payload, keep_alive = request
+                status, body = await self._dispatch(method, path, payload)
+                self._write_response(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as e:
+            # 요청 자체를 읽을 수 없는 경우 (헤더/본문 오류): 응답 후 연결 종료
+            self._write_response(writer, e.status, {"error": str(e)}, False)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "잘못된 요청입니다.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length가 잘못되었습니다.")
+        if length > MAX_BODY:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "요청 본문이 너무 큽니다.")
+        payload = {}
+        if length:
+            try:
+                payload = json.loads((await reader.readexactly(length)).decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                payload = None
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target.split("?", 1)[0], payload, keep_alive
+
+    async def _dispatch(self, method, path, payload):
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} {path}는 지원하지 않습니다."}
+            return HTTPStatus.NOT_FOUND, {"error": f"없는 경로입니다: {path}"}
+        if not isinstance(payload, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "본문은 JSON 객체여야 합니다."}
+        try:
+            inc(f"server_request{path.replace('/', '_')}")
+            return HTTPStatus.OK, await handler(payload)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            logger.log(logging.ERROR, f"{path} 처리 중 오류: {e}", exc_info=True)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def _write_response(writer, status, body, keep_alive):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+
+    # ------------------ 엔드포인트 ------------------ #
+    async def _health(self, payload):
+        processor = self.processor
+        count = processor.product_count
+        status = "loading" if not processor.ready else ("ok" if count is not None else "error")
+        sources = list(processor.catalog.sources) if processor.catalog is not None else []
+        return {"status": status, "products": count, "sources": sources,
+                "generation": self.generation, "reload": self.last_reload}
+
+    async def _parse(self, payload):
+        if "texts" in payload:
+            texts = _str_list(payload, "texts")
+            return {"parsed": await self.run(lambda: [self.processor.parse_order(text) for text in texts])}
+        return {"parsed": await self.run(self.processor.parse_order, _field(payload, "text"))}
+
+    async def _match(self, payload):
+        first_match = _flag(payload, "first_match", True)
+        if "hints" in payload:
+            hints = _str_list(payload, "hints")
+            return {"items": await self.run(self.processor.find_barcodes_by_product_names, hints, first_match)}
+        batcher = self._batchers["match" if first_match else "match_best"]
+        return {"items": await batcher.submit(_field(payload, "hint"))}
+
+    async def _bundle(self, payload):
+        if "barcodes" in payload:
+            return {"items": await self.run(self.processor.lookup_products_by_barcodes, _str_list(payload, "barcodes"))}
+        return {"items": await self._batchers["bundle"].submit(_field(payload, "barcode"))}
+
+    async def _resolve(self, payload):
+        barcodes = _str_list(payload, "barcodes") if payload.get("barcodes") is not None else None
+        hints = _str_list(payload, "hints") if payload.get("hints") is not None else None
+        first_match = _flag(payload, "first_match", True)
+        try:
+            items = await self.run(self.processor.resolve_many, barcodes, hints, first_match)
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+        return {"items": items}
+
+    async def _search(self, payload):
+        hint = _field(payload, "hint")
+        k = _count(payload, "k", 5)
+        return {"results": await self.run(self.processor.search_products, hint, k)}
+
+    async def _suggest(self, payload):
+        prefix = _field(payload, "prefix")
+        limit = _count(payload, "limit", 10)
+        return {"results": await self.run(self.processor.suggest_products, prefix, limit)}
+
+    async def _source(self, payload):
+        return {"source": await self.run(self.processor.source_of, _field(payload, "barcode"))}
+
+    async def _postal(self, payload):
+        if "addresses" in payload:
+            addresses = _str_list(payload, "addresses")
+            return {"postal_codes": await self.run(lambda: [self.processor.postal_code(a) for a in addresses])}
+        return {"postal_code": await self._batchers["postal"].submit(_field(payload, "address"))}
+
+
+def run_server(processor, host=DEFAULT_HOST, port=DEFAULT_PORT, max_concurrency=MAX_CONCURRENCY):
+    """서버를 실행하고 Ctrl+C로 종료될 때까지 대기"""
+    service = OrderService(processor, max_concurrency=max_concurrency)
+    try:
+        asyncio.run(service.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+def start_in_thread(processor, host=DEFAULT_HOST, port=0, **kwargs):
+    """
+    (같은 프로세스에서 확인/벤치마크용) 서버를 별도 스레드의 이벤트 루프에서 띄우고
+    (OrderService, (호스트, 포트), 종료 함수)를 반환합니다.
+    """
+    service = OrderService(processor, **kwargs)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start(host, port))
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="order-service-loop", daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(service.shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        service.close()
+
+    return service, service.address, stop
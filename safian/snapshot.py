@@ -0,0 +1,121 @@
+import hashlib
+import os
+import pickle
+
+# 저장 구조가 바뀌면 올려서 예전 스냅샷을 무시하도록 합니다.
+SNAPSHOT_VERSION = 6
+SNAPSHOT_SUFFIX = ".catalog.pkl"
+
+
+def snapshot_dir():
+    """
+    스냅샷을 두는 이 PC 사용자 전용 캐시 폴더.
+    마스터는 여러 PC가 함께 쓰는 공유 폴더에 있을 수 있으므로 그 옆에 두지 않습니다.
+    (다른 PC가 쓴 pickle을 읽지 않고, 여러 PC가 같은 파일을 동시에 쓰지도 않음)
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "safian", "snapshots")
+
+
+def snapshot_path(master_file_path, sheet="코드"):
+    """마스터 파일(과 시트)별 카탈로그 스냅샷 경로 (캐시 폴더 안, 전체 경로의 해시로 구분)"""
+    key = hashlib.sha1(f"{os.path.abspath(master_file_path)}\0{sheet}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(snapshot_dir(), f"{os.path.basename(master_file_path)}.{key}{SNAPSHOT_SUFFIX}")
+
+
+def content_hash(path, chunk_size=1024 * 1024):
+    """마스터 파일 내용의 sha1 해시"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_fingerprint(master_file_path, sheet):
+    st = os.stat(master_file_path)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "path": os.path.abspath(master_file_path),
+        "sheet": sheet,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def fingerprint(master_file_path, sheet="코드"):
+    """
+    마스터 파일의 (경로, 시트, 크기, 수정시각, 내용 해시).
+    파일을 읽기 전에 구해 두었다가 save_snapshot에 넘겨야 읽는 도중 바뀐 파일을 걸러낼 수 있습니다.
+    """
+    header = _stat_fingerprint(master_file_path, sheet)
+    header["sha1"] = content_hash(master_file_path)
+    return header
+
+
+def _write(path, header, catalog):
+    # 프로세스별 임시 파일에 쓴 뒤 교체하여 중간에 죽어도 깨진 스냅샷이 남지 않게 함
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_snapshot(master_file_path, catalog, sheet="코드", before=None):
+    """
+    컴파일된 카탈로그(정제된 행 + 색인)를 캐시 폴더에 저장하고 저장 여부를 반환합니다.
+    before: 마스터를 읽기 직전의 fingerprint(). 그 사이 파일이 바뀌었으면(읽는 도중 저장 등)
+            카탈로그가 어느 버전인지 알 수 없으므로 저장하지 않습니다.
+    """
+    if before is None:
+        before = fingerprint(master_file_path, sheet)
+    current = _stat_fingerprint(master_file_path, sheet)
+    if any(before.get(key) != value for key, value in current.items()):
+        return False
+    _write(snapshot_path(master_file_path, sheet), before, catalog)
+    return True
+
+
+def load_snapshot(master_file_path, sheet="코드"):
+    """
+    마스터 파일이 바뀌지 않았다면 저장된 카탈로그를 반환하고, 아니면 None.
+
+    경로/크기/수정시각이 같으면 바로 사용하고, 수정시각만 달라진 경우(복사, 동기화 등)는
+    내용 해시를 비교해 실제로 같은 파일이면 그대로 쓰면서 스냅샷의 수정시각을 갱신합니다.
+    """
+    path = snapshot_path(master_file_path, sheet)
+    if not os.path.exists(path) or not os.path.exists(master_file_path):
+        return None
+
+    current = _stat_fingerprint(master_file_path, sheet)
+    with open(path, "rb") as f:
+        header = pickle.load(f)
+        if not isinstance(header, dict):
+            return None
+        for key in ("version", "path", "sheet", "size"):
+            if header.get(key) != current[key]:
+                return None
+
+        if header.get("mtime_ns") == current["mtime_ns"]:
+            return pickle.load(f)
+
+        sha1 = content_hash(master_file_path)
+        if header.get("sha1") != sha1 or _stat_fingerprint(master_file_path, sheet) != current:
+            # 내용이 다르거나 해시를 구하는 도중 파일이 바뀜
+            return None
+        catalog = pickle.load(f)
+
+    current["sha1"] = sha1
+    try:
+        _write(path, current, catalog)
+    except OSError:
+        pass
+    return catalog
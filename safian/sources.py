@@ -0,0 +1,89 @@
+"""
+여러 마스터 파일/시트를 하나의 카탈로그로 합치기 위한 카탈로그 소스 정의.
+
+브랜드/시즌별 마스터를 따로 관리할 때 각 파일(과 시트)을 CatalogSource로 지정하면
+OrderProcessor가 스레드 풀에서 동시에 읽은 뒤 우선순위에 따라 하나로 합칩니다.
+
+같은 바코드가 여러 소스에 있으면
+  1. priority가 큰 소스가 이기고
+  2. priority가 같으면 목록에서 앞에 있는 소스가 이깁니다.
+한 소스 안에서 중복된 바코드는 기존과 같이 시트의 첫 번째 행이 기준입니다.
+"""
+import json
+import os
+from typing import NamedTuple
+
+DEFAULT_SHEET = '코드'
+
+
+class CatalogSource(NamedTuple):
+    """카탈로그를 읽어올 마스터 파일 하나 (파일 경로, 시트 이름, 우선순위)"""
+    path: str
+    sheet: str = DEFAULT_SHEET
+    priority: int = 0
+    name: str = ""
+
+    @property
+    def label(self):
+        """조회 결과에 표시할 소스 이름 (지정하지 않으면 '파일명:시트')"""
+        return self.name or f"{os.path.basename(self.path)}:{self.sheet}"
+
+
+def as_source(value):
+    """경로 문자열, (경로, 시트[, 우선순위]) 튜플, dict, CatalogSource를 CatalogSource로 변환"""
+    if isinstance(value, CatalogSource):
+        return value
+    if isinstance(value, (str, os.PathLike)):
+        return CatalogSource(os.fspath(value))
+    if isinstance(value, dict):
+        return CatalogSource(value['path'], value.get('sheet', DEFAULT_SHEET),
+                             int(value.get('priority', 0)), value.get('name', ""))
+    return CatalogSource(*value)
+
+
+def precedence(sources):
+    """우선순위가 높은 순(같으면 목록 순서)으로 정렬한 소스 목록"""
+    order = sorted(range(len(sources)), key=lambda i: (-sources[i].priority, i))
+    return [sources[i] for i in order]
+
+
+def merge_rows(loaded):
+    """
+    소스별 행 목록을 하나로 합칩니다.
+    loaded: [(CatalogSource, rows), ...] (precedence() 순서)
+
+    반환값: (rows, origins, conflicts)
+      - rows: 합친 행 목록 (우선순위 높은 소스의 행이 앞)
+      - origins: 바코드 -> 소스 이름
+      - conflicts: 밀려난 중복 바코드 [(바코드, 채택된 소스, 무시된 소스), ...]
+    """
+    rows, origins, conflicts = [], {}, []
+    for source, source_rows in loaded:
+        label = source.label
+        claimed = set()  # 이 소스에서 이미 채택한 바코드 (소스 안의 중복은 기존처럼 첫 행 기준)
+        for row in source_rows:
+            barcode = row[0]
+            owner = origins.get(barcode)
+            if owner is not None and barcode not in claimed:
+                conflicts.append((barcode, owner, label))
+                continue
+            origins[barcode] = label
+            claimed.add(barcode)
+            rows.append(row)
+    return rows, origins, conflicts
+
+
+def load_sources_config(path):
+    """
+    JSON 설정 파일에서 카탈로그 소스 목록을 읽습니다.
+    예: [{"path": "브랜드A.xlsb", "sheet": "코드", "priority": 10}, "공통마스터.xlsb"]
+    상대 경로는 설정 파일이 있는 폴더 기준입니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    sources = []
+    for entry in entries:
+        source = as_source(entry)
+        sources.append(source._replace(path=os.path.join(base, source.path)))
+    return sources
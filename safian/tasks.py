@@ -0,0 +1,98 @@
+"""
+GUI용 작업 실행기.
+
+분석/조회/저장처럼 시간이 걸릴 수 있는 작업을 작업 스레드에서 실행하고,
+결과/진행 상황은 큐에 넣었다가 Tk 메인 스레드에서 root.after 주기로 꺼내 콜백을 호출합니다.
+(Tk 위젯은 메인 스레드에서만 다뤄야 하므로 작업 스레드는 위젯을 직접 건드리지 않음)
+
+작업은 레인(lane)별로 스레드 하나씩에서 순서대로 실행됩니다.
+- 같은 레인의 작업은 제출한 순서대로 끝나고 (주문 추가 순서 보장)
+- 다른 레인끼리는 동시에 실행되므로 저장이 오래 걸려도 다음 주문 분석/추가는 계속됩니다.
+"""
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 50
+
+
+class Task:
+    """실행 중인 작업 하나 (취소 요청 / 진행 상황 보고)"""
+
+    def __init__(self, runner, name, on_progress=None):
+        self.name = name
+        self.cancel_event = threading.Event()
+        self._runner = runner
+        self._on_progress = on_progress
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """취소 요청. 작업 함수가 cancel_event를 확인하는 지점에서 멈춥니다."""
+        self.cancel_event.set()
+
+    def report(self, done, total=None):
+        """작업 스레드에서 호출: 진행 상황을 메인 스레드의 on_progress로 전달"""
+        if self._on_progress is not None:
+            self._runner._events.put((self._on_progress, (done, total)))
+
+
+class TaskRunner:
+    """레인별 작업 스레드 + 메인 스레드 콜백 전달"""
+
+    def __init__(self, root):
+        self.root = root
+        self._events = queue.Queue()
+        self._lanes = {}
+        self._closed = False
+        self._poll()
+
+    def submit(self, lane, fn, *args, on_done=None, on_error=None, on_progress=None, with_task=False):
+        """
+        fn(*args)를 lane 스레드에서 실행하고, 끝나면 메인 스레드에서 on_done(결과)를 호출합니다.
+        예외가 나면 on_error(예외)를 호출합니다. (없으면 traceback 출력)
+        with_task=True 이면 fn의 첫 인자로 Task를 넘겨 진행 상황 보고/취소 확인에 쓰게 합니다.
+        """
+        task = Task(self, getattr(fn, "__name__", lane), on_progress)
+
+        def run():
+            try:
+                result = fn(task, *args) if with_task else fn(*args)
+            except Exception as e:
+                if on_error is not None:
+                    self._events.put((on_error, (e,)))
+                else:
+                    traceback.print_exc()
+                return
+            if on_done is not None:
+                self._events.put((on_done, (result,)))
+
+        executor = self._lanes.get(lane)
+        if executor is None:
+            executor = self._lanes[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"gui-{lane}")
+        executor.submit(run)
+        return task
+
+    def _poll(self):
+        """메인 스레드: 작업 스레드가 넘긴 콜백을 차례로 실행"""
+        try:
+            while True:
+                callback, args = self._events.get_nowait()
+                try:
+                    callback(*args)
+                except Exception:
+                    traceback.print_exc()
+        except queue.Empty:
+            pass
+        if not self._closed:
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def shutdown(self, wait=True):
+        """모든 레인 종료 (wait=True면 실행 중인 작업이 끝날 때까지 대기)"""
+        self._closed = True
+        for executor in self._lanes.values():
+            executor.shutdown(wait=wait)
+        self._lanes.clear()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """debug.log, 스냅샷 캐시가 저장소나 사용자 폴더에 남지 않도록 임시 폴더에서 실행"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "cache"))
+    return tmp_path
+
+
+@pytest.fixture
+def catalog_df():
+    """'코드' 시트와 같은 형식의 작은 카탈로그"""
+    return pd.DataFrame({
+        "품번": ["A001", "A002", "B001", "G001", "G002"],
+        "제품명": ["명품 나주배 5kg", "나주배즙 30포", "세피앙 듀얼픽스 프로 티크", "배즙 선물세트", "사과 1kg"],
+        "사은품 1": ["G001", None, "G002", None, None],
+        "사은품 2": [None, None, "G999", None, None],
+    })
@@ -0,0 +1,22 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from safian import batch
+from safian.core import OrderProcessor
+
+ORDERS = "홍길동\n010-1234-5678\n서울 종로구 세종대로 175\n나주배즙 30포 2개\n\n김철수\n010-2222-3333\n부산 해운대구 우동 1\n사과 1kg\n"
+
+
+def test_spawned_workers_use_parent_catalog(catalog_df):
+    # 워커는 마스터 파일 없이 부모가 넘긴 카탈로그만으로 매칭 (xlsb를 다시 읽지 않음)
+    catalog = OrderProcessor.from_dataframe(catalog_df).catalog
+    with open("orders.txt", "w", encoding="utf-8") as f:
+        f.write(ORDERS)
+    records = batch.collect_records("orders.txt")
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=spawn, initializer=batch._init_worker,
+                             initargs=("없는마스터.xlsb", None, None, catalog)) as executor:
+        results = list(executor.map(batch.process_record, records))
+    assert [r["barcode"] for r in results] == ["A002", "G002"]
+    assert not any(r["error"] for r in results)
+
@@ -0,0 +1,117 @@
+import os
+import threading
+
+import pandas as pd
+
+from safian.core import OrderProcessor
+from safian.dedup import ORIGIN_SESSION, ORIGIN_SHEET, DuplicateIndex, order_key
+
+KEY = order_key("010-1234-5678", "서울 종로구 세종대로 175", "A001", "2")
+
+
+def test_window_applies_only_to_session_orders():
+    index = DuplicateIndex(window=60)
+    index.add_many([KEY], ORIGIN_SHEET, when=1000.0)
+    session_key = order_key("010-9999-0000", "부산 해운대구 우동 1", "A002", "1")
+    index.add(session_key, ORIGIN_SESSION, when=1000.0)
+
+    # 시트 주문은 날짜가 없으므로 기간이 지나도 중복, 대기 리스트 주문은 기간이 지나면 중복 아님
+    assert index.find(KEY, now=5000.0).origin == ORIGIN_SHEET
+    assert index.find(session_key, now=1030.0).origin == ORIGIN_SESSION
+    assert index.find(session_key, now=5000.0) is None
+
+
+def test_session_add_keeps_sheet_origin():
+    index = DuplicateIndex()
+    index.add_many([KEY], ORIGIN_SHEET, when=1000.0)
+    index.add(KEY, ORIGIN_SESSION, when=2000.0)
+    hit = index.find(KEY)
+    assert hit == (ORIGIN_SHEET, 2000.0, 2)
+
+    # 대기 리스트에서 지워도 시트에 있던 1건은 남음
+    index.remove(KEY)
+    assert index.find(KEY) == (ORIGIN_SHEET, 2000.0, 1)
+
+
+def test_sheet_rows_loaded_after_session_order_become_sheet_origin():
+    index = DuplicateIndex()
+    index.add(KEY, ORIGIN_SESSION, when=1000.0)
+    index.add_many([KEY], ORIGIN_SHEET, when=500.0)
+    assert index.find(KEY) == (ORIGIN_SHEET, 1000.0, 2)
+
+
+def test_load_order_history_ignores_window(catalog_df):
+    pd.DataFrame([{"핸드폰": "01012345678", "주소": "서울 종로구 세종대로 175", "바코드": "a001", "수량": "2개"}]).to_excel(
+        "발주서.xlsx", sheet_name="발주내역", index=False)
+    os.utime("발주서.xlsx", (0, 0))
+    processor = OrderProcessor.from_dataframe(catalog_df, duplicate_window=60)
+    assert processor.load_order_history("발주서.xlsx") == 1
+    hit = processor.find_duplicate({"핸드폰": "010-1234-5678", "주소": "서울 종로구 세종대로 175", "바코드": "A001", "수량": "2"})
+    assert hit is not None and hit.origin == ORIGIN_SHEET
+
+
+class FakeEntry:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def delete(self, start, end=None):
+        self.value = ""
+
+    def insert(self, index, value):
+        self.value = value + self.value
+
+    def focus(self):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+
+class FakeRoot:
+    def after(self, ms, fn):
+        pass
+
+
+def test_back_to_back_adds_warn_before_first_is_recorded(catalog_df, monkeypatch):
+    from safian import gui
+    from safian.journal import OrderJournal
+    from safian.tasks import TaskRunner
+
+    app = gui.OrderApp.__new__(gui.OrderApp)
+    app.processor = OrderProcessor.from_dataframe(catalog_df)
+    app.tasks = TaskRunner(FakeRoot())
+    app.journal = OrderJournal("order_queue.db")
+    appended = []
+    app.order_view = type("View", (), {"append": lambda self, entries: appended.append(entries)})()
+    app._pending_until_ready = []
+    app._show_candidates = lambda candidates: None
+    app.entries = {key: FakeEntry() for key in ("partner", "orderer", "mid_recipient", "mobile", "phone", "address",
+                                                "product_hint", "barcode", "qty", "memo", "fee", "ship_fee")}
+    asked = []
+    monkeypatch.setattr(gui.messagebox, "askyesno", lambda *args, **kwargs: asked.append(args) or True)
+
+    def add():
+        app.entries["mobile"].value = "010-1234-5678"
+        app.entries["address"].value = "서울 종로구 세종대로 175"
+        app.entries["barcode"].value = "A001"
+        app.entries["qty"].value = "1"
+        app.add_item()
+
+    # 작업 레인을 잠시 막아 첫 주문이 기록되기 전에 같은 주문을 다시 추가 (더블 클릭)
+    gate = threading.Event()
+    app.tasks.submit(gui.WORK_LANE, gate.wait)
+    add()
+    add()
+    gate.set()
+    assert len(asked) == 1
+
+    app.tasks.shutdown(wait=True)
+    app.tasks._poll()
+    assert len(appended) == 2
+    # 임시로 넣어 둔 키는 빠지고 실제로 기록된 본품 행 2건만 남음
+    hit = app.processor.find_duplicate({"핸드폰": "01012345678", "주소": "서울 종로구 세종대로 175", "바코드": "a001", "수량": "1"})
+    assert hit.count == 2
+    app.journal.close()
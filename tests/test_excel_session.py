@@ -0,0 +1,244 @@
+"""가짜 COM 백엔드(safian.fakecom)로 엑셀 저장/세션 동작 확인"""
+import threading
+import time
+
+import pytest
+
+from safian.core import OrderProcessor
+from safian.excel_session import ExcelSession
+from safian.excel_sink import ORDER_COLUMNS, ORDER_SHEET_NAME, ComSheetSink
+from safian.fakecom import FakeComBackend, FakeExcel, FakeWorkbook
+
+
+def make_orders(n):
+    return [{"거래처명": "테스트", "주문번호": str(i), "핸드폰": "010-0000-0000", "주소": f"주소 {i}",
+             "바코드": "A001", "제품명": "명품 나주배 5kg", "수량": "1"} for i in range(n)]
+
+
+@pytest.fixture
+def master(tmp_path):
+    path = tmp_path / "master.xlsb"
+    path.write_bytes(b"")
+    return str(path)
+
+
+@pytest.fixture
+def fake(master):
+    backend = FakeComBackend()
+    backend.disk.register(master)
+    return backend
+
+
+@pytest.fixture
+def processor(master, fake, catalog_df):
+    processor = OrderProcessor(master, use_snapshot=False, source_df=catalog_df, excel_backend=fake.as_backend())
+    yield processor
+    processor.close()
+
+
+def saved_rows(fake, master):
+    sheet = fake.disk.open(master).sheet(ORDER_SHEET_NAME)
+    return sheet.rows() if sheet is not None else []
+
+
+def test_block_write_uses_constant_com_calls():
+    counts = []
+    for n in (1, 100, 4000):
+        workbook = FakeWorkbook(sheet_names=("코드", ORDER_SHEET_NAME))
+        sink = ComSheetSink(workbook)
+        sink.append([("x",) * len(ORDER_COLUMNS)])    # 시트 찾기/헤더 확인은 첫 append에서
+        before = workbook.com_calls
+        sink.append([(str(i),) * len(ORDER_COLUMNS) for i in range(n)])
+        counts.append(workbook.com_calls - before)
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_block_write_splits_large_blocks_into_chunks():
+    workbook = FakeWorkbook()
+    sink = ComSheetSink(workbook, chunk_size=100)
+    sink.append([("x",) * len(ORDER_COLUMNS)])
+    before = workbook.com_calls
+    sink.append([(str(i),) * len(ORDER_COLUMNS) for i in range(100)])
+    one_chunk = workbook.com_calls - before
+    before = workbook.com_calls
+    sink.append([(str(i),) * len(ORDER_COLUMNS) for i in range(300)])
+    # 추가 블록마다 Range 조회 + Value 대입 2번
+    assert workbook.com_calls - before == one_chunk + 2 * 2
+    assert len(workbook.sheet(ORDER_SHEET_NAME).rows()) == 1 + 1 + 400
+
+
+def test_save_appends_below_existing_rows(processor, fake, master):
+    assert processor.append_orders_to_excel(make_orders(3))[0]
+    assert processor.append_orders_to_excel(make_orders(2))[0]
+    rows = saved_rows(fake, master)
+    assert rows[0] == tuple(ORDER_COLUMNS)
+    assert [row[1] for row in rows[1:]] == ["0", "1", "2", "0", "1"]
+    assert fake.dispatch_count == 1
+
+
+def test_session_reconnects_after_workbook_closed(processor, fake, master):
+    assert processor.append_orders_to_excel(make_orders(1))[0]
+    fake.excel.Workbooks._items[0].Close()
+    assert processor.append_orders_to_excel(make_orders(1))[0]
+    assert fake.dispatch_count == 1
+    assert len(saved_rows(fake, master)) == 3
+
+
+def test_session_reconnects_after_excel_quit(processor, fake, master):
+    assert processor.append_orders_to_excel(make_orders(1))[0]
+    fake.excel.Quit()
+    assert processor.append_orders_to_excel(make_orders(1))[0]
+    assert fake.dispatch_count == 2
+    assert len(saved_rows(fake, master)) == 3
+
+
+def test_cancel_before_save_undoes_rows(processor, fake, master):
+    assert processor.append_orders_to_excel(make_orders(2))[0]
+    cancel = threading.Event()
+    ok, msg = processor.append_orders_to_excel(make_orders(5), progress=lambda done, total: cancel.set(),
+                                               cancel=cancel)
+    assert not ok and "취소" in msg
+    assert len(saved_rows(fake, master)) == 1 + 2
+    assert fake.excel.Workbooks._items[0].save_count == 1
+
+
+def test_save_failure_undoes_rows(processor, fake, master, monkeypatch):
+    assert processor.append_orders_to_excel(make_orders(2))[0]
+
+    def fail(self):
+        raise RuntimeError("디스크가 가득 찼습니다")
+
+    monkeypatch.setattr(FakeWorkbook, "Save", fail)
+    ok, msg = processor.append_orders_to_excel(make_orders(5))
+    assert not ok and "디스크가 가득 찼습니다" in msg
+    assert len(saved_rows(fake, master)) == 1 + 2
+
+    monkeypatch.undo()
+    assert processor.append_orders_to_excel(make_orders(1))[0]
+    assert len(saved_rows(fake, master)) == 1 + 3
+
+
+def test_close_quits_excel_we_started(fake, master):
+    session = ExcelSession(master, fake.as_backend())
+    session.run(lambda workbook: workbook.Save())
+    excel = fake.excel
+    session.close()
+    assert not excel.running
+    assert fake.com_depth == 0
+
+
+def test_close_leaves_users_excel_and_workbook_open(fake, master):
+    excel = fake.excel = FakeExcel(fake.disk)
+    workbook = excel.Workbooks.Open(master)
+    session = ExcelSession(master, fake.as_backend())
+    assert session.run(lambda wb: wb) is workbook
+    session.close()
+    assert excel.running
+    assert not workbook.closed
+    assert fake.dispatch_count == 0
+
+
+def test_close_keeps_users_excel_but_closes_our_workbook(fake, master):
+    excel = fake.excel = FakeExcel(fake.disk)
+    session = ExcelSession(master, fake.as_backend())
+    workbook = session.run(lambda wb: wb)
+    session.close()
+    assert excel.running
+    assert workbook.closed
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_zero_idle_timeout_releases_after_each_save(master, fake, catalog_df):
+    processor = OrderProcessor(master, use_snapshot=False, source_df=catalog_df, excel_backend=fake.as_backend(),
+                               excel_idle_timeout=0)
+    try:
+        assert processor.append_orders_to_excel(make_orders(2))[0]
+        first = fake.excel
+        assert not first.running
+        assert processor.append_orders_to_excel(make_orders(1))[0]
+        assert not fake.excel.running and fake.excel is not first
+        assert fake.dispatch_count == 2
+        assert len(saved_rows(fake, master)) == 1 + 3
+    finally:
+        processor.close()
+    assert fake.com_depth == 0
+
+
+def test_zero_idle_timeout_releases_after_failed_save(master, fake, catalog_df, monkeypatch):
+    processor = OrderProcessor(master, use_snapshot=False, source_df=catalog_df, excel_backend=fake.as_backend(),
+                               excel_idle_timeout=0)
+    monkeypatch.setattr(FakeWorkbook, "Save", lambda self: 1 / 0)
+    try:
+        assert not processor.append_orders_to_excel(make_orders(1))[0]
+        assert not fake.excel.running
+    finally:
+        processor.close()
+
+
+def test_idle_timeout_releases_workbook_and_reopens(fake, master):
+    session = ExcelSession(master, fake.as_backend(), idle_timeout=0.05)
+    try:
+        workbook = session.run(lambda wb: wb)
+        excel = fake.excel
+        assert wait_until(lambda: workbook.closed)
+        assert not excel.running
+        # COM 스레드는 유지하고 다음 호출 때 다시 염
+        assert fake.com_depth == 1
+        assert session.run(lambda wb: wb) is not workbook
+        assert fake.dispatch_count == 2
+    finally:
+        session.close()
+    assert fake.com_depth == 0
+
+
+def test_calls_within_idle_timeout_reuse_workbook(fake, master):
+    session = ExcelSession(master, fake.as_backend(), idle_timeout=0.3)
+    try:
+        workbook = session.run(lambda wb: wb)
+        for _ in range(5):
+            # 호출마다 유휴 시간이 다시 시작되므로 총 시간이 제한을 넘어도 닫히지 않음
+            time.sleep(0.1)
+            assert session.run(lambda wb: wb) is workbook
+        assert fake.dispatch_count == 1
+        assert wait_until(lambda: workbook.closed)
+    finally:
+        session.close()
+
+
+def test_idle_release_leaves_users_workbook_open(fake, master):
+    excel = fake.excel = FakeExcel(fake.disk)
+    workbook = excel.Workbooks.Open(master)
+    session = ExcelSession(master, fake.as_backend(), idle_timeout=0.01)
+    try:
+        assert session.run(lambda wb: wb) is workbook
+        assert wait_until(lambda: session._workbook is None)
+        assert excel.running and not workbook.closed
+        assert session.run(lambda wb: wb) is workbook
+    finally:
+        session.close()
+
+
+def test_no_idle_timeout_keeps_workbook_until_close(fake, master):
+    session = ExcelSession(master, fake.as_backend(), idle_timeout=None)
+    workbook = session.run(lambda wb: wb)
+    time.sleep(0.05)
+    assert not workbook.closed
+    session.close()
+    assert workbook.closed
+
+
+def test_close_cancels_pending_idle_release(fake, master):
+    session = ExcelSession(master, fake.as_backend(), idle_timeout=0.05)
+    workbook = session.run(lambda wb: wb)
+    session.close()
+    assert workbook.closed and session._idle_timer is None
+    time.sleep(0.1)
+    assert fake.com_depth == 0
@@ -0,0 +1,58 @@
+"""
+FuzzyIndex.search 회귀 테스트.
+
+모든 후보의 점수를 계산해 정렬하는 단순한 방법(exhaustive)과 상위 k개가 같아야 합니다.
+카탈로그와 질의는 benchmarks/synth_catalog로 고정 시드로 만듭니다.
+"""
+import heapq
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+from safian.fuzzy import FuzzyIndex, FuzzyMatch, fuzzy_key
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synth_catalog import generate_catalog, sample_queries  # noqa: E402
+
+
+def exhaustive(index, hint, k=5, min_score=0.4):
+    key = fuzzy_key(hint)
+    grams = index._grams(key)
+    shared = Counter()
+    for gram in grams:
+        shared.update(index._postings.get(gram, ()))
+    scored = [FuzzyMatch(pos, round(index._score(key, len(grams), pos, count), 4)) for pos, count in shared.items()]
+    scored = [match for match in scored if match.score >= min_score]
+    return heapq.nsmallest(k, scored, key=lambda m: (-m.score, m.pos))
+
+
+@pytest.fixture(scope="module")
+def synth():
+    df = generate_catalog(3000, seed=7)
+    queries = sample_queries(df, 60, seed=7)
+    return FuzzyIndex(df["제품명"]), queries["fuzzy"] + queries["name_hit"] + queries["prefix"]
+
+
+def test_search_matches_exhaustive(synth):
+    index, hints = synth
+    for hint in hints:
+        assert index.search(hint, budget=10.0) == exhaustive(index, hint), hint
+
+
+def test_zero_budget_still_finds_exact_name(synth):
+    index, _ = synth
+    # 예산이 없어도 가장 드문 게시목록은 끝까지 세므로 제품명 그대로는 찾음
+    for pos in (0, 1234, 2999):
+        found = index.search(index.keys[pos], budget=0.0)
+        assert found and found[0].score >= 0.9
+        assert [m.score for m in found] == sorted((m.score for m in found), reverse=True)
+
+
+def test_short_hint_prefers_contained_names():
+    index = FuzzyIndex(["나주배 선물세트 대용량", "배나무", "나주배", "사과 나주"])
+    found = index.search("나주배")
+    assert [m.pos for m in found[:2]] == [2, 0]
+    assert found[0].score == 1.0
+    assert index.search("") == [] and FuzzyIndex([]).search("나주배") == []
@@ -0,0 +1,126 @@
+"""
+거래처 주문서 가져오기(safian.importer) 테스트.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from safian.excel_sink import ORDER_COLUMNS
+from safian.importer import (ImportProfile, import_orders, load_profile, map_columns, normalize_phones,
+                             normalize_quantities, save_profile)
+
+
+def test_map_columns_joins_sources_and_fills_partner_defaults():
+    df = pd.DataFrame({
+        "주소": [" 서울 강남구 ", "부산 해운대구", None],
+        "상세주소": ["101호", None, "2층"],
+        "거래처": ["", "B상사", ""],
+        "비용": ["", "3000", None],
+    })
+    profile = ImportProfile("t", {"주소": ["주소", "상세주소", "없는컬럼"], "거래처명": "거래처", "배송비": "비용"},
+                            partner="A상사", defaults={"배송비": 0, "수량": "1"})
+    out = map_columns(df, profile)
+    assert list(out.columns) == ORDER_COLUMNS
+    assert out["주소"].tolist() == ["서울 강남구 101호", "부산 해운대구", "2층"]
+    assert out["거래처명"].tolist() == ["A상사", "B상사", "A상사"]
+    assert out["배송비"].tolist() == ["0", "3000", "0"]
+    assert out["수량"].tolist() == ["1", "1", "1"]
+    assert out["주문번호"].tolist() == ["", "", ""]
+
+
+def test_profile_defaults_are_not_shared():
+    first = ImportProfile("a", {})
+    second = ImportProfile("b", {})
+    assert first.defaults is None and second.defaults is None
+    out = map_columns(pd.DataFrame({"x": ["1"]}), first)
+    assert (out == "").all(axis=None)
+
+
+def test_load_profile_validates_columns_and_defaults(tmp_path):
+    path = tmp_path / "거래처.json"
+    path.write_text(json.dumps({"columns": {"바코드": "코드"}}, ensure_ascii=False), encoding="utf-8")
+    profile = load_profile(path)
+    assert profile.name == "거래처" and profile.defaults is None
+
+    save_profile(profile._replace(defaults={"배송비": "0"}), path)
+    assert load_profile(path).defaults == {"배송비": "0"}
+
+    for field, value in (("columns", {"바코드": "코드", "바쿄드": "x"}), ("defaults", {"배송빈": "0"})):
+        path.write_text(json.dumps({"columns": {"바코드": "코드"}, field: value}, ensure_ascii=False), encoding="utf-8")
+        with pytest.raises(ValueError, match=field):
+            load_profile(path)
+
+
+def test_normalize_phones():
+    series = pd.Series(["010 1234 5678", "0311234567", "02-123-4567", "", "1588-1234", "+82 10-1234-5678"])
+    # 11자리, 10자리만 바꾸고 그 외 길이(9자리 02 지역번호, 대표번호, 국가번호 포함)는 원문 그대로
+    assert normalize_phones(series).tolist() == ["010-1234-5678", "031-123-4567", "02-123-4567", "", "1588-1234",
+                                                 "+82 10-1234-5678"]
+
+
+def test_normalize_quantities():
+    series = pd.Series(["2개", "03", "", "3 박스", "0", "낱개"])
+    assert normalize_quantities(series).tolist() == ["2", "3", "1", "3", "1", "1"]
+
+
+class CountingLookup:
+    """OrderProcessor 일괄 조회 대용: 호출 인자를 기록"""
+
+    def __init__(self, catalog, names):
+        self.catalog = catalog
+        self.names = names
+        self.barcode_calls = []
+        self.name_calls = []
+
+    def lookup_barcodes(self, barcodes):
+        self.barcode_calls.append(list(barcodes))
+        return [self.catalog.get(barcode, []) for barcode in barcodes]
+
+    def resolve_names(self, names):
+        self.name_calls.append(list(names))
+        return [self.names.get(name) for name in names]
+
+
+CATALOG = {
+    "A001": [{'type': '본품', 'product_name': '나주배', 'barcode': 'A001'},
+             {'type': '사은품', 'product_name': '배즙', 'barcode': 'G001'}],
+    "B001": [{'type': '본품', 'product_name': '사과', 'barcode': 'B001'}],
+}
+
+
+def test_import_orders_resolves_by_barcode_then_name_once(tmp_path):
+    path = tmp_path / "주문.csv"
+    rows = [
+        "주문서 제목,,,",
+        "수령자,연락처,바코드,상품명,수량",
+        "김철수,01012345678,A001,,2개",
+        "이영희,0311234567,,사과,",
+        "박민수,,X999,사과,03",
+        "최지우,,X999,없는상품,1",
+        ",,,,",
+        "정하나,,,없는상품,1",
+    ]
+    path.write_text("\n".join(rows), encoding="utf-8-sig")
+    profile = ImportProfile("t", {"수취인": "수령자", "핸드폰": "연락처", "바코드": "바코드", "제품명": "상품명", "수량": "수량"},
+                            header_row=1)
+    lookup = CountingLookup(CATALOG, {"사과": "B001"})
+    result = import_orders(path, profile, lookup.lookup_barcodes, lookup.resolve_names)
+
+    assert result.orders == 5
+    # 제품명은 종류별로 한 번만 검색
+    assert len(lookup.name_calls) == 1 and sorted(lookup.name_calls[0]) == ["사과", "없는상품"]
+    assert sorted(lookup.barcode_calls[0]) == ["A001", "X999"]
+    # 엑셀 행 번호: 헤더가 2번째 줄이므로 첫 주문은 3행
+    assert result.unresolved == [6, 8]
+
+    records = [record for record, _ in result.rows]
+    assert [(r["수취인"], r["바코드"], r["수량"]) for r in records] == [
+        ("김철수", "A001", "2"), ("김철수", "G001", "2"),
+        ("이영희", "B001", "1"),
+        ("박민수", "B001", "3"),
+        ("최지우", "X999", "1"),
+        ("정하나", "", "1"),
+    ]
+    assert records[0]["핸드폰"] == "010-1234-5678" and records[2]["핸드폰"] == "031-123-4567"
+    assert records[4]["제품명"] == "없는상품"
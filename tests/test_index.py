@@ -0,0 +1,78 @@
+"""
+NgramIndex 회귀 테스트.
+
+원래의 iterrows 검색(공백 제거 후 '제품명 in 힌트 or 힌트 in 제품명'인 첫 행)과 같은 행을 찾아야 합니다.
+카탈로그와 질의는 benchmarks/synth_catalog로 고정 시드로 만듭니다.
+"""
+import os
+import random
+import sys
+
+import pytest
+
+from safian.index import NgramIndex
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synth_catalog import generate_catalog, sample_queries  # noqa: E402
+
+
+def baseline_names(df):
+    """기존 검색이 iterrows로 행마다 만들던 공백 제거 제품명 (질의마다 다시 훑지 않도록 한 번만)"""
+    return [row['제품명'].replace(" ", "") for _, row in df.iterrows()]
+
+
+def baseline_matches(names, hint):
+    """기존 find_barcode_by_product_name의 포함관계 비교를 모든 행에 적용한 일치 위치 목록"""
+    hint_clean = hint.replace(" ", "")
+    return [pos for pos, prod_name_clean in enumerate(names)
+            if prod_name_clean in hint_clean or hint_clean in prod_name_clean]
+
+
+@pytest.fixture(scope="module")
+def synth():
+    df = generate_catalog(1500, seed=3)
+    queries = sample_queries(df, 40, seed=3)
+    names = df["제품명"].tolist()
+    r = random.Random(3)
+    extra = []
+    for name in r.sample(names, 20):
+        # 제품명이 힌트에 포함되는 경우 (앞뒤에 다른 말이 붙은 주문), 짧은 힌트, 공백 위치가 다른 힌트
+        extra.append(f"주문 {name} 2개 부탁")
+        extra.append(name.replace(" ", "")[r.randrange(3):][:2])
+        extra.append(" ".join(name.replace(" ", "")))
+    hints = queries["name_hit"] + queries["name_miss"] + queries["fuzzy"] + extra
+    return baseline_names(df), NgramIndex(df["제품명"]), hints
+
+
+def test_matches_first_and_best_agree_with_baseline_scan(synth):
+    names, index, hints = synth
+    for hint in hints:
+        expected = baseline_matches(names, hint)
+        assert index.matches(hint) == expected, hint
+        assert index.first(hint) == (expected[0] if expected else None), hint
+        clean = hint.replace(" ", "")
+        best = min(expected, key=lambda pos: (abs(len(index.names[pos]) - len(clean)), pos)) if expected else None
+        assert index.best(hint) == best, hint
+
+
+def test_many_matches_scalar(synth):
+    _, index, hints = synth
+    hints = hints + hints[:15] + [None, ""]
+    assert index.first_many(hints) == [index.first(hint or "") for hint in hints]
+    assert index.best_many(hints) == [index.best(hint or "") for hint in hints]
+
+
+def test_small_catalog(catalog_df):
+    index = NgramIndex(catalog_df["제품명"])
+    assert index.first("나주배") == 0
+    assert index.best("나주배즙") == 1
+    assert index.first("세피앙듀얼픽스 프로티크 2개") == 2
+    assert index.matches("배즙") == [1, 3]
+    assert index.first("없는상품") is None
+
+
+def test_whitespace_only_hint_matches_nothing(catalog_df):
+    # 기존 검색은 공백뿐인 힌트를 첫 행에 매칭했지만, 일괄 조회와 같게 일치 없음으로 처리
+    index = NgramIndex(catalog_df["제품명"])
+    assert index.first(" ") is None and index.best("  ") is None and index.matches(" ") == []
+    assert index.first_many([" ", "사과"]) == [None, 4]
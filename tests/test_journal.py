@@ -0,0 +1,123 @@
+"""
+주문 저널(safian.journal) 테스트: 재실행 후 복원, 저장 완료 표시와 재시도 시 중복 저장 방지.
+"""
+import sqlite3
+import time
+
+import pytest
+
+from safian import journal as journal_module
+from safian.journal import JournalEntry, OrderJournal
+
+
+def order(n):
+    return {"수취인": f"고객{n}", "바코드": f"A{n:03d}", "수량": "1"}, ("본품", f"고객{n}", f"A{n:03d}")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "queue.db")
+
+
+def test_pending_survives_reopen(path):
+    journal = OrderJournal(path)
+    ids = journal.add([order(1), order(2)]) + journal.add([order(3)])
+    journal.mark_exported(ids[:1], "발주서.xlsb")
+    journal.remove(ids[2:])
+    # close() 없이 버려도(비정상 종료) 커밋된 행은 남아 있어야 함
+    del journal
+
+    reopened = OrderJournal(path)
+    try:
+        assert reopened.pending() == [JournalEntry(ids[1], *order(2))]
+        assert reopened.last_export_target() == "발주서.xlsb"
+    finally:
+        reopened.close()
+
+
+def test_add_keeps_input_order_and_returns_ids(path):
+    journal = OrderJournal(path)
+    ids = journal.add([order(n) for n in range(5)])
+    assert [entry.id for entry in journal.pending()] == ids == sorted(ids)
+    assert [entry.data for entry in journal.pending()] == [order(n)[0] for n in range(5)]
+    assert journal.add([]) == []
+    journal.close()
+
+
+def test_failed_save_then_retry_exports_each_row_once(path):
+    journal = OrderJournal(path)
+    first = journal.add([order(1), order(2)])
+
+    exported = []
+
+    def save(entries, success):
+        """GUI 저장과 같은 순서: 대기 행을 보내고 성공했을 때만 표시"""
+        ids = [entry.id for entry in entries]
+        if success:
+            exported.extend(entry.data["수취인"] for entry in entries)
+            journal.mark_exported(ids, "발주서.xlsb")
+
+    save(journal.pending(), success=False)
+    assert [entry.id for entry in journal.pending()] == first
+
+    # 실패 후 새 주문이 추가되고 재시도: 남은 행만 한 번씩 저장
+    second = journal.add([order(3)])
+    save(journal.pending(), success=True)
+    save(journal.pending(), success=True)
+    assert exported == ["고객1", "고객2", "고객3"]
+    assert journal.pending() == []
+
+    # 이미 저장된 행을 다시 표시하거나 삭제해도 저장 기록은 바뀌지 않음
+    journal.mark_exported(first + second, "다른파일.xlsx")
+    journal.remove(first)
+    assert journal.last_export_target() == "발주서.xlsb"
+    journal.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM orders WHERE export_target = '발주서.xlsb'").fetchone()[0] == 3
+
+
+def test_old_exported_rows_are_purged_on_open(path, monkeypatch):
+    journal = OrderJournal(path)
+    ids = journal.add([order(1), order(2)])
+    journal.mark_exported(ids[:1], "발주서.xlsb")
+    journal.close()
+
+    later = time.time() + journal_module.EXPORTED_RETENTION + 60
+    monkeypatch.setattr(journal_module.time, "time", lambda: later)
+    reopened = OrderJournal(path)
+    reopened.close()
+    with sqlite3.connect(path) as conn:
+        assert [row[0] for row in conn.execute("SELECT id FROM orders")] == ids[1:]
+
+
+def test_gui_save_marks_rows_only_after_success(path):
+    from safian import gui
+
+    class FlakyProcessor:
+        def __init__(self):
+            self.calls = []
+
+        def export_orders_to_xlsx(self, orders, target, report=None, cancel_event=None):
+            self.calls.append([row["수취인"] for row in orders])
+            # 첫 저장은 실패, 재시도는 성공
+            return len(self.calls) > 1, "결과"
+
+        def append_orders_to_excel(self, orders, report=None, cancel_event=None):
+            return self.export_orders_to_xlsx(orders, None, report, cancel_event)
+
+    class FakeTask:
+        report = None
+        cancel_event = None
+
+    app = gui.OrderApp.__new__(gui.OrderApp)
+    app.journal = OrderJournal(path)
+    app.processor = FlakyProcessor()
+    ids = app.journal.add([order(1), order(2)])
+    entries = app.journal.pending()
+
+    assert app._run_save(FakeTask(), ids, [entry.data for entry in entries], "out.xlsx")[0] is False
+    assert [entry.id for entry in app.journal.pending()] == ids
+    assert app._run_save(FakeTask(), ids, [entry.data for entry in entries], "out.xlsx")[0] is True
+    assert app.journal.pending() == []
+    assert app.processor.calls == [["고객1", "고객2"], ["고객1", "고객2"]]
+    app.journal.close()
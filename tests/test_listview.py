@@ -0,0 +1,54 @@
+"""
+대기 리스트 데이터 모델(OrderListModel) 테스트. (Tk 창 없이 실행)
+"""
+from safian.listview import DISPLAY_COLUMNS, OrderListModel, display_values
+
+
+def entry(n):
+    data = {"주문인": f"고객{n}", "주소": "서울", "핸드폰": "010-0000-0000", "바코드": f"A{n:03d}", "제품명": "배",
+            "수량": "1", "배송메모": ""}
+    return n, data, display_values(data, "본품")
+
+
+def test_display_values_follow_columns():
+    _, data, display = entry(1)
+    assert len(display) == len(DISPLAY_COLUMNS)
+    assert dict(zip(DISPLAY_COLUMNS, display))["상품명"] == "배"
+    assert display[-1] == "본품"
+
+
+def test_extend_keeps_order_and_membership():
+    model = OrderListModel()
+    model.extend([entry(3), entry(1)])
+    model.extend([entry(7)])
+    assert len(model) == 3
+    assert model.ids() == [3, 1, 7]
+    assert 1 in model and 2 not in model
+    assert model.id_at(0) == 3 and model.id_at(-1) == 7
+    assert [order["주문인"] for order in model.orders()] == ["고객3", "고객1", "고객7"]
+    # ids를 주면 그 순서대로, 없는 id는 건너뜀
+    assert [order["주문인"] for order in model.orders([7, 99, 3])] == ["고객7", "고객3"]
+
+
+def test_remove_returns_removed_rows_and_ignores_unknown_ids():
+    model = OrderListModel()
+    model.extend([entry(n) for n in range(6)])
+    removed = model.remove([4, 1, 99, 1])
+    assert [order["주문인"] for order in removed] == ["고객4", "고객1"]
+    assert model.ids() == [0, 2, 3, 5]
+    assert model.remove([99]) == []
+    assert model.remove([]) == []
+    assert len(model) == 4 and 4 not in model
+
+
+def test_window_slices_display_order():
+    model = OrderListModel()
+    model.extend([entry(n) for n in range(10)])
+    model.remove([2, 3])
+    window = model.window(1, 3)
+    assert [row_id for row_id, _ in window] == [1, 4, 5]
+    assert window[0][1] == entry(1)[2]
+    # 끝을 넘으면 남은 행만, 시작이 끝을 넘으면 빈 목록
+    assert [row_id for row_id, _ in model.window(6, 5)] == [8, 9]
+    assert model.window(8, 5) == []
+    assert model.window(0, 0) == []
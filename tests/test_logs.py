@@ -0,0 +1,23 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from safian.logs import get_logger, setup_logging, setup_worker_logging, shutdown_logging, worker_log_queue
+
+
+def test_worker_logs_are_written_by_parent_only(isolated_cwd):
+    # 다른 테스트가 다른 임시 폴더에 열어 둔 debug.log 대신 이 폴더에 새로 설정
+    shutdown_logging()
+    setup_logging()
+    spawn = multiprocessing.get_context("spawn")
+    log_queue, listener = worker_log_queue(spawn)
+    with ProcessPoolExecutor(2, mp_context=spawn, initializer=setup_worker_logging, initargs=(log_queue,)) as executor:
+        list(executor.map(get_logger("batch").warning, ["워커 로그 1", "워커 로그 2"]))
+    listener.stop()
+    get_logger().warning("부모 로그")
+    shutdown_logging()
+
+    with open("debug.log", encoding="utf-8") as f:
+        content = f.read()
+    assert "워커 로그 1" in content and "워커 로그 2" in content and "부모 로그" in content
+    assert not [name for name in os.listdir(isolated_cwd) if name.startswith("debug") and name != "debug.log"]
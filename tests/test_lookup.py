@@ -0,0 +1,98 @@
+"""
+일괄 조회(find_barcodes_by_product_names / lookup_products_by_barcodes / resolve_many) 회귀 테스트.
+
+일괄 결과는 같은 입력을 한 건씩 조회한 결과와 순서까지 같아야 합니다.
+"""
+import os
+import sys
+
+import pytest
+
+from safian.core import OrderProcessor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synth_catalog import generate_catalog, sample_queries  # noqa: E402
+
+
+@pytest.fixture
+def processor(catalog_df):
+    processor = OrderProcessor.from_dataframe(catalog_df)
+    yield processor
+    processor.close()
+
+
+@pytest.fixture(scope="module")
+def synth():
+    df = generate_catalog(2000, seed=11)
+    processor = OrderProcessor.from_dataframe(df)
+    yield processor, sample_queries(df, 40, seed=11)
+    processor.close()
+
+
+HINTS = ["나주배", "사과", "", None, "없는상품", "듀얼픽스", "나주배", " 나주 배 ", "배즙", "사과"]
+
+
+@pytest.mark.parametrize("first_match", [True, False])
+def test_names_batch_matches_scalar_in_order(processor, first_match):
+    batch = processor.find_barcodes_by_product_names(HINTS, first_match)
+    assert batch == [processor.find_barcode_by_product_name(hint, first_match) for hint in HINTS]
+    # 같은 힌트(공백 차이 포함)는 같은 결과
+    assert batch[0] == batch[6] == batch[7]
+    assert batch[1] == batch[9]
+    assert batch[2] == batch[3] == batch[4] == []
+
+
+@pytest.mark.parametrize("hint", [" ", "   ", "\t"])
+def test_whitespace_hint_matches_nothing_on_both_paths(processor, hint):
+    assert processor.find_barcode_by_product_name(hint) == []
+    assert processor.find_barcode_by_product_name(hint, first_match=False) == []
+    assert processor.find_barcodes_by_product_names([hint, "사과"]) == [[], processor.find_barcode_by_product_name("사과")]
+    assert processor.resolve_many(["", "X"], [hint, hint]) == [[], []]
+
+
+def test_barcodes_batch_matches_scalar(processor):
+    barcodes = ["B001", "A001", "", None, "NOPE", "B001", "G002", "G999"]
+    batch = processor.lookup_products_by_barcodes(barcodes)
+    assert batch == [processor.lookup_product_by_barcode(barcode) for barcode in barcodes]
+    assert batch[2] == batch[3] == batch[4] == batch[7] == []
+
+
+def test_barcode_bundle_expansion(processor):
+    items = processor.lookup_products_by_barcodes(["B001"])[0]
+    # 시트에 없는 사은품(G999)도 기존 조회처럼 바코드는 그대로 남음
+    assert [(item['type'], item['barcode']) for item in items] == [("본품", "B001"), ("사은품", "G002"), ("사은품", "G999")]
+    assert items[1]['product_name'] == "사과 1kg"
+    assert items == processor.lookup_product_by_barcode("B001")
+
+
+def test_resolve_many_prefers_barcode_then_hint(processor):
+    barcodes = ["A001", "", "X", "B001", None]
+    hints = ["사과", "나주배즙", "사과", "", "세피앙"]
+    result = processor.resolve_many(barcodes, hints)
+    assert result == [
+        processor.lookup_product_by_barcode("A001"),
+        processor.find_barcode_by_product_name("나주배즙"),
+        processor.find_barcode_by_product_name("사과"),
+        processor.lookup_product_by_barcode("B001"),
+        processor.find_barcode_by_product_name("세피앙"),
+    ]
+
+
+def test_resolve_many_single_sided_and_length_check(processor):
+    assert processor.resolve_many() == []
+    assert processor.resolve_many(barcodes=["A002", "X"]) == processor.lookup_products_by_barcodes(["A002", "X"])
+    assert processor.resolve_many(hints=["사과", ""]) == processor.find_barcodes_by_product_names(["사과", ""])
+    with pytest.raises(ValueError):
+        processor.resolve_many(["A001"], ["사과", "배"])
+
+
+@pytest.mark.parametrize("first_match", [True, False])
+def test_synthetic_batch_matches_scalar(synth, first_match):
+    processor, queries = synth
+    hints = queries["name_hit"] + queries["name_miss"] + queries["name_hit"][:10]
+    assert processor.find_barcodes_by_product_names(hints, first_match) == \
+        [processor.find_barcode_by_product_name(hint, first_match) for hint in hints]
+
+    barcodes = queries["barcode_hit"] + queries["barcode_miss"] + queries["gift_expand"] + queries["barcode_hit"][:10]
+    assert processor.lookup_products_by_barcodes(barcodes) == \
+        [processor.lookup_product_by_barcode(barcode) for barcode in barcodes]
@@ -0,0 +1,36 @@
+"""
+parse_order_text 회귀 테스트.
+
+data/parser_corpus.jsonl의 기대값은 정규식을 미리 컴파일하기 전(user-010 이전)의 parser로 만든 것입니다.
+- 가상 주문 1200건: benchmarks/synth_orders.generate_orders(1200, seed=2026, kind="mixed")
+- 주소/상품/메모 조각을 무작위로 이어 붙인 문자열 300건(random.Random(2026))과 경계 사례 몇 건
+  (조각 문자열은 extract_* 함수별 결과도 함께 비교)
+parser를 고친 뒤 결과가 달라지면 의도한 변경인지 확인하고, 의도한 것이면 기대값을 다시 만들어야 합니다.
+"""
+import json
+import os
+
+import pytest
+
+from safian import parser
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "parser_corpus.jsonl")
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_corpus_covers_kakao_and_tab_orders():
+    texts = [case["text"] for case in load_corpus()]
+    assert len(texts) > 1000
+    assert any("\t" in text for text in texts) and any("\n" in text for text in texts)
+
+
+@pytest.mark.parametrize("case", load_corpus(), ids=lambda case: case["text"][:20])
+def test_matches_expected(case):
+    text = case["text"]
+    for name, expected in case["expected"].items():
+        result = getattr(parser, name)(text)
+        assert json.loads(json.dumps(result, ensure_ascii=False)) == expected, name
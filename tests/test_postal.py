@@ -0,0 +1,83 @@
+import pytest
+
+from safian.core import OrderProcessor
+from safian.postal import PostalIndex, build_postal_db, parse_road_address, sido_key
+
+ADDRESS_CSV = """시도명,시군구명,도로명,지하여부,건물본번,건물부번,우편번호
+서울특별시,종로구,세종대로,0,175,0,03172
+서울특별시,종로구,세종대로23길,0,47,0,03182
+서울특별시,송파구,올림픽로,0,240,0,05554
+서울특별시,송파구,올림픽로,1,240,0,05551
+서울특별시,강남구,테헤란로,0,152,1,06236
+서울특별시,강남구,테헤란로,0,152,2,06236
+서울특별시,강남구,논현로,0,10,1,06300
+서울특별시,강남구,논현로,0,10,2,06301
+대전광역시,중구,중앙로,0,1,0,34940
+부산광역시,중구,중앙로,0,1,0,48940
+경기도,부천시 원미구,중앙로12번길,0,3,1,14545
+"""
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("서울 종로구 세종대로23길 47", ("세종대로23길", 47, 0, ["서울", "종로구"])),
+    ("경기 부천시 중앙로12번길 3-1", ("중앙로12번길", 3, 1, ["경기", "부천시"])),
+    ("서울 강남구 논현로 28길 5", ("논현로28길", 5, 0, ["서울", "강남구"])),
+    ("서울 송파구 올림픽로 지하 240", ("올림픽로지하", 240, 0, ["서울", "송파구"])),
+    ("경기 성남시 분당구 판교역로 235 에이치스퀘어", ("판교역로", 235, 0, ["경기", "성남시", "분당구"])),
+    ("서울 강남구 역삼동 123-4", None),
+    ("", None),
+])
+def test_parse_road_address(address, expected):
+    assert parse_road_address(address) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("서울특별시", "서울"), ("서울시", "서울"), ("서울", "서울"), ("부산광역시", "부산"), ("경기도", "경기"),
+    ("충청북도", "충북"), ("경상남도", "경남"), ("전북특별자치도", "전북"), ("세종특별자치시", "세종"), ("", ""),
+])
+def test_sido_key(name, expected):
+    assert sido_key(name) == expected
+
+
+@pytest.fixture
+def postal_db(tmp_path):
+    source = tmp_path / "주소.csv"
+    source.write_text(ADDRESS_CSV, encoding="utf-8")
+    db_path = str(tmp_path / "postal_codes.db")
+    assert build_postal_db([str(source)], db_path) == 11
+    return db_path
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("서울 종로구 세종대로 175", "03172"),
+    ("서울특별시 종로구 세종대로23길 47 3층", "03182"),
+    ("서울 송파구 올림픽로 240", "05554"),
+    ("서울 송파구 올림픽로 지하 240", "05551"),
+    ("경기 부천시 중앙로12번길 3-1", "14545"),
+    # 부번을 빼고 써도 본번 건물들의 우편번호가 하나면 사용, 여러 개면 빈칸
+    ("서울 강남구 테헤란로 152", "06236"),
+    ("서울 강남구 논현로 10", ""),
+    # 같은 도로명/번호가 여러 지역에 있으면 지역으로 고르고, 지역이 없으면 정하지 않음
+    ("대전 중구 중앙로 1", "34940"),
+    ("부산광역시 중구 중앙로 1", "48940"),
+    ("중앙로 1", ""),
+    ("서울 강남구 역삼동 123-4", ""),
+    ("서울 종로구 없는로 1", ""),
+])
+def test_postal_code_round_trip(postal_db, address, expected):
+    index = PostalIndex(postal_db)
+    try:
+        assert index.postal_code(address) == expected
+        assert index.count() == 11
+    finally:
+        index.close()
+
+
+def test_processor_lookup_does_not_count_table(postal_db, catalog_df, monkeypatch):
+    # 진리값 확인으로 테이블 전체를 세지 않아야 함 (주문마다 COUNT(*)가 돌면 조회가 수십 ms)
+    monkeypatch.setattr(PostalIndex, "count", lambda self: pytest.fail("count() called"), raising=True)
+    processor = OrderProcessor.from_dataframe(catalog_df, postal_db=postal_db)
+    assert processor.postal_codes(["서울 종로구 세종대로 175", "대전 중구 중앙로 1", ""]) == ["03172", "34940", ""]
+    assert processor._postal.cache_info().misses == 2
+    processor.close()
+    assert processor._postal is None
@@ -0,0 +1,126 @@
+"""
+PrefixIndex.search 회귀 테스트.
+
+제품명을 단어로 나눠 자모 문자열의 각 단어 시작 위치에서 startswith로 비교하는 단순한 방법(brute force)과
+찾는 행 집합이 같아야 합니다. 카탈로그와 질의는 benchmarks/synth_catalog로 고정 시드로 만듭니다.
+"""
+import os
+import sys
+
+import pytest
+
+from safian.catalog import rows_from_dataframe
+from safian.fuzzy import FuzzyIndex
+from safian.hangul import chosung, decompose
+from safian.prefix import _STRIP_PATTERN, _WORD_SPLIT, PrefixIndex
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synth_catalog import generate_catalog, sample_queries  # noqa: E402
+
+
+def prepare(rows):
+    """행마다 (소문자 품번, [단어 자모 문자열...], 초성 문자열, [단어...])"""
+    prepared = []
+    for barcode, name, _ in rows:
+        words = [w for w in _WORD_SPLIT.split(str(name).lower()) if w]
+        prepared.append((str(barcode).lower(), [decompose(w) for w in words], chosung("".join(words)), words))
+    return prepared
+
+
+def brute_force(prepared, text):
+    """입력으로 시작하는 품번, 또는 입력이 어느 단어 시작부터 이어지는 제품명의 행 위치 집합"""
+    query = _STRIP_PATTERN.sub('', str(text).lower())
+    if not query:
+        return set()
+    chosung_only = all('ㄱ' <= ch <= 'ㅎ' for ch in query)
+    target = query if chosung_only else decompose(query)
+    found = set()
+    for pos, (code, jamo_words, chosung_key, words) in enumerate(prepared):
+        if chosung_only:
+            key, parts = chosung_key, words
+        else:
+            if code.startswith(query):
+                found.add(pos)
+                continue
+            key, parts = "".join(jamo_words), jamo_words
+        offset = 0
+        for part in parts:
+            if key.startswith(target, offset):
+                found.add(pos)
+                break
+            offset += len(part)
+    return found
+
+
+@pytest.fixture(scope="module")
+def synth():
+    df = generate_catalog(3000, seed=5)
+    rows = rows_from_dataframe(df)
+    queries = sample_queries(df, 80, seed=5)
+    return rows, PrefixIndex(rows), queries, prepare(rows)
+
+
+def test_search_matches_brute_force(synth):
+    rows, index, queries, prepared = synth
+    hints = queries["prefix"] + queries["name_hit"] + queries["name_miss"] + [code[:4] for code in queries["barcode_hit"]]
+    for hint in hints:
+        assert set(index.search(hint, limit=len(rows))) == brute_force(prepared, hint), hint
+
+
+def test_search_respects_limit_without_duplicates(synth):
+    rows, index, queries, prepared = synth
+    for hint in queries["prefix"] + ["a", "ㅅ", "세"]:
+        expected = brute_force(prepared, hint)
+        for limit in (1, 3, 10):
+            found = index.search(hint, limit=limit)
+            assert len(found) == len(set(found)) == min(limit, len(expected))
+            assert set(found) <= expected
+
+
+def test_shared_jamo_keys_give_same_results(synth):
+    rows, index, queries, _ = synth
+    shared = PrefixIndex(rows, jamo_keys=FuzzyIndex(name for _, name, _ in rows).keys)
+    for hint in queries["prefix"] + queries["name_hit"]:
+        assert shared.search(hint, limit=50) == index.search(hint, limit=50)
+
+
+ROWS = [
+    ("B250", "세피앙 듀얼픽스 프로 티크 (B250)", []),
+    ("B251", "세피앙 듀얼 카시트", []),
+    ("A100", "듀얼픽스 i-Size", []),
+    ("C300", "프로 b25 어댑터", []),
+    ("D400", "나주배즙 30포", []),
+]
+
+
+@pytest.fixture
+def small():
+    return PrefixIndex(ROWS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("듀어", {0, 1, 2}),        # 조합 중인 글자 ("듀얼"의 앞부분)
+    ("듀얼픽", {0, 2}),
+    ("듀얼픽스프", {0}),        # 단어 경계를 넘어 다음 단어로 이어짐
+    ("ㄷㅇㅍ", {0, 2}),         # 초성만
+    ("ㅍㄹ", {0, 3}),
+    ("ㄴㅈ", {4}),
+    ("b25", {0, 1, 3}),         # 품번 접두어 + 제품명 단어 'b25'
+    ("B250", {0}),
+    ("isi", {2}),               # 기호 제거 ("i-Size" -> "isize")
+    ("픽스", set()),            # 단어 중간은 일치하지 않음
+    ("없음", set()),
+])
+def test_small_catalog(small, text, expected):
+    assert set(small.search(text)) == expected == brute_force(prepare(ROWS), text)
+
+
+def test_codes_come_before_names_and_are_not_repeated(small):
+    # B250/B251은 품번으로, C300은 제품명 단어로 일치. 품번과 제품명에 모두 걸리는 B250은 한 번만
+    assert small.search("b25") == [0, 1, 3]
+    assert small.search("b25", limit=2) == [0, 1]
+
+
+@pytest.mark.parametrize("text", ["", " ", "-_/", "()·"])
+def test_empty_or_separator_only_query(small, text):
+    assert small.search(text) == []
@@ -0,0 +1,42 @@
+"""
+마스터 다시 읽기 요약(diff_catalogs) 테스트.
+"""
+from safian.catalog import Catalog, ReloadSummary, diff_catalogs
+
+OLD = [
+    ("A001", "명품 나주배 5kg", ("G001",)),
+    ("A002", "나주배즙 30포", ()),
+    ("B001", "듀얼픽스", ("G002",)),
+    ("G001", "배즙 선물세트", ()),
+    ("G002", "사과 1kg", ()),
+]
+
+
+def test_added_removed_and_changed():
+    new = [
+        ("A001", "명품 나주배 5kg", ("G001",)),       # 그대로
+        ("A002", "나주배즙 50포", ()),                 # 제품명 변경
+        ("B001", "듀얼픽스", ("G002", "G001")),        # 사은품 변경
+        ("G001", "배즙 선물세트", ()),
+        ("G002", "사과 1kg", ()),
+        ("C001", "새 상품", ()),                       # 추가
+    ]
+    summary = diff_catalogs(Catalog(OLD), Catalog(new))
+    assert summary == ReloadSummary(added=("C001",), removed=(), changed=("A002", "B001"))
+    assert str(summary) == "추가 1건, 삭제 0건, 변경 2건"
+
+
+def test_removed_and_gift_rename_changes_owner():
+    new = [row for row in OLD if row[0] != "A002"]
+    new[-1] = ("G002", "사과 2kg", ())
+    summary = diff_catalogs(Catalog(OLD), Catalog(new))
+    assert summary.removed == ("A002",)
+    # 사은품 이름이 바뀌면 그 사은품이 달린 본품 묶음도 바뀐 것으로 봄
+    assert summary.changed == ("B001", "G002")
+    assert summary.added == ()
+
+
+def test_first_load_and_identical_reload():
+    catalog = Catalog(OLD)
+    assert diff_catalogs(None, catalog) == ReloadSummary(tuple(row[0] for row in OLD), (), ())
+    assert diff_catalogs(catalog, Catalog(list(OLD))) == ReloadSummary((), (), ())
@@ -0,0 +1,141 @@
+"""
+주문 분석 서버 테스트: 같은 카탈로그로 만든 로컬 OrderProcessor와 응답이 같아야 합니다.
+서버는 start_in_thread로 이 프로세스 안에서 빈 포트에 띄웁니다.
+"""
+import http.client
+import json
+
+import pytest
+
+from safian.core import OrderProcessor
+from safian.remote import RemoteProcessor
+from safian.server import start_in_thread
+
+ORDER = "홍길동\n010-1234-5678\n서울 종로구 세종대로 175\n나주배즙 30포 2개"
+
+
+@pytest.fixture
+def local(catalog_df):
+    processor = OrderProcessor.from_dataframe(catalog_df)
+    yield processor
+    processor.close()
+
+
+@pytest.fixture
+def server(catalog_df):
+    service, address, stop = start_in_thread(OrderProcessor.from_dataframe(catalog_df))
+    yield service, address
+    stop()
+
+
+def call(address, method, path, payload=None, raw=None):
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        body = raw if raw is not None else (None if payload is None else json.dumps(payload).encode("utf-8"))
+        conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read().decode("utf-8"))
+    finally:
+        conn.close()
+
+
+def test_health(server):
+    _, address = server
+    status, body = call(address, "GET", "/health")
+    assert status == 200
+    assert body["status"] == "ok" and body["products"] == 5
+
+
+def test_parse_matches_local(server, local):
+    _, address = server
+    assert call(address, "POST", "/parse", {"text": ORDER}) == (200, {"parsed": local.parse_order(ORDER)})
+    assert call(address, "POST", "/parse", {"texts": [ORDER, ""]}) == (
+        200, {"parsed": [local.parse_order(ORDER), local.parse_order("")]})
+
+
+def test_match_and_bundle_match_local(server, local):
+    _, address = server
+    hints = ["나주배즙", "듀얼픽스", "없는상품", ""]
+    for hint in hints:
+        for first_match in (True, False):
+            expected = local.find_barcode_by_product_name(hint, first_match) if hint else []
+            assert call(address, "POST", "/match", {"hint": hint, "first_match": first_match}) == (200, {"items": expected})
+    assert call(address, "POST", "/match", {"hints": hints}) == (
+        200, {"items": local.find_barcodes_by_product_names(hints)})
+
+    barcodes = ["A001", "B001", "G001", "X999"]
+    for barcode in barcodes:
+        assert call(address, "POST", "/bundle", {"barcode": barcode}) == (
+            200, {"items": local.lookup_product_by_barcode(barcode)})
+    assert call(address, "POST", "/bundle", {"barcodes": barcodes}) == (
+        200, {"items": local.lookup_products_by_barcodes(barcodes)})
+
+
+def test_resolve_matches_local(server, local):
+    _, address = server
+    barcodes, hints = ["A001", "", "X999"], ["", "듀얼픽스", "사과"]
+    assert call(address, "POST", "/resolve", {"barcodes": barcodes, "hints": hints}) == (
+        200, {"items": local.resolve_many(barcodes, hints)})
+    assert call(address, "POST", "/resolve", {"hints": hints, "first_match": False}) == (
+        200, {"items": local.resolve_many(None, hints, False)})
+
+
+def test_search_and_suggest_match_local(server, local):
+    _, address = server
+    assert call(address, "POST", "/search", {"hint": "나주 배즙", "k": 3}) == (
+        200, {"results": local.search_products("나주 배즙", k=3)})
+    assert call(address, "POST", "/suggest", {"prefix": "나주", "limit": 2}) == (
+        200, {"results": local.suggest_products("나주", limit=2)})
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/parse", {}),
+    ("/match", {"hint": 3}),
+    ("/bundle", {"barcodes": ["A001", 1]}),
+    ("/match", {"hint": "나주배", "first_match": "false"}),
+    ("/match", {"hints": ["나주배"], "first_match": 0}),
+    ("/resolve", {"barcodes": ["A001"], "hints": ["a", "b"]}),
+    ("/resolve", {"hints": ["나주배"], "first_match": "0"}),
+    ("/resolve", {"hints": ["나주배"], "first_match": None}),
+    ("/search", {"hint": "배즙", "k": "abc"}),
+    ("/search", {"hint": "배즙", "k": None}),
+    ("/search", {"hint": "배즙", "k": 0}),
+    ("/suggest", {"prefix": "나주", "limit": [1]}),
+    ("/suggest", {"prefix": "나주", "limit": True}),
+])
+def test_bad_requests_return_400(server, path, payload):
+    _, address = server
+    status, body = call(address, "POST", path, payload)
+    assert status == 400 and body["error"]
+
+
+def test_malformed_body_and_unknown_routes(server):
+    _, address = server
+    assert call(address, "POST", "/parse", raw=b"{not json")[0] == 400
+    assert call(address, "POST", "/parse", raw=b"[1, 2]")[0] == 400
+    assert call(address, "GET", "/parse")[0] == 405
+    assert call(address, "POST", "/nope", {})[0] == 404
+
+
+def test_full_queue_returns_503(catalog_df):
+    _, address, stop = start_in_thread(OrderProcessor.from_dataframe(catalog_df), max_pending=0)
+    try:
+        status, body = call(address, "POST", "/parse", {"text": ORDER})
+        assert status == 503 and body["error"]
+        # 작업 스레드를 거치지 않는 /health는 그대로 응답
+        assert call(address, "GET", "/health")[0] == 200
+    finally:
+        stop()
+
+
+def test_remote_processor_matches_local(server, local):
+    _, address = server
+    remote = RemoteProcessor(f"http://{address[0]}:{address[1]}", background=False)
+    try:
+        assert remote.product_count == local.product_count
+        assert remote.parse_order(ORDER) == local.parse_order(ORDER)
+        assert remote.find_barcode_by_product_name("나주배즙") == local.find_barcode_by_product_name("나주배즙")
+        assert remote.lookup_products_by_barcodes(["A001", "B001"]) == local.lookup_products_by_barcodes(["A001", "B001"])
+        assert remote.search_products("듀얼 픽스") == local.search_products("듀얼 픽스")
+    finally:
+        remote.close()
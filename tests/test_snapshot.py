@@ -0,0 +1,89 @@
+"""
+카탈로그 스냅샷(safian.snapshot) 테스트: 마스터 파일이 바뀌면 스냅샷을 쓰지 않아야 합니다.
+"""
+import os
+import pickle
+
+import pytest
+
+from safian import snapshot
+from safian.catalog import Catalog
+from safian.snapshot import fingerprint, load_snapshot, save_snapshot, snapshot_path
+
+
+@pytest.fixture
+def master(tmp_path):
+    path = tmp_path / "master.xlsb"
+    path.write_bytes(b"master-v1" * 100)
+    return str(path)
+
+
+@pytest.fixture
+def catalog(catalog_df):
+    return Catalog.from_dataframe(catalog_df)
+
+
+def touch(path, delta_ns):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+
+def test_round_trip(master, catalog, isolated_cwd):
+    assert load_snapshot(master) is None
+    assert save_snapshot(master, catalog)
+    assert snapshot_path(master).startswith(str(isolated_cwd / "cache"))
+    loaded = load_snapshot(master)
+    assert loaded.bundles == catalog.bundles
+    assert loaded.name_index.first("듀얼픽스") == catalog.name_index.first("듀얼픽스")
+    # 시트가 다르면 다른 스냅샷
+    assert load_snapshot(master, sheet="다른시트") is None
+
+
+def test_size_change_invalidates(master, catalog):
+    save_snapshot(master, catalog)
+    with open(master, "ab") as f:
+        f.write(b"x")
+    assert load_snapshot(master) is None
+
+
+def test_mtime_change_with_new_content_invalidates(master, catalog):
+    save_snapshot(master, catalog)
+    with open(master, "r+b") as f:
+        f.write(b"MASTER")   # 크기는 그대로, 내용만 바뀜
+    touch(master, 2_000_000_000)
+    assert load_snapshot(master) is None
+
+
+def test_mtime_change_with_same_content_is_reused_and_refreshed(master, catalog, monkeypatch):
+    save_snapshot(master, catalog)
+    touch(master, 2_000_000_000)   # 복사/동기화로 수정시각만 바뀜
+    assert load_snapshot(master).bundles == catalog.bundles
+    with open(snapshot_path(master), "rb") as f:
+        assert pickle.load(f)["mtime_ns"] == os.stat(master).st_mtime_ns
+
+    # 갱신된 뒤에는 내용 해시를 다시 구하지 않음
+    monkeypatch.setattr(snapshot, "content_hash", lambda *a, **k: pytest.fail("해시를 다시 구함"))
+    assert load_snapshot(master) is not None
+
+
+def test_file_changed_while_reading_is_not_saved(master, catalog):
+    before = fingerprint(master)
+    with open(master, "ab") as f:
+        f.write(b"saved during load")
+    assert not save_snapshot(master, catalog, before=before)
+    assert load_snapshot(master) is None
+
+
+def test_version_bump_invalidates(master, catalog, monkeypatch):
+    save_snapshot(master, catalog)
+    monkeypatch.setattr(snapshot, "SNAPSHOT_VERSION", snapshot.SNAPSHOT_VERSION + 1)
+    assert load_snapshot(master) is None
+
+
+def test_missing_master_or_corrupt_header(master, catalog):
+    save_snapshot(master, catalog)
+    with open(snapshot_path(master), "wb") as f:
+        pickle.dump(["not", "a", "header"], f)
+    assert load_snapshot(master) is None
+    os.remove(master)
+    assert load_snapshot(master) is None
@@ -0,0 +1,49 @@
+"""
+여러 마스터 소스 합치기(safian.sources) 테스트: 우선순위/순서에 따른 중복 바코드 처리.
+"""
+import json
+
+from safian.catalog import Catalog
+from safian.sources import CatalogSource, as_source, load_sources_config, merge_rows, precedence
+
+
+def test_precedence_orders_by_priority_then_list_order():
+    a, b, c, d = (CatalogSource(name, priority=p) for name, p in (("a", 0), ("b", 10), ("c", 0), ("d", 10)))
+    assert precedence([a, b, c, d]) == [b, d, a, c]
+
+
+def test_merge_rows_precedence_and_conflicts():
+    brand = CatalogSource("브랜드.xlsb", priority=10)
+    common = CatalogSource("공통.xlsb", name="공통")
+    extra = CatalogSource("추가.xlsb", sheet="시트2")
+    loaded = [(source, rows) for source, rows in zip(precedence([common, brand, extra]), (
+        [("A001", "브랜드 나주배", ()), ("B001", "브랜드 듀얼픽스", ())],
+        [("A001", "공통 나주배", ()), ("C001", "공통 사과", ()), ("C001", "공통 사과 (중복)", ())],
+        [("C001", "추가 사과", ()), ("B001", "추가 듀얼픽스", ()), ("D001", "추가 배즙", ())],
+    ))]
+    assert [source for source, _ in loaded] == [brand, common, extra]
+
+    rows, origins, conflicts = merge_rows(loaded)
+    assert origins == {"A001": "브랜드.xlsb:코드", "B001": "브랜드.xlsb:코드", "C001": "공통", "D001": "추가.xlsb:시트2"}
+    assert conflicts == [("A001", "브랜드.xlsb:코드", "공통"), ("C001", "공통", "추가.xlsb:시트2"),
+                         ("B001", "브랜드.xlsb:코드", "추가.xlsb:시트2")]
+    # 우선순위 높은 소스의 행이 앞, 소스 안의 중복은 그대로 두고 묶음은 첫 행 기준
+    assert [row[1] for row in rows] == ["브랜드 나주배", "브랜드 듀얼픽스", "공통 사과", "공통 사과 (중복)", "추가 배즙"]
+    bundles = Catalog(rows).bundles
+    assert bundles["A001"].product_name == "브랜드 나주배"
+    assert bundles["C001"].product_name == "공통 사과"
+
+
+def test_as_source_and_config_paths(tmp_path):
+    assert as_source("a.xlsb") == CatalogSource("a.xlsb")
+    assert as_source(("a.xlsb", "시트", 3)) == CatalogSource("a.xlsb", "시트", 3)
+    assert as_source({"path": "a.xlsb", "priority": "5"}).priority == 5
+
+    config = tmp_path / "conf" / "sources.json"
+    config.parent.mkdir()
+    config.write_text(json.dumps(["공통.xlsb", {"path": "sub/브랜드.xlsb", "priority": 10, "name": "브랜드"}]),
+                      encoding="utf-8")
+    sources = load_sources_config(config)
+    assert sources == [CatalogSource(str(config.parent / "공통.xlsb")),
+                       CatalogSource(str(config.parent / "sub" / "브랜드.xlsb"), priority=10, name="브랜드")]
+    assert sources[0].label == "공통.xlsb:코드"
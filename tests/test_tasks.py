@@ -0,0 +1,141 @@
+"""
+GUI 작업 실행기(TaskRunner) 테스트. (Tk 대신 after를 기록만 하는 가짜 root로 실행하고 _poll을 직접 호출)
+"""
+import threading
+import time
+
+import pytest
+
+from safian.tasks import POLL_INTERVAL_MS, TaskRunner
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+
+@pytest.fixture
+def runner():
+    runner = TaskRunner(FakeRoot())
+    yield runner
+    runner.shutdown(wait=True)
+
+
+def drain(runner, *lanes):
+    """레인에 제출된 작업이 모두 끝날 때까지 기다린 뒤 메인 스레드 콜백을 실행"""
+    for lane in lanes:
+        done = threading.Event()
+        runner.submit(lane, done.set)
+        assert done.wait(5)
+    runner._poll()
+
+
+def test_poll_reschedules_itself_until_shutdown():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    assert root.scheduled == [(POLL_INTERVAL_MS, runner._poll)]
+    runner._poll()
+    assert len(root.scheduled) == 2
+    runner.shutdown()
+    runner._poll()
+    assert len(root.scheduled) == 2
+
+
+def test_same_lane_runs_in_submit_order(runner):
+    ran, done = [], []
+
+    def job(n):
+        # 앞 작업이 더 오래 걸려도 순서대로 실행/완료
+        time.sleep(0.001 * (n % 3))
+        ran.append(n)
+        return n
+
+    for n in range(20):
+        runner.submit("work", job, n, on_done=done.append)
+    drain(runner, "work")
+    assert ran == done == list(range(20))
+
+
+def test_lanes_run_concurrently(runner):
+    gate = threading.Event()
+    results = []
+    runner.submit("save", gate.wait, 5, on_done=results.append)
+    # save 레인이 막혀 있어도 work 레인은 진행
+    runner.submit("work", lambda: "work", on_done=results.append)
+    drain(runner, "work")
+    assert results == ["work"]
+    gate.set()
+    drain(runner, "save")
+    assert results == ["work", True]
+
+
+def test_callbacks_run_on_poll_thread_only(runner):
+    threads = []
+    runner.submit("work", lambda: 1, on_done=lambda _: threads.append(threading.current_thread()))
+    done = threading.Event()
+    runner.submit("work", done.set)
+    assert done.wait(5)
+    assert threads == []
+    runner._poll()
+    assert threads == [threading.current_thread()]
+
+
+def test_on_error_receives_exception(runner, capsys):
+    done, errors = [], []
+
+    def fail():
+        raise ValueError("bad")
+
+    runner.submit("work", fail, on_done=done.append, on_error=errors.append)
+    # on_error가 없으면 traceback만 출력하고 레인은 계속 동작
+    runner.submit("work", fail)
+    runner.submit("work", lambda: 2, on_done=done.append)
+    drain(runner, "work")
+    assert done == [2]
+    assert [str(e) for e in errors] == ["bad"]
+    assert "ValueError: bad" in capsys.readouterr().err
+
+
+def test_callback_error_does_not_stop_other_callbacks(runner, capsys):
+    done = []
+    runner.submit("work", lambda: 1, on_done=lambda _: 1 / 0)
+    runner.submit("work", lambda: 2, on_done=done.append)
+    drain(runner, "work")
+    assert done == [2]
+    assert "ZeroDivisionError" in capsys.readouterr().err
+
+
+def test_with_task_progress_and_cancel(runner):
+    progress, results = [], []
+    started = threading.Event()
+
+    def job(task, total):
+        started.set()
+        done = 0
+        while done < total and not task.cancelled:
+            done += 1
+            task.report(done, total)
+            time.sleep(0.001)
+        return done
+
+    task = runner.submit("save", job, 100000, with_task=True, on_done=results.append,
+                         on_progress=lambda done, total: progress.append((done, total)))
+    assert started.wait(5)
+    task.cancel()
+    drain(runner, "save")
+    assert task.cancelled
+    assert 0 < results[0] < 100000
+    assert progress[-1] == (results[0], 100000)
+
+
+def test_shutdown_waits_for_running_tasks():
+    runner = TaskRunner(FakeRoot())
+    finished = []
+    runner.submit("work", lambda: (time.sleep(0.05), finished.append(1)))
+    runner.submit("save", lambda: (time.sleep(0.05), finished.append(2)))
+    runner.shutdown(wait=True)
+    assert sorted(finished) == [1, 2]
+    assert runner._lanes == {}